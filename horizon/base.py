@@ -23,6 +23,8 @@ the classes contained therein.
 import collections
 import collections.abc
 import copy
+import functools
+import hashlib
 from importlib import import_module
 import inspect
 import logging
@@ -31,6 +33,7 @@ import os
 
 from django.conf import settings
 from django.conf.urls import include
+from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
 from django.urls import re_path
 from django.urls import reverse
@@ -62,24 +65,99 @@ def _decorate_urlconf(urlpatterns, decorator, *args, **kwargs):
             _decorate_urlconf(pattern.url_patterns, decorator, *args, **kwargs)
 
 
-# FIXME(lhcheng): We need to find a better way to cache the result.
-# Rather than storing it in the session, we could leverage the Django
-# session. Currently, this has been causing issue with cookie backend,
-# adding 1600+ in the cookie size.
+def _get_access_cache():
+    return caches[utils_settings.get_dict_config('HORIZON_ACCESS_CACHE',
+                                                 'cache_alias')]
+
+
+def _get_access_cache_key(request):
+    session = getattr(request, 'session', None)
+    token_id = getattr(session and session.get('token'), 'id', None)
+    if not token_id:
+        return None
+    raw_key = '%s|%s' % (token_id, session.get('services_region'))
+    digest = hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+    return 'horizon:access:%s' % digest
+
+
+def _get_access_map(request, key):
+    """Returns the ``can_access`` results of all components for a token.
+
+    The map is kept on the request once loaded. When it is not found in
+    the cache, the access of every dashboard and panel is computed in one
+    pass, which happens on the first page rendered with a new token, e.g.
+    after logging in or switching projects.
+    """
+    loaded = getattr(request, '_horizon_access_map', None)
+    if loaded is not None and loaded[0] == key:
+        return loaded[1]
+    try:
+        access_map = _get_access_cache().get(key)
+    except Exception:
+        LOG.warning("Unable to read the access map from the cache.",
+                    exc_info=True)
+        access_map = None
+    if access_map is not None:
+        request._horizon_access_map = (key, access_map)
+        return access_map
+
+    access_map = {}
+    request._horizon_access_map = (key, access_map)
+    request._horizon_access_loading = True
+    context = {'request': request}
+    try:
+        for dashboard in Horizon.get_dashboards():
+            for component in dashboard.get_panels() + [dashboard]:
+                try:
+                    component.can_access(context)
+                except Exception:
+                    # Leave it to be computed, and to fail, when it is used.
+                    LOG.debug("Unable to check the access to %s.", component,
+                              exc_info=True)
+    finally:
+        request._horizon_access_loading = False
+    _set_access_map(key, access_map)
+    return access_map
+
+
+def _set_access_map(key, access_map):
+    timeout = utils_settings.get_dict_config('HORIZON_ACCESS_CACHE',
+                                             'timeout')
+    try:
+        _get_access_cache().set(key, access_map, timeout)
+    except Exception:
+        LOG.warning("Unable to store the access map in the cache.",
+                    exc_info=True)
+
+
 def access_cached(func):
+    """Caches the result of ``can_access`` for the token of the user.
+
+    The results are stored in the Django cache configured by
+    ``HORIZON_ACCESS_CACHE`` rather than in the session, so that they do not
+    grow cookie based sessions. They are keyed by a hash of the token and
+    the services region, so logging in again or switching projects starts
+    from a fresh map. It is a no-op unless ``HORIZON_ACCESS_CACHE['enabled']``
+    is set.
+    """
+    @functools.wraps(func)
     def inner(self, context):
-        session = context['request'].session
-        try:
-            if session['allowed']['valid_for'] != session.get('token'):
-                raise KeyError()
-        except KeyError:
-            session['allowed'] = {"valid_for": session.get('token')}
-
-        key = "%s.%s" % (self.__class__.__module__, self.__class__.__name__)
-        if key not in session['allowed']:
-            session['allowed'][key] = func(self, context)
-            session.modified = True
-        return session['allowed'][key]
+        if not utils_settings.get_dict_config('HORIZON_ACCESS_CACHE',
+                                              'enabled'):
+            return func(self, context)
+        request = context['request']
+        key = _get_access_cache_key(request)
+        if key is None:
+            return func(self, context)
+
+        access_map = _get_access_map(request, key)
+        component = "%s.%s" % (self.__class__.__module__,
+                               self.__class__.__name__)
+        if component not in access_map:
+            access_map[component] = func(self, context)
+            if not getattr(request, '_horizon_access_loading', False):
+                _set_access_map(key, access_map)
+        return access_map[component]
     return inner
 
 
@@ -135,15 +213,13 @@ class HorizonComponent(object):
                 urlpatterns = []
         return urlpatterns
 
-    # FIXME(lhcheng): Removed the access_cached decorator for now until
-    # a better implementation has been figured out. This has been causing
-    # issue with cookie backend, adding 1600+ in the cookie size.
-    # @access_cached
+    @access_cached
     def can_access(self, context):
         """Return whether the user has role based access to this component.
 
         This method is not intended to be overridden.
-        The result of the method is stored in per-session cache.
+        The result of the method is cached per token when
+        ``HORIZON_ACCESS_CACHE`` is enabled.
         """
         return self.allowed(context)
 
@@ -54,7 +54,46 @@ SESSION_COOKIE_MAX_SIZE = 4093
 # memory usage when caching. It should at least be 2 x the number of threads
 # with a little bit of extra buffer.
 MEMOIZED_MAX_SIZE_DEFAULT = 25
+# Opt-in sharing of identical API reads made while serving a single GET
+# request. See horizon.utils.memoized.coalesced.
+MEMOIZED_REQUEST_COALESCING = False
+# Opt-in cache of API read results shared across requests and processes.
+# See horizon.utils.memoized.shared_memoized.
+MEMOIZED_SHARED_CACHE = {
+    'enabled': False,
+    'cache_alias': 'default',
+    'timeout': 30,
+    'timeouts': {},
+}
 HORIZON_COMPRESS_OFFLINE_CONTEXT_BASE = {}
+# Cache the access of the user to dashboards and panels per token.
+# See horizon.base.access_cached.
+HORIZON_ACCESS_CACHE = {
+    'enabled': False,
+    'cache_alias': 'default',
+    'timeout': 3600,
+}
+# Load the data of the tabs of a tab group in parallel threads.
+# See horizon.tabs.TabGroup.parallel_load.
+HORIZON_TAB_PARALLEL_LOAD = {
+    'enabled': False,
+    'max_workers': 4,
+    'timeout': None,
+}
+# Opt-in cache of rendered table rows shared across requests and processes.
+# See horizon.tables.DataTable.get_row_cache_key.
+HORIZON_TABLE_ROW_CACHE = {
+    'enabled': False,
+    'cache_alias': 'default',
+    'timeout': 60,
+}
+# Opt-in background prefetch of the next page of paged tables.
+# See horizon.tables.PagedTableMixin.get_paged_data.
+HORIZON_TABLE_PREFETCH = {
+    'enabled': False,
+    'max_workers': 4,
+    'timeout': 30,
+}
 
 SITE_BRANDING = _("Horizon")
 SITE_BRANDING_LINK = reverse_lazy("horizon:user_home")
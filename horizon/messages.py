@@ -17,6 +17,9 @@ Drop-in replacement for django.contrib.messages which handles Horizon's
 messaging needs (e.g. AJAX communication, etc.).
 """
 
+import contextlib
+import threading
+
 from django.contrib import messages as _messages
 from django.contrib.messages import constants
 from django.utils.encoding import force_str
@@ -25,6 +28,9 @@ from django.utils.safestring import SafeData
 from horizon.utils import http as http_utils
 
 
+_collecting = threading.local()
+
+
 def horizon_message_already_queued(request, message):
     _message = force_str(message)
     if http_utils.is_ajax(request):
@@ -38,8 +44,30 @@ def horizon_message_already_queued(request, message):
     return False
 
 
+@contextlib.contextmanager
+def collect_messages():
+    """Collects the messages added by the current thread.
+
+    Message storages are not thread-safe, so a thread working for a request
+    must not add messages to it. Within this block, the messages added by
+    the current thread are appended to the yielded list as
+    ``(level, message, extra_tags, fail_silently)`` tuples instead, and the
+    request thread can add them with :func:`add_message` afterwards.
+    """
+    previous = getattr(_collecting, 'messages', None)
+    _collecting.messages = collected = []
+    try:
+        yield collected
+    finally:
+        _collecting.messages = previous
+
+
 def add_message(request, level, message, extra_tags='', fail_silently=False):
     """Attempts to add a message to the request using the 'messages' app."""
+    collected = getattr(_collecting, 'messages', None)
+    if collected is not None:
+        collected.append((level, message, extra_tags, fail_silently))
+        return
     if not horizon_message_already_queued(request, message):
         if http_utils.is_ajax(request):
             tag = constants.DEFAULT_TAGS[level]
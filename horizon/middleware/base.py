@@ -35,6 +35,7 @@ from django.utils import timezone
 from horizon import exceptions
 from horizon.utils import functions as utils
 from horizon.utils import http as http_utils
+from horizon.utils import memoized
 
 
 LOG = logging.getLogger(__name__)
@@ -52,8 +53,20 @@ class HorizonMiddleware(object):
         self._process_request(request)
         response = self.get_response(request)
         response = self._process_response(request, response)
+        self._log_coalesced_calls(request)
         return response
 
+    @staticmethod
+    def _log_coalesced_calls(request):
+        """Log API reads repeated while serving the request."""
+        if not LOG.isEnabledFor(logging.DEBUG):
+            return
+        duplicates = memoized.get_coalesced_duplicates(request)
+        if duplicates:
+            LOG.debug("API calls repeated while serving %(path)s: "
+                      "%(duplicates)s",
+                      {'path': request.path, 'duplicates': duplicates})
+
     def _process_request(self, request):
         """Adds data necessary for Horizon to function to the request."""
 
@@ -20,6 +20,8 @@ horizon.membership = {
   roles: [],
   has_roles: [],
   default_role_id: [],
+  search_url: [],
+  search_state: [],
 
   /* Parses the form field selector's ID to get the
    * role id. It returns the string after the last underscore.
@@ -64,6 +66,9 @@ horizon.membership = {
   init_properties: function(step_slug) {
     horizon.membership.has_roles[step_slug] = $("." + step_slug + "_membership").data('show-roles') !== "False";
     horizon.membership.default_role_id[step_slug] = $('#id_default_' + step_slug + '_role').attr('value');
+    // Only set for lazy steps, whose candidates are searched on the server.
+    horizon.membership.search_url[step_slug] = $("." + step_slug + "_membership").data('search-url');
+    horizon.membership.search_state[step_slug] = {query: '', marker: null, request: 0};
     horizon.membership.init_data_list(step_slug);
     horizon.membership.init_role_list(step_slug);
     horizon.membership.init_current_membership(step_slug);
@@ -266,6 +271,70 @@ horizon.membership = {
     horizon.membership.detect_no_results(step_slug);
   },
 
+  /*
+   * Adds a candidate found by a search to the available list of a lazy
+   * step, and as an option of the hidden role lists so that it can be
+   * selected.
+   **/
+  add_candidate: function(step_slug, data_id, display_name) {
+    if (!horizon.membership.data[step_slug].hasOwnProperty(data_id)) {
+      horizon.membership.data[step_slug][data_id] = display_name;
+      this.get_role_element(step_slug, '').append($('<option>').val(data_id).text(display_name));
+    }
+    var member_el = this.generate_member_element(step_slug, display_name, data_id, [], "+");
+    member_el.find(".role_options").hide();
+    $(".available_" + step_slug).append(member_el);
+  },
+
+  /*
+   * Searches the candidates of a lazy step matching the available list
+   * filter, or the next page of them when "more" is true.
+   **/
+  search_candidates: function(step_slug, more) {
+    var state = horizon.membership.search_state[step_slug];
+    var query = $.trim($("input[id='available_" + step_slug + "']").val());
+    var $no_results = $('#no_available_' + step_slug);
+    var $more = $('#more_available_' + step_slug);
+
+    if (!more) {
+      if (query === state.query) {
+        return;
+      }
+      state.query = query;
+      state.marker = null;
+      $(".available_" + step_slug).empty();
+      $more.hide();
+      $no_results.children('li').text(
+        $no_results.data(query ? 'no-results-text' : 'search-text'));
+      horizon.membership.detect_no_results(step_slug);
+    }
+    if (!query) {
+      return;
+    }
+
+    // Responses to previous searches are ignored.
+    state.request += 1;
+    var request = state.request;
+    $.getJSON(horizon.membership.search_url[step_slug], {q: query, marker: state.marker})
+      .done(function (response) {
+        if (request !== state.request) {
+          return;
+        }
+        angular.forEach(response.items, function (item) {
+          if (horizon.membership.get_member_roles(step_slug, item.id).length === 0) {
+            horizon.membership.add_candidate(step_slug, item.id, item.name);
+          }
+          state.marker = item.id;
+        });
+        $more.toggle(response.more);
+        horizon.membership.detect_no_results(step_slug);
+        horizon.membership.fix_stripes(step_slug);
+      })
+      .fail(function () {
+        horizon.toast.add('error', gettext('Unable to search for candidates.'));
+      });
+  },
+
   /*
    * Triggers on click of link to add/remove membership association.
    **/
@@ -314,7 +383,10 @@ horizon.membership = {
 
       if (!$('.' + filter).children('ul').length) {
         $('#no_' + filter).show();
-        $("input[id='" + filter + "']").attr('disabled', 'disabled');
+        // The filter of a lazy step searches for more candidates.
+        if (!(horizon.membership.search_url[step_slug] && filter === "available_" + step_slug)) {
+          $("input[id='" + filter + "']").attr('disabled', 'disabled');
+        }
       }
       else {
         $('#no_' + filter).hide();
@@ -425,6 +497,16 @@ horizon.membership = {
       var filter = $.grep(css_class.split(' '), function(val){ return val.indexOf(step_slug) !== -1; })[0];
 
       var input = $("input[id='" + filter +"']");
+      if (horizon.membership.search_url[step_slug] && filter === "available_" + step_slug) {
+        var timeout;
+        input.on('keyup', function () {
+          clearTimeout(timeout);
+          timeout = setTimeout(function () {
+            horizon.membership.search_candidates(step_slug, false);
+          }, 300);
+        });
+        return;
+      }
       input.quicksearch('ul.' + filter + ' ul li span.display_name', {
         'delay': 200,
         'loader': 'span.loading',
@@ -474,7 +556,10 @@ horizon.membership = {
       horizon.membership.update_membership(step_slug);
       horizon.membership.select_member_role(step_slug);
       horizon.membership.add_new_member(step_slug);
-
+      $form.find('#more_available_' + step_slug).on('click', 'a', function (evt) {
+        evt.preventDefault();
+        horizon.membership.search_candidates(step_slug, true);
+      });
 
       // initially hide role dropdowns for available member list
       $form.find(".available_" + step_slug + " .role_options").hide();
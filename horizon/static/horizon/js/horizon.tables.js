@@ -33,111 +33,49 @@ horizon.datatables = {
       return;
     }
 
-    $rows_to_update.each(function() {
-      var $row = $(this);
-      var $table = $row.closest('table.datatable');
-
-      requests.push(
-        horizon.ajax.queue({
-          url: $row.attr('data-update-url'),
-          error: function (jqXHR) {
-            switch (jqXHR.status) {
-              // A 404 indicates the object is gone, and should be removed from the table
-              case 404:
-                // Update the footer count and reset to default empty row if needed
-                var row_count, colspan, template, params;
-
-                // existing count minus one for the row we're removing
-                row_count = horizon.datatables.update_footer_count($table, -1);
-
-                if (row_count === 0) {
-                  colspan = $table.find('.table_column_header th').length;
-                  template = horizon.templates.compiled_templates["#empty_row_template"];
-                  params = {
-                      "colspan": colspan,
-                      no_items_label: gettext("No items to display.")
-                  };
-                  var empty_row = template.render(params);
-                  $row.replaceWith(empty_row);
-                } else {
-                  $row.remove();
-                }
-                // Reset tablesorter's data cache.
-                $table.trigger("update");
-                // Enable launch action if quota is not exceeded
-                horizon.datatables.update_actions();
-                break;
-              default:
-                console.log(gettext("An error occurred while updating."));
-                $row.removeClass("ajax-update");
-                $row.find("i.ajax-updating").remove();
-                break;
-            }
-          },
-          success: function (data) {
-            var $new_row = $(data);
-
-            if ($new_row.hasClass('warning')) {
-              var $container = $(document.createElement('div'))
-                .addClass('progress-text horizon-loading-bar');
-
-              var $progress = $(document.createElement('div'))
-                .addClass('progress progress-striped active')
-                .appendTo($container);
-
-              // Incomplete progress bar addition
-              $width = $new_row.find('[percent]:first').attr('percent') || "100%";
-
-              $(document.createElement('div'))
-                .addClass('progress-bar')
-                .css("width", $width)
-                .appendTo($progress);
-
-              // if action/confirm is required, show progress-bar with "?"
-              // icon to indicate user action is required
-              if ($new_row.find('.btn-action-required').length > 0) {
-                $(document.createElement('span'))
-                  .addClass('fa fa-question-circle progress-bar-text')
-                  .appendTo($container);
-              }
-              $new_row.find("td.warning:last").prepend($container);
-            }
-
-            // Only replace row if the html content has changed
-            if ($new_row.html() !== $row.html()) {
+    $rows_to_update.closest('table.datatable').each(function() {
+      var $datatable = $(this);
+      var $rows = $datatable.find('tr.warning.ajax-update');
+      var batch_url = $datatable.attr('data-batch-update-url');
+
+      // Poll the pending rows of the table in as few requests as the
+      // batch size allows.
+      if (batch_url) {
+        var batch_size = parseInt($datatable.attr('data-batch-size'), 10) || $rows.length;
+        for (var start = 0; start < $rows.length; start += batch_size) {
+          requests.push(horizon.datatables.update_batch(
+            $datatable, $rows.slice(start, start + batch_size), batch_url));
+        }
+        return;
+      }
 
-              // Directly accessing the checked property of the element
-              // is MUCH faster than using jQuery's helper method
-              var $checkbox = $row.find('.table-row-multi-select');
-              if ($checkbox.length && $checkbox[0].checked) {
-                // Preserve the checkbox if it's already clicked
-                $new_row.find('.table-row-multi-select').prop('checked', true);
-              }
-              $row.replaceWith($new_row);
-
-              // TODO(matt-borland, tsufiev): ideally we should solve the
-              // problem with not-working angular actions in a content added
-              // by jQuery via replacing jQuery insert with Angular insert.
-              // Should address this in Newton release
-              recompileAngularContent($table);
-
-              // Reset tablesorter's data cache.
-              $table.trigger("update");
-              // Reset decay constant.
-              $table.removeAttr('decay_constant');
-              // Check that quicksearch is enabled for this table
-              // Reset quicksearch's data cache.
-              if ($table.attr('id') in horizon.datatables.qs) {
-                horizon.datatables.qs[$table.attr('id')].cache();
+      $rows.each(function() {
+        var $row = $(this);
+        requests.push(
+          horizon.ajax.queue({
+            url: $row.attr('data-update-url'),
+            error: function (jqXHR) {
+              switch (jqXHR.status) {
+                // A 404 indicates the object is gone, and should be removed from the table
+                case 404:
+                  horizon.datatables.remove_row($datatable, $row);
+                  break;
+                default:
+                  console.log(gettext("An error occurred while updating."));
+                  horizon.datatables.stop_row_update($row);
+                  break;
               }
+            },
+            success: function (data) {
+              horizon.datatables.replace_row($datatable, $row, data);
+            },
+            complete: function () {
+              // Revalidate the button check for the updated table
+              horizon.datatables.validate_button();
             }
-          },
-          complete: function () {
-            // Revalidate the button check for the updated table
-            horizon.datatables.validate_button();
-          }
-        })
-      );
+          })
+        );
+      });
     });
 
     $.when.apply($, requests).always(function() {
@@ -151,6 +89,130 @@ horizon.datatables = {
     });
   },
 
+  update_batch: function ($datatable, $rows, batch_url) {
+    var obj_ids = $rows.map(function() {
+      return $(this).attr('data-object-id');
+    }).get();
+    return horizon.ajax.queue({
+      url: batch_url,
+      data: {obj_id: obj_ids},
+      traditional: true,
+      dataType: 'json',
+      error: function () {
+        console.log(gettext("An error occurred while updating."));
+        $rows.each(function() {
+          horizon.datatables.stop_row_update($(this));
+        });
+      },
+      success: function (data) {
+        $rows.each(function() {
+          var $row = $(this);
+          var obj_id = $row.attr('data-object-id');
+          if (obj_id in data.rows) {
+            horizon.datatables.replace_row($datatable, $row, data.rows[obj_id]);
+          } else if ($.inArray(obj_id, data.deleted) > -1) {
+            horizon.datatables.remove_row($datatable, $row);
+          } else {
+            horizon.datatables.stop_row_update($row);
+          }
+        });
+      },
+      complete: function () {
+        // Revalidate the button check for the updated table
+        horizon.datatables.validate_button();
+      }
+    });
+  },
+
+  remove_row: function ($table, $row) {
+    // Update the footer count and reset to default empty row if needed
+    var row_count, colspan, template, params;
+
+    // existing count minus one for the row we're removing
+    row_count = horizon.datatables.update_footer_count($table, -1);
+
+    if (row_count === 0) {
+      colspan = $table.find('.table_column_header th').length;
+      template = horizon.templates.compiled_templates["#empty_row_template"];
+      params = {
+          "colspan": colspan,
+          no_items_label: gettext("No items to display.")
+      };
+      var empty_row = template.render(params);
+      $row.replaceWith(empty_row);
+    } else {
+      $row.remove();
+    }
+    // Reset tablesorter's data cache.
+    $table.trigger("update");
+    // Enable launch action if quota is not exceeded
+    horizon.datatables.update_actions();
+  },
+
+  stop_row_update: function ($row) {
+    $row.removeClass("ajax-update");
+    $row.find("i.ajax-updating").remove();
+  },
+
+  replace_row: function ($table, $row, data) {
+    var $new_row = $(data);
+
+    if ($new_row.hasClass('warning')) {
+      var $container = $(document.createElement('div'))
+        .addClass('progress-text horizon-loading-bar');
+
+      var $progress = $(document.createElement('div'))
+        .addClass('progress progress-striped active')
+        .appendTo($container);
+
+      // Incomplete progress bar addition
+      $width = $new_row.find('[percent]:first').attr('percent') || "100%";
+
+      $(document.createElement('div'))
+        .addClass('progress-bar')
+        .css("width", $width)
+        .appendTo($progress);
+
+      // if action/confirm is required, show progress-bar with "?"
+      // icon to indicate user action is required
+      if ($new_row.find('.btn-action-required').length > 0) {
+        $(document.createElement('span'))
+          .addClass('fa fa-question-circle progress-bar-text')
+          .appendTo($container);
+      }
+      $new_row.find("td.warning:last").prepend($container);
+    }
+
+    // Only replace row if the html content has changed
+    if ($new_row.html() !== $row.html()) {
+
+      // Directly accessing the checked property of the element
+      // is MUCH faster than using jQuery's helper method
+      var $checkbox = $row.find('.table-row-multi-select');
+      if ($checkbox.length && $checkbox[0].checked) {
+        // Preserve the checkbox if it's already clicked
+        $new_row.find('.table-row-multi-select').prop('checked', true);
+      }
+      $row.replaceWith($new_row);
+
+      // TODO(matt-borland, tsufiev): ideally we should solve the
+      // problem with not-working angular actions in a content added
+      // by jQuery via replacing jQuery insert with Angular insert.
+      // Should address this in Newton release
+      recompileAngularContent($table);
+
+      // Reset tablesorter's data cache.
+      $table.trigger("update");
+      // Reset decay constant.
+      $table.removeAttr('decay_constant');
+      // Check that quicksearch is enabled for this table
+      // Reset quicksearch's data cache.
+      if ($table.attr('id') in horizon.datatables.qs) {
+        horizon.datatables.qs[$table.attr('id')].cache();
+      }
+    }
+  },
+
   update_actions: function() {
     var $actions_to_update = $('.btn-launch.ajax-update, .btn-create.ajax-update');
     $actions_to_update.each(function() {
@@ -15,6 +15,7 @@
 import collections
 import collections.abc
 import copy
+import hashlib
 import inspect
 import json
 import logging
@@ -23,9 +24,11 @@ import sys
 from urllib import parse
 
 from django.conf import settings
+from django.core.cache import caches
 from django.core import exceptions as core_exceptions
 from django import forms
 from django.http import HttpResponse
+from django.http import JsonResponse
 from django import template
 from django.template.defaultfilters import slugify
 from django.template.defaultfilters import truncatechars
@@ -36,6 +39,8 @@ from django.utils.html import escape
 from django.utils.http import urlencode
 from django.utils.safestring import mark_safe
 from django.utils import termcolors
+from django.utils import timezone
+from django.utils import translation
 from django.utils.translation import gettext_lazy as _
 
 from horizon import conf
@@ -267,6 +272,14 @@ class Column(html.HTMLElement):
 
         A string of simple help text displayed in a tooltip when you hover
         over the help icon beside the Column name. Defaults to ``None``.
+
+    .. attribute:: api_fields
+
+        A list of the names of the fields of the API resources the column
+        needs, used to list only those fields from APIs which support it
+        (see :meth:`~horizon.tables.DataTable.get_api_fields`). Defaults to
+        ``[transform]`` if ``transform`` is a string, otherwise to ``None``,
+        which means the fields needed are unknown.
     """
     summation_methods = {
         "sum": sum,
@@ -303,7 +316,8 @@ class Column(html.HTMLElement):
                  auto=None, truncate=None, link_classes=None, wrap_list=False,
                  form_field=None, form_field_attributes=None,
                  update_action=None, link_attrs=None, policy_rules=None,
-                 cell_attributes_getter=None, help_text=None):
+                 cell_attributes_getter=None, help_text=None,
+                 api_fields=None):
 
         allowed_data_types = allowed_data_types or []
         self.classes = list(classes or getattr(self, "classes", []))
@@ -342,6 +356,9 @@ class Column(html.HTMLElement):
         self.link_attrs = link_attrs or {}
         self.policy_rules = policy_rules or []
         self.help_text = help_text
+        if api_fields is None and not callable(transform):
+            api_fields = [self.transform]
+        self.api_fields = api_fields
         if link_classes:
             self.link_attrs['class'] = ' '.join(link_classes)
         self.cell_attributes_getter = cell_attributes_getter
@@ -538,6 +555,11 @@ class Row(html.HTMLElement):
     ``ajax_poll_interval`` in the ``HORIZON_CONFIG`` dictionary.
     Default: ``2500`` (measured in milliseconds).
 
+    The rows of a table which are pending an update are polled together in
+    a single request. Subclasses can override ``get_data_batch`` to fetch
+    the data of all of them at once rather than calling ``get_data`` for
+    each row.
+
     .. attribute:: table
 
         The table which this row belongs to.
@@ -582,10 +604,24 @@ class Row(html.HTMLElement):
         updates of cell. Generally you won't need to change this value.
         It is also used for inline edit of the cell.
         Default: ``"cell_update"``.
+
+    .. attribute:: ajax_batch_action_name
+
+        String that is used for the query parameter key to request AJAX
+        updates of several rows at once. Generally you won't need to change
+        this value. Default: ``"rows_update"``.
+
+    .. attribute:: ajax_batch_size
+
+        The maximum number of rows polled in a single request. The rows of
+        a table with more pending rows are polled in several requests.
+        Default: ``20``.
     """
     ajax = False
     ajax_action_name = "row_update"
     ajax_cell_action_name = "cell_update"
+    ajax_batch_action_name = "rows_update"
+    ajax_batch_size = 20
 
     def __init__(self, table, datum=None):
         super().__init__()
@@ -672,8 +708,12 @@ class Row(html.HTMLElement):
         return ''
 
     def render(self):
-        return render_to_string("horizon/common/_data_table_row.html",
-                                {"row": self})
+        cache_key = self.table.get_row_cache_key(self.datum)
+        rendered = render_to_string("horizon/common/_data_table_row.html",
+                                    {"row": self})
+        if cache_key:
+            self.table._set_cached_row(cache_key, rendered)
+        return rendered
 
     def get_cells(self):
         """Returns the bound cells for this row in order."""
@@ -711,6 +751,53 @@ class Row(html.HTMLElement):
         """
         return {}
 
+    def get_data_batch(self, request, obj_ids):
+        """Fetches the updated data for the rows of the given object IDs.
+
+        Returns a dict mapping each object ID to its data. IDs missing from
+        the dict are considered deleted and their rows are removed, while
+        IDs mapped to ``None`` could not be fetched and their rows are no
+        longer updated.
+
+        By default ``get_data`` is called for each object ID. Subclasses
+        can override it to fetch all the data with fewer API calls.
+        """
+        data = {}
+        for obj_id in obj_ids:
+            try:
+                data[obj_id] = self.get_data(request, obj_id)
+            except Exception:
+                error = exceptions.handle(request, ignore=True)
+                if error.status_code != 404:
+                    data[obj_id] = None
+        return data
+
+
+class CachedRow(object):
+    """A row of a table whose rendered HTML was found in the row cache.
+
+    It is returned by :meth:`~horizon.tables.DataTable.get_rows` in place of
+    the row class of the table, so that the cells of the row are neither
+    built nor rendered again.
+    """
+
+    def __init__(self, table, datum, rendered):
+        self.table = table
+        self.datum = datum
+        self.rendered = rendered
+        self.id = "%s%srow%s%s" % (table.name, STRING_SEPARATOR,
+                                   STRING_SEPARATOR,
+                                   table.get_object_id(datum))
+        self.selected = False
+        # The rendered HTML already holds the classes of the row.
+        self.classes = []
+
+    def __repr__(self):
+        return '<%s: %s>' % (self.__class__.__name__, self.id)
+
+    def render(self):
+        return mark_safe(self.rendered)
+
 
 class Cell(html.HTMLElement):
     """Represents a single cell in the table."""
@@ -1074,6 +1161,25 @@ class DataTableOptions(object):
 
         A list of permission names which this table requires in order to be
         displayed. Defaults to an empty list (``[]``).
+
+    .. attribute:: cache_rows
+
+        Boolean to control whether the rendered rows of this table may be
+        stored in the row cache configured by ``HORIZON_TABLE_ROW_CACHE``.
+        Only set it to ``True`` when the row fingerprint returned by
+        :meth:`~horizon.tables.DataTable.get_row_fingerprint` covers
+        everything the rendered row depends on, including the data joined
+        in by the view and what the row actions check in ``allowed()``.
+        Default: ``False``.
+
+    .. attribute:: api_fields
+
+        A list of the names of the fields of the API resources the table
+        needs besides those of its columns, for example for its row actions
+        and policy checks. Setting it declares that the table can be
+        displayed from resources limited to these fields (see
+        :meth:`~horizon.tables.DataTable.get_api_fields`).
+        Default: ``None``.
     """
     def __init__(self, options):
         self.name = getattr(options, 'name', self.__class__.__name__)
@@ -1103,6 +1209,8 @@ class DataTableOptions(object):
                                        "no_data_message",
                                        _("No items to display."))
         self.permissions = getattr(options, 'permissions', [])
+        self.cache_rows = getattr(options, 'cache_rows', False)
+        self.api_fields = getattr(options, 'api_fields', None)
 
         # Set self.filter if we have any FilterActions
         filter_actions = [action for action in self.table_actions if
@@ -1308,7 +1416,9 @@ class DataTable(object, metaclass=DataTableMetaclass):
         # Example: first process the multi_column visible but second
         # process the column is hidden. Updating row by ajax will
         # make the bug#1799151
-        if request.GET.get('action') == 'row_update':
+        row_class = self._meta.row_class
+        if request.GET.get('action') in (row_class.ajax_action_name,
+                                         row_class.ajax_batch_action_name):
             bound_actions = self.get_table_actions()
             batch_actions = [action for action in bound_actions
                              if isinstance(action, BatchAction)]
@@ -1425,6 +1535,33 @@ class DataTable(object, metaclass=DataTableMetaclass):
                          'hidden_title': self._meta.hidden_title}
         return table_template.render(extra_context, self.request)
 
+    def get_ajax_batch_size(self):
+        """Returns the maximum number of rows polled in a single request."""
+        return self._meta.row_class.ajax_batch_size
+
+    def get_ajax_batch_update_url(self):
+        """Returns the URL used to poll the AJAX updates of several rows.
+
+        The object IDs of the rows are appended as ``obj_id`` query
+        parameters. ``None`` is returned if the rows of this table are not
+        updated through AJAX.
+        """
+        row_class = self._meta.row_class
+        if not row_class.ajax:
+            return None
+        request_params = [
+            ("action", row_class.ajax_batch_action_name),
+            ("table", self.name),
+        ]
+        for marker_name in (self._meta.pagination_param,
+                            self._meta.prev_pagination_param):
+            marker = self.request.GET.get(marker_name, None)
+            if marker:
+                request_params.append((marker_name, marker))
+                break
+        params = urlencode(collections.OrderedDict(request_params))
+        return "%s?%s" % (self.get_absolute_url(), params)
+
     def get_absolute_url(self):
         """Returns the canonical URL for this table.
 
@@ -1460,6 +1597,34 @@ class DataTable(object, metaclass=DataTableMetaclass):
         """
         return self._filter_first_message
 
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self._object_id_index = None
+
+    def _get_object_id_index(self):
+        """Returns a dict mapping object IDs to the matching data objects.
+
+        The index is built on first use and rebuilt when ``data`` is
+        replaced or its length changes. Each value is a list so that
+        duplicate IDs can still be detected.
+        """
+        data = self.data or []
+        index = self._object_id_index
+        if index is None or index[0] is not data or index[1] != len(data):
+            objects = collections.defaultdict(list)
+            for datum in data:
+                obj_id = self.get_object_id(datum)
+                if not isinstance(obj_id, str):
+                    obj_id = str(obj_id)
+                objects[obj_id].append(datum)
+            index = self._object_id_index = (data, len(data), objects)
+        return index[2]
+
     def get_object_by_id(self, lookup):
         """Returns the data object whose ID matches ``loopup`` parameter.
 
@@ -1474,13 +1639,7 @@ class DataTable(object, metaclass=DataTableMetaclass):
         """
         if not isinstance(lookup, str):
             lookup = str(lookup)
-        matches = []
-        for datum in self.data:
-            obj_id = self.get_object_id(datum)
-            if not isinstance(obj_id, str):
-                obj_id = str(obj_id)
-            if obj_id == lookup:
-                matches.append(datum)
+        matches = self._get_object_id_index().get(lookup, [])
         if len(matches) > 1:
             raise ValueError("Multiple matches were returned for that id: %s."
                              % matches)
@@ -1686,6 +1845,9 @@ class DataTable(object, metaclass=DataTableMetaclass):
                     if self.get_object_id(datum) == self.current_item_id:
                         self.selected = True
                         new_row.classes.append('current_selected')
+                    cached = self._get_cached_rows([datum])[0]
+                    if cached is not None:
+                        return HttpResponse(cached)
                     new_row.load_cells(datum)
                     error = False
                 except Exception:
@@ -1695,6 +1857,8 @@ class DataTable(object, metaclass=DataTableMetaclass):
                     if not error:
                         return HttpResponse(new_row.render())
                     return HttpResponse(status=error.status_code)
+            elif new_row.ajax and new_row.ajax_batch_action_name == action_name:
+                return self.batch_update_handle(request, new_row)
             elif new_row.ajax_cell_action_name == action_name:
                 # inline edit of the cell actions
                 return self.inline_edit_handle(request, table_name,
@@ -1711,6 +1875,55 @@ class DataTable(object, metaclass=DataTableMetaclass):
                             return handled
         return None
 
+    def batch_update_handle(self, request, new_row):
+        """Batched AJAX row update handler.
+
+        Renders the rows of all the object IDs passed as ``obj_id`` query
+        parameters and returns them in a single JSON response of the form
+        ``{"rows": {id: html}, "deleted": [id], "failed": [id]}``. The data
+        of the rows is fetched ``ajax_batch_size`` rows at a time.
+        """
+        if not http_utils.is_ajax(request):
+            return None
+        obj_ids = request.GET.getlist('obj_id')
+        batch_size = new_row.ajax_batch_size
+        data = {}
+        try:
+            # Clients are expected to send at most ajax_batch_size IDs, in
+            # case they send more they are still fetched in chunks.
+            for start in range(0, len(obj_ids), batch_size):
+                data.update(new_row.get_data_batch(
+                    request, obj_ids[start:start + batch_size]))
+        except Exception:
+            error = exceptions.handle(request, ignore=True)
+            return HttpResponse(status=error.status_code)
+
+        found = [obj_id for obj_id in obj_ids
+                 if data.get(obj_id) is not None]
+        cached_rows = dict(zip(found, self._get_cached_rows(
+            [data[obj_id] for obj_id in found])))
+        response = {'rows': {}, 'deleted': [], 'failed': []}
+        for obj_id in obj_ids:
+            if obj_id not in data:
+                response['deleted'].append(obj_id)
+                continue
+            datum = data[obj_id]
+            if datum is None:
+                response['failed'].append(obj_id)
+                continue
+            is_current = self.get_object_id(datum) == self.current_item_id
+            if is_current:
+                self.selected = True
+            if cached_rows[obj_id] is not None:
+                response['rows'][obj_id] = cached_rows[obj_id]
+                continue
+            row = self._meta.row_class(self)
+            if is_current:
+                row.classes.append('current_selected')
+            row.load_cells(datum)
+            response['rows'][obj_id] = str(row.render())
+        return JsonResponse(response)
+
     def inline_edit_handle(self, request, table_name, action_name, obj_id,
                            new_row):
         """Inline edit handler.
@@ -1935,8 +2148,13 @@ class DataTable(object, metaclass=DataTableMetaclass):
         """Return the row data for this table broken out by columns."""
         rows = []
         try:
-            for datum in self.filtered_data:
-                row = self._meta.row_class(self, datum)
+            data = list(self.filtered_data)
+            cached_rows = self._get_cached_rows(data)
+            for datum, cached in zip(data, cached_rows):
+                if cached is not None:
+                    row = CachedRow(self, datum, cached)
+                else:
+                    row = self._meta.row_class(self, datum)
                 if self.get_object_id(datum) == self.current_item_id:
                     self.selected = True
                     row.classes.append('current_selected')
@@ -1949,6 +2167,116 @@ class DataTable(object, metaclass=DataTableMetaclass):
 
         return rows
 
+    def get_api_fields(self):
+        """Returns the fields of the API resources the table needs.
+
+        They are the ``id`` field, the fields of the columns of the table
+        and those of its ``api_fields`` option. Views can pass them to list
+        APIs which support returning only some fields of the resources.
+        ``None`` is returned when the table does not set its ``api_fields``
+        option or one of its columns does not know the fields it needs, in
+        which case full resources must be listed.
+        """
+        if self._meta.api_fields is None:
+            return None
+        fields = {'id'}
+        fields.update(self._meta.api_fields)
+        for column in self.columns.values():
+            if column.auto:
+                continue
+            if column.api_fields is None:
+                return None
+            fields.update(column.api_fields)
+        return tuple(sorted(fields))
+
+    def get_row_fingerprint(self, datum):
+        """Returns a value which changes whenever the row of ``datum`` does.
+
+        It is part of the key under which the rendered row is stored in the
+        row cache (see ``HORIZON_TABLE_ROW_CACHE``) of tables setting the
+        ``cache_rows`` option. By default it is built from the ``updated_at``
+        and ``status`` attributes of the datum. Returning ``None`` prevents
+        the row from being cached, which is the default when the datum has
+        neither attribute and for tables with row actions, since whether an
+        action is allowed usually depends on more than the datum, e.g. on
+        quotas. Tables with row actions which cache their rows must override
+        this method to cover what the actions depend on.
+        """
+        if self._meta.row_actions:
+            return None
+        fingerprint = tuple(getattr(datum, attr, None)
+                            for attr in ('updated_at', 'status'))
+        if not any(value is not None for value in fingerprint):
+            return None
+        return fingerprint
+
+    def get_row_cache_key(self, datum):
+        """Returns the key of the rendered row of ``datum`` in the row cache.
+
+        Besides the table, the object ID and the row fingerprint, the key
+        covers everything else the rendered row depends on: the project,
+        roles and region of the user (which decide the allowed row actions),
+        the language and time zone and the URL the row links back to.
+        ``None`` is returned when the row must not be cached.
+        """
+        if (datum is None or not self._meta.cache_rows or
+                not utils_settings.get_dict_config('HORIZON_TABLE_ROW_CACHE',
+                                                   'enabled')):
+            return None
+        fingerprint = self.get_row_fingerprint(datum)
+        if fingerprint is None:
+            return None
+        user = self.request.user
+        obj_id = self.get_object_id(datum)
+        raw_key = repr((
+            '%s.%s' % (self.__class__.__module__,
+                       self.__class__.__qualname__),
+            self.name,
+            str(obj_id),
+            fingerprint,
+            getattr(user, 'project_id', None),
+            sorted(role['name'] for role in getattr(user, 'roles', None) or []),
+            getattr(user, 'services_region', None),
+            translation.get_language(),
+            timezone.get_current_timezone_name(),
+            self.get_absolute_url(),
+            self.request.GET.get(self._meta.pagination_param),
+            self.request.GET.get(self._meta.prev_pagination_param),
+            obj_id == self.current_item_id,
+        ))
+        digest = hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+        return 'horizon:table_row:%s' % digest
+
+    def _get_row_cache(self):
+        return caches[utils_settings.get_dict_config('HORIZON_TABLE_ROW_CACHE',
+                                                     'cache_alias')]
+
+    def _get_cached_rows(self, data):
+        """Returns the cached rendered rows of ``data``, ``None`` if missing.
+
+        All the rows are fetched from the cache in a single round trip.
+        """
+        keys = [self.get_row_cache_key(datum) for datum in data]
+        wanted = [key for key in keys if key]
+        if not wanted:
+            return [None] * len(keys)
+        try:
+            cached = self._get_row_cache().get_many(wanted)
+        except Exception:
+            LOG.warning("Unable to read table rows from the row cache.",
+                        exc_info=True)
+            cached = {}
+        return [cached.get(key) if key else None for key in keys]
+
+    def _set_cached_row(self, key, rendered):
+        timeout = utils_settings.get_dict_config('HORIZON_TABLE_ROW_CACHE',
+                                                 'timeout')
+        try:
+            self._get_row_cache().set(key, str(rendered), timeout)
+        except Exception:
+            LOG.warning("Unable to store a table row in the row cache.",
+                        exc_info=True)
+
     def css_classes(self):
         """Returns the additional CSS class to be added to <table> tag."""
         return self._meta.css_classes
@@ -13,12 +13,81 @@
 #    under the License.
 
 from collections import defaultdict
+import hashlib
+import json
+import logging
+import threading
+import time
 
 from django import shortcuts
+import futurist
 
+from horizon.templatetags.horizon import has_permissions
+from horizon.utils import settings as utils_settings
 from horizon import views
 
-from horizon.templatetags.horizon import has_permissions
+LOG = logging.getLogger(__name__)
+
+_prefetch_pool = None
+_prefetch_lock = threading.Lock()
+# Maps a hash of the token and region of a user to a dict mapping the path
+# of a paged table to the (page key, expiry time, future) of the raw results
+# of the page prefetched for it.
+_prefetched_pages = {}
+
+
+def _get_prefetch_pool():
+    global _prefetch_pool
+    with _prefetch_lock:
+        if _prefetch_pool is None:
+            _prefetch_pool = futurist.ThreadPoolExecutor(
+                max_workers=utils_settings.get_dict_config(
+                    'HORIZON_TABLE_PREFETCH', 'max_workers'))
+        return _prefetch_pool
+
+
+def _pop_prefetched_page(owner, path, page_key):
+    with _prefetch_lock:
+        pages = _prefetched_pages.get(owner, {})
+        entry = pages.pop(path, None)
+        if not pages:
+            _prefetched_pages.pop(owner, None)
+    if entry is None:
+        return None
+    entry_key, expiry, future = entry
+    if entry_key != page_key or expiry < time.monotonic():
+        future.cancel()
+        return None
+    try:
+        return future.result()
+    except Exception:
+        LOG.debug('Prefetching a page of a table failed, it is listed '
+                  'again.', exc_info=True)
+        return None
+
+
+def _store_prefetched_page(owner, path, page_key, future):
+    now = time.monotonic()
+    timeout = utils_settings.get_dict_config('HORIZON_TABLE_PREFETCH',
+                                             'timeout')
+    with _prefetch_lock:
+        for pages in list(_prefetched_pages.values()):
+            expired = [key for key, entry in pages.items()
+                       if entry[1] < now]
+            for key in expired:
+                del pages[key]
+        for key in [key for key, pages in _prefetched_pages.items()
+                    if not pages]:
+            del _prefetched_pages[key]
+        _prefetched_pages.setdefault(owner, {})[path] = (
+            page_key, now + timeout, future)
+
+
+def _drop_prefetched_pages(owner):
+    with _prefetch_lock:
+        pages = _prefetched_pages.pop(owner, {})
+    for unused, unused, future in pages.values():
+        future.cancel()
 
 
 class MultiTableMixin(object):
@@ -388,6 +457,76 @@ class PagedTableMixin(object):
             return marker, "desc"
         return None, "desc"
 
+    def _get_prefetch_owner(self):
+        if not utils_settings.get_dict_config('HORIZON_TABLE_PREFETCH',
+                                              'enabled'):
+            return None
+        session = getattr(self.request, 'session', None)
+        token_id = getattr(session and session.get('token'), 'id', None)
+        if not token_id:
+            return None
+        raw_key = '%s|%s' % (token_id, session.get('services_region'))
+        return hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+
+    def _drop_prefetched_pages(self):
+        owner = self._get_prefetch_owner()
+        if owner is not None:
+            _drop_prefetched_pages(owner)
+
+    def dispatch(self, request, *args, **kwargs):
+        # A form or an action may change what the prefetched pages list.
+        if request.method != 'GET':
+            self._drop_prefetched_pages()
+        return super().dispatch(request, *args, **kwargs)
+
+    def handle_table(self, table):
+        handled = super().handle_table(table)
+        if handled:
+            self._drop_prefetched_pages()
+        return handled
+
+    def get_paged_data(self, fetch, marker, sort_dir, filters=None,
+                       prefetch=None):
+        """Lists a page of the table and prefetches the next page.
+
+        ``fetch`` is called with ``marker``, ``sort_dir`` and the raw results
+        prefetched for the page, or ``None``, and returns a tuple of the data
+        of the page, whether there is a next page and whether there is a
+        previous page. It should raise an exception rather than handle it.
+
+        When ``HORIZON_TABLE_PREFETCH`` is enabled, ``prefetch`` is called
+        with the marker of the next page and returns a callable without
+        arguments listing the raw results of that page, or ``None``. The
+        callable runs in a background thread while the current response is
+        rendered and after it is sent, so it must not use the request, its
+        session or anything bound to them. Its results are kept for the
+        following request of the same user for the table, which passes them
+        to ``fetch``. ``filters`` are the other parameters of the listing; a
+        prefetched page is only used for the same filters. The prefetched
+        pages of the user are dropped when a table action is handled or a
+        request other than ``GET`` is made to a paged table.
+        """
+        owner = None
+        if prefetch is not None and self.request.method == 'GET':
+            owner = self._get_prefetch_owner()
+        if owner is None:
+            return fetch(marker, sort_dir, None)
+        path = self.request.path
+        page_key = json.dumps([marker, sort_dir, filters],
+                              sort_keys=True, default=str)
+        prefetched = _pop_prefetched_page(owner, path, page_key)
+        result = fetch(marker, sort_dir, prefetched)
+        data, has_more_data = result[0], result[1]
+        if data and has_more_data:
+            next_marker = self.get_table().get_object_id(data[-1])
+            list_page = prefetch(next_marker)
+            if list_page is not None:
+                next_page_key = json.dumps([next_marker, 'desc', filters],
+                                           sort_keys=True, default=str)
+                future = _get_prefetch_pool().submit(list_page)
+                _store_prefetched_page(owner, path, next_page_key, future)
+        return result
+
 
 class PagedTableWithPageMenu(object):
     def __init__(self, *args, **kwargs):
@@ -13,15 +13,22 @@
 #    under the License.
 
 from collections import OrderedDict
+from concurrent import futures
 import logging
 import operator
+import threading
+import time
 
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.template import TemplateSyntaxError
 from django.utils import module_loading
+from django.utils import timezone
+from django.utils import translation
+import futurist
 
 from horizon import exceptions
+from horizon import messages
 from horizon.utils import html
 from horizon.utils import settings as utils_settings
 
@@ -33,6 +40,27 @@ CSS_ACTIVE_TAB_CLASSES = ["active"]
 CSS_DISABLED_TAB_CLASSES = ["disabled"]
 
 
+_load_pool = None
+_load_lock = threading.Lock()
+_load_state = threading.local()
+
+
+def _get_load_pool():
+    global _load_pool
+    with _load_lock:
+        if _load_pool is None:
+            _load_pool = futurist.ThreadPoolExecutor(
+                max_workers=utils_settings.get_dict_config(
+                    'HORIZON_TAB_PARALLEL_LOAD', 'max_workers'))
+        return _load_pool
+
+
+def _log_abandoned_load(future):
+    if not future.cancelled() and future.result()[1] is not None:
+        LOG.debug('Loading the data of a timed out tab failed.',
+                  exc_info=future.result()[1])
+
+
 class TabGroup(html.HTMLElement):
     """A container class which knows how to manage and render Tab objects.
 
@@ -85,12 +113,21 @@ class TabGroup(html.HTMLElement):
         Read-only property which is set to the value of the current active tab.
         This may not be the same as the value of ``selected`` if no
         specific tab was requested via the ``GET`` parameter.
+
+    .. attribute:: parallel_load
+
+        Boolean to control whether the data of the tabs is loaded in
+        parallel threads. Only enable it when the ``get_context_data``
+        methods of the tabs do not depend on each other.
+        Default: ``None``, which means the value of
+        ``HORIZON_TAB_PARALLEL_LOAD['enabled']`` is used.
     """
     slug = None
     template_name = "horizon/common/_tab_group.html"
     param_name = 'tab'
     sticky = False
     show_single_tab = False
+    parallel_load = None
     _selected = None
     _active = None
 
@@ -167,6 +204,18 @@ class TabGroup(html.HTMLElement):
 
     def load_tab_data(self):
         """Preload all data that for the tabs that will be displayed."""
+        parallel_load = self.parallel_load
+        if parallel_load is None:
+            parallel_load = utils_settings.get_dict_config(
+                'HORIZON_TAB_PARALLEL_LOAD', 'enabled')
+        # Tab groups rendered by a tab loaded in parallel are loaded
+        # sequentially so they do not wait for the threads they occupy.
+        if parallel_load and not getattr(_load_state, 'active', False):
+            tabs = [tab for tab in self._tabs.values()
+                    if tab.load and not tab.data_loaded]
+            if len(tabs) > 1:
+                self._load_tab_data_parallel(tabs)
+                return
         for tab in self._tabs.values():
             if tab.load and not tab.data_loaded:
                 try:
@@ -175,6 +224,81 @@ class TabGroup(html.HTMLElement):
                     tab._data = False
                     exceptions.handle(self.request)
 
+    def _load_tab_data_parallel(self, tabs):
+        """Load the data of the given tabs on the tab loading thread pool.
+
+        The pool is shared by all the tab groups of the process. The
+        messages added by the tabs, e.g. by handling errors, are collected
+        in the threads of the pool, since message storages are not
+        thread-safe. They are added to the request and the errors raised by
+        the tabs are handled in the request thread, in the order of the
+        tabs, so that messages and redirects behave as with sequential
+        loading. A tab which is not loaded within its ``load_timeout`` is
+        rendered as a tab loaded on demand instead, except for the active
+        tab which is always waited for.
+
+        The loading of a timed out tab is cancelled if it has not started,
+        otherwise it runs to completion after the response may have been
+        sent, and its result and messages are discarded. Tabs with a
+        ``load_timeout`` must therefore not modify the request or its
+        session in ``get_context_data``.
+        """
+        default_timeout = utils_settings.get_dict_config(
+            'HORIZON_TAB_PARALLEL_LOAD', 'timeout')
+        # Make sure the lazily loaded session is not loaded concurrently
+        # by the worker threads.
+        session = getattr(self.request, 'session', None)
+        if session is not None:
+            session.keys()
+        language = translation.get_language()
+        current_timezone = timezone.get_current_timezone()
+
+        def load(tab):
+            # Translation and timezone activation are thread-local.
+            _load_state.active = True
+            try:
+                with translation.override(language), \
+                        timezone.override(current_timezone), \
+                        messages.collect_messages() as collected:
+                    try:
+                        return (tab.get_context_data(self.request), None,
+                                collected)
+                    except Exception as e:
+                        return None, e, collected
+            finally:
+                _load_state.active = False
+
+        started = time.monotonic()
+        pool = _get_load_pool()
+        tab_futures = [(tab, pool.submit(load, tab)) for tab in tabs]
+        for tab, future in tab_futures:
+            timeout = tab.load_timeout
+            if timeout is None:
+                timeout = default_timeout
+            if timeout is not None and not tab.is_active():
+                timeout = max(0, started + timeout - time.monotonic())
+            else:
+                timeout = None
+            try:
+                data, error, collected = future.result(timeout=timeout)
+            except futures.TimeoutError:
+                LOG.warning('Loading the data of tab "%s" of tab group '
+                            '"%s" timed out, it will be loaded when '
+                            'selected.', tab.slug, self.slug)
+                tab.preload = False
+                if not future.cancel():
+                    future.add_done_callback(_log_abandoned_load)
+                continue
+            for message in collected:
+                messages.add_message(self.request, *message)
+            try:
+                if error is not None:
+                    raise error
+                tab._data = data
+            except Exception:
+                tab._data = False
+                exceptions.handle(self.request)
+
     def get_id(self):
         """Returns the id for this tab group.
 
@@ -302,10 +426,21 @@ class Tab(html.HTMLElement):
 
         A list of permission names which this tab requires in order to be
         displayed. Defaults to an empty list (``[]``).
+
+    .. attribute:: load_timeout
+
+        The number of seconds to wait for the data of this tab when the tab
+        group loads its tabs in parallel. If the data is not loaded in time,
+        the tab is loaded when selected. Default: ``None``, which means the
+        value of ``HORIZON_TAB_PARALLEL_LOAD['timeout']`` is used. The
+        loading of a timed out tab may still be running after the response
+        is sent, so its ``get_context_data`` must not modify the request.
+        The messages it adds are discarded.
     """
     name = None
     slug = None
     preload = True
+    load_timeout = None
     _active = None
     permissions = []
     policy_rules = None
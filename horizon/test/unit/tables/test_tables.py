@@ -15,10 +15,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
 import unittest
 from unittest import mock
+from urllib import parse
 import uuid
 
+from django.core.cache import cache
 from django import forms
 from django import http
 from django import shortcuts
@@ -317,6 +320,18 @@ class MyTable(tables.DataTable):
                        MyBatchActionWithHelpText)
 
 
+class ProjectedTable(tables.DataTable):
+    name = tables.Column('name')
+    status = tables.Column(lambda obj: obj.status.upper(),
+                           api_fields=['status'])
+
+    class Meta(object):
+        name = "projected_table"
+        api_fields = ('tenant_id',)
+        table_actions = (MyBatchAction,)
+        row_actions = (MyAction,)
+
+
 class MyProgressTable(MyTable):
     tooltip_dict = {'started': {'percent': '10%'},
                     'half': {'percent': '50%'},
@@ -340,6 +355,15 @@ class TableWithColumnsPolicy(tables.DataTable):
                                policy_rules=[('compute', 'role:admin')])
 
 
+class CachedRowsTable(MyTable):
+    def get_row_fingerprint(self, datum):
+        # Whether the row actions are allowed only depends on the datum.
+        return (datum.name, datum.value, datum.status)
+
+    class Meta(MyTable.Meta):
+        cache_rows = True
+
+
 class MyServerFilterTable(MyTable):
     class Meta(object):
         name = "my_table"
@@ -409,6 +433,167 @@ class DisabledActionsTable(tables.DataTable):
 
 
 class DataTableTests(test.TestCase):
+    def test_get_object_by_id(self):
+        table = MyTable(self.request, TEST_DATA)
+        self.assertIs(TEST_DATA[2], table.get_object_by_id('3'))
+        self.assertIs(TEST_DATA[2], table.get_object_by_id(3))
+        self.assertRaises(exceptions.Http302, table.get_object_by_id, '5')
+
+    def test_get_object_by_id_duplicates(self):
+        data = TEST_DATA + (FakeObject('1', 'object_1_dup', 'value', 'up'),)
+        table = MyTable(self.request, data)
+        self.assertRaises(ValueError, table.get_object_by_id, '1')
+        self.assertIs(TEST_DATA[1], table.get_object_by_id('2'))
+
+    def test_get_object_by_id_index_built_once(self):
+        table = MyTable(self.request, list(TEST_DATA))
+        with mock.patch.object(table, 'get_object_id',
+                               side_effect=lambda datum: datum.id) as mock_id:
+            for datum in TEST_DATA:
+                self.assertIs(datum, table.get_object_by_id(datum.id))
+        self.assertEqual(len(TEST_DATA), mock_id.call_count)
+
+    def test_get_object_by_id_data_changed(self):
+        table = MyTable(self.request, list(TEST_DATA))
+        self.assertIs(TEST_DATA[0], table.get_object_by_id('1'))
+
+        table.data = list(TEST_DATA_2)
+        self.assertIs(TEST_DATA_2[0], table.get_object_by_id('1'))
+        self.assertRaises(exceptions.Http302, table.get_object_by_id, '3')
+
+        new_datum = FakeObject('5', 'object_5', 'value_5', 'up')
+        table.data.append(new_datum)
+        self.assertIs(new_datum, table.get_object_by_id('5'))
+
+    def test_row_cache_disabled_by_default(self):
+        table = MyTable(self.request, TEST_DATA)
+        self.assertIsNone(table.get_row_cache_key(TEST_DATA[0]))
+        self.assertFalse(any(isinstance(row, tables.base.CachedRow)
+                             for row in table.get_rows()))
+
+    @override_settings(HORIZON_TABLE_ROW_CACHE={'enabled': True})
+    def test_row_cache_opt_in(self):
+        table = MyTable(self.request, TEST_DATA)
+        self.assertIsNone(table.get_row_cache_key(TEST_DATA[0]))
+
+    @override_settings(HORIZON_TABLE_ROW_CACHE={'enabled': True})
+    def test_row_cache_row_actions_need_fingerprint(self):
+        class DefaultFingerprintTable(MyTable):
+            class Meta(MyTable.Meta):
+                cache_rows = True
+
+        table = DefaultFingerprintTable(self.request, TEST_DATA)
+        self.assertIsNone(table.get_row_cache_key(TEST_DATA[0]))
+
+    @override_settings(HORIZON_TABLE_ROW_CACHE={'enabled': True})
+    def test_row_cache_reused_across_tables(self):
+        cache.clear()
+        table = CachedRowsTable(self.request, TEST_DATA)
+        rendered = [row.render() for row in table.get_rows()]
+
+        table = CachedRowsTable(self.request, TEST_DATA)
+        with mock.patch.object(MyRow, 'load_cells') as mock_load_cells:
+            rows = table.get_rows()
+        mock_load_cells.assert_not_called()
+        self.assertTrue(all(isinstance(row, tables.base.CachedRow)
+                            for row in rows))
+        self.assertEqual(rendered, [row.render() for row in rows])
+
+    @override_settings(HORIZON_TABLE_ROW_CACHE={'enabled': True})
+    def test_row_cache_fingerprint_changed(self):
+        cache.clear()
+        table = CachedRowsTable(self.request, TEST_DATA_2)
+        [row.render() for row in table.get_rows()]
+
+        table = CachedRowsTable(self.request, TEST_DATA_3)
+        row = table.get_rows()[0]
+        self.assertIsInstance(row, MyRow)
+        self.assertIn("status_up", row.render())
+
+    @override_settings(HORIZON_TABLE_ROW_CACHE={'enabled': True})
+    def test_row_cache_without_fingerprint(self):
+        class NoFingerprintTable(CachedRowsTable):
+            def get_row_fingerprint(self, datum):
+                return None
+
+        table = NoFingerprintTable(self.request, TEST_DATA)
+        self.assertIsNone(table.get_row_cache_key(TEST_DATA[0]))
+
+    @override_settings(HORIZON_TABLE_ROW_CACHE={'enabled': True})
+    def test_row_cache_ajax_row_update(self):
+        cache.clear()
+        params = {"table": "my_table", "action": "row_update", "obj_id": "1"}
+        req = self.factory.get('/my_url/', params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        req.user = self.request.user
+        resp = CachedRowsTable(req).maybe_preempt()
+        self.assertContains(resp, "status_down")
+
+        with mock.patch.object(MyRow, 'load_cells') as mock_load_cells:
+            cached_resp = CachedRowsTable(req).maybe_preempt()
+        mock_load_cells.assert_not_called()
+        self.assertEqual(resp.content, cached_resp.content)
+
+    def test_ajax_batch_update_url(self):
+        req = self.factory.get('/my_url/', {'marker': '3'})
+        table = MyTable(req, TEST_DATA)
+        self.assertEqual('/my_url/?action=rows_update&table=my_table'
+                         '&marker=3', table.get_ajax_batch_update_url())
+        self.assertIn('data-batch-update-url="%s" data-batch-size="20"' %
+                      defaultfilters.force_escape(
+                          table.get_ajax_batch_update_url()),
+                      table.render())
+
+        table = NoActionsTable(req, TEST_DATA)
+        self.assertIsNone(table.get_ajax_batch_update_url())
+        self.assertNotIn('data-batch-update-url', table.render())
+
+    def test_ajax_batch_row_update(self):
+        def get_data(request, obj_id):
+            if obj_id == '2':
+                # GetFileError is handled as a "not found" error.
+                raise exceptions.GetFileError('name', 'resource')
+            if obj_id == '3':
+                raise exceptions.AlreadyExists('name', 'resource')
+            return TEST_DATA_2[0]
+
+        params = [('table', 'my_table'), ('action', 'rows_update'),
+                  ('obj_id', '1'), ('obj_id', '2'), ('obj_id', '3')]
+        req = self.factory.get('/my_url/?' + parse.urlencode(params),
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        with mock.patch.object(MyRow, 'get_data',
+                               side_effect=get_data) as mock_get_data:
+            resp = MyTable(req).maybe_preempt()
+        self.assertEqual(3, mock_get_data.call_count)
+        self.assertEqual(200, resp.status_code)
+        data = json.loads(resp.content)
+        self.assertEqual(['1'], list(data['rows']))
+        self.assertIn('my_table__row__1', data['rows']['1'])
+        self.assertIn('status_down', data['rows']['1'])
+        self.assertEqual(['2'], data['deleted'])
+        self.assertEqual(['3'], data['failed'])
+
+    def test_ajax_batch_row_update_chunked(self):
+        def get_data_batch(request, obj_ids):
+            return dict((obj_id, TEST_DATA_2[0]) for obj_id in obj_ids)
+
+        params = [('table', 'my_table'), ('action', 'rows_update')]
+        params += [('obj_id', str(obj_id)) for obj_id in range(5)]
+        req = self.factory.get('/my_url/?' + parse.urlencode(params),
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        with mock.patch.object(MyRow, 'ajax_batch_size', 2), \
+                mock.patch.object(MyRow, 'get_data_batch',
+                                  side_effect=get_data_batch) as mock_batch:
+            resp = MyTable(req).maybe_preempt()
+        self.assertEqual([['0', '1'], ['2', '3'], ['4']],
+                         [c[0][1] for c in mock_batch.call_args_list])
+        self.assertEqual(5, len(json.loads(resp.content)['rows']))
+
+    def test_ajax_batch_row_update_not_ajax(self):
+        params = {"table": "my_table", "action": "rows_update", "obj_id": "1"}
+        req = self.factory.get('/my_url/', params)
+        self.assertIsNone(MyTable(req).maybe_preempt())
+
     def test_table_instantiation(self):
         """Tests everything that happens when the table is instantiated."""
         self.table = MyTable(self.request, TEST_DATA)
@@ -531,6 +716,20 @@ class DataTableTests(test.TestCase):
         self.assertIsNone(name_column.form_field)
         self.assertEqual({}, name_column.form_field_attributes)
 
+    def test_table_api_fields(self):
+        self.table = ProjectedTable(self.request)
+        self.assertEqual(('id', 'name', 'status', 'tenant_id'),
+                         self.table.get_api_fields())
+
+    def test_table_api_fields_unknown(self):
+        # The table does not declare the fields its actions need.
+        self.table = MyTable(self.request)
+        self.assertIsNone(self.table.get_api_fields())
+        # A column with a callable transform does not declare its fields.
+        self.table = ProjectedTable(self.request)
+        self.table.columns['status'].api_fields = None
+        self.assertIsNone(self.table.get_api_fields())
+
     def test_table_natural_no_actions_column(self):
         class TempTable(MyTable):
             class Meta(object):
@@ -1429,6 +1628,106 @@ class DataTableViewTests(test.TestCase):
         self.assertEqual(req.session.get(self.fil_field_param), 'status')
 
 
+class PagedTableView(tables.PagedTableMixin, SingleTableView):
+    pass
+
+
+def _list_fake_objects(marker, sort_dir, prefetched):
+    if prefetched is not None:
+        return prefetched, False, True
+    if marker is None:
+        return TEST_DATA[:2], True, False
+    return TEST_DATA[2:], False, True
+
+
+@override_settings(HORIZON_TABLE_PREFETCH={'enabled': True,
+                                           'max_workers': 1,
+                                           'timeout': 30})
+class PagedTableViewTests(test.TestCase):
+    def setUp(self):
+        super().setUp()
+        table_views._prefetched_pages.clear()
+        self.fetch = mock.Mock(side_effect=_list_fake_objects)
+        self.list_page = mock.Mock(return_value=list(TEST_DATA[2:]))
+        self.prefetch = mock.Mock(return_value=self.list_page)
+
+    def _make_request(self, req):
+        req.user = self.user
+        req.session['token'] = mock.Mock(id='token-1')
+        return req
+
+    def _get_paged_data(self, marker, filters=None):
+        req = self._make_request(self.factory.get('/my_url/'))
+        view = PagedTableView()
+        view.request = req
+        view.args = ()
+        view.kwargs = {}
+        return req, view.get_paged_data(self.fetch, marker, 'desc',
+                                        filters=filters,
+                                        prefetch=self.prefetch)
+
+    def _wait_prefetched(self):
+        for pages in table_views._prefetched_pages.values():
+            for unused, unused, future in pages.values():
+                future.result()
+
+    def test_next_page_prefetched(self):
+        self._get_paged_data(None, filters={'status': 'up'})
+        self._wait_prefetched()
+        self.prefetch.assert_called_once_with('2')
+        # The page is listed without the request.
+        self.list_page.assert_called_once_with()
+
+        req, result = self._get_paged_data('2', filters={'status': 'up'})
+
+        self.assertEqual((list(TEST_DATA[2:]), False, True), result)
+        self.fetch.assert_has_calls([
+            mock.call(None, 'desc', None),
+            mock.call('2', 'desc', list(TEST_DATA[2:])),
+        ])
+        # The last page has nothing to prefetch.
+        self.assertEqual({}, table_views._prefetched_pages)
+
+    def test_prefetched_page_other_filters(self):
+        self._get_paged_data(None, filters={'status': 'up'})
+        self._wait_prefetched()
+
+        unused, result = self._get_paged_data('2',
+                                              filters={'status': 'down'})
+
+        self.assertEqual((TEST_DATA[2:], False, True), result)
+        self.fetch.assert_called_with('2', 'desc', None)
+
+    @override_settings(HORIZON_TABLE_PREFETCH={'enabled': False})
+    def test_prefetch_disabled(self):
+        unused, result = self._get_paged_data(None)
+
+        self.assertEqual((TEST_DATA[:2], True, False), result)
+        self.fetch.assert_called_once_with(None, 'desc', None)
+        self.prefetch.assert_not_called()
+        self.assertEqual({}, table_views._prefetched_pages)
+
+    def test_prefetched_pages_dropped_on_post(self):
+        self._get_paged_data(None)
+        self.assertEqual(1, len(table_views._prefetched_pages))
+
+        req = self._make_request(self.factory.post('/other_url/'))
+        PagedTableView.as_view()(req)
+
+        self.assertEqual({}, table_views._prefetched_pages)
+
+    def test_prefetched_pages_dropped_on_table_action(self):
+        self._get_paged_data(None)
+        self.assertEqual(1, len(table_views._prefetched_pages))
+
+        req = self._make_request(self.factory.get('/my_url/'))
+        with mock.patch.object(MyTable, 'maybe_handle',
+                               return_value=http.HttpResponse()):
+            PagedTableView.as_view()(req)
+
+        self.assertEqual({}, table_views._prefetched_pages)
+
+
 class FormsetTableTests(test.TestCase):
 
     def test_populate(self):
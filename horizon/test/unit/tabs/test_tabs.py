@@ -15,12 +15,15 @@
 #    under the License.
 
 import copy
+import threading
+from unittest import mock
 
 from django.conf import settings
 from django import http
 from django.test.utils import override_settings
 
 from horizon import exceptions
+from horizon import messages
 from horizon import middleware
 from horizon import tabs as horizon_tabs
 from horizon.test import helpers as test
@@ -132,6 +135,55 @@ class TabWithTableView(horizon_tabs.TabbedTableView):
     template_name = "tab_group.html"
 
 
+class SlowTab(BaseTestTab):
+    slug = "slow_tab"
+    name = "Slow Tab"
+    template_name = "_tab.html"
+    load_timeout = 0.1
+
+    release = None
+
+    def get_context_data(self, request):
+        self.release.wait(5)
+        return super().get_context_data(request)
+
+
+class ParallelGroup(horizon_tabs.TabGroup):
+    slug = "tab_group"
+    tabs = (TabOne, SlowTab, RecoverableErrorTab)
+    parallel_load = True
+
+
+class MessageTab(BaseTestTab):
+    slug = "message_tab"
+    name = "Message Tab"
+    template_name = "_tab.html"
+
+    threads = []
+
+    def get_context_data(self, request):
+        self.threads.append(threading.current_thread())
+        messages.info(request, "Loaded %s" % self.slug)
+        try:
+            exc = exceptions.AlreadyExists(self.slug, horizon_tabs.Tab)
+            exc.silence_logging = True
+            raise exc
+        except Exception:
+            exceptions.handle(request)
+        return super().get_context_data(request)
+
+
+class OtherMessageTab(MessageTab):
+    slug = "other_message_tab"
+    name = "Other Message Tab"
+
+
+class MessageGroup(horizon_tabs.TabGroup):
+    slug = "tab_group"
+    tabs = (MessageTab, OtherMessageTab, RecoverableErrorTab)
+    parallel_load = True
+
+
 class TabTests(test.TestCase):
     @override_settings(POLICY_CHECK_FUNCTION=lambda *args: True)
     def test_tab_group_basics(self):
@@ -397,3 +449,107 @@ class TabExceptionTests(test.TestCase):
             resp = mw.process_exception(req, e)
             resp.client = self.client
         self.assertRedirects(resp, RedirectExceptionTab.url)
+
+
+class ParallelTabLoadTests(test.TestCase):
+    def setUp(self):
+        super().setUp()
+        SlowTab.release = threading.Event()
+
+    def tearDown(self):
+        SlowTab.release.set()
+        super().tearDown()
+
+    def test_load_tab_data_parallel(self):
+        SlowTab.release.set()
+        request = self.factory.get("/")
+        tg = ParallelGroup(request)
+        tg.load_tab_data()
+
+        tab_one = tg.get_tab("tab_one")
+        slow_tab = tg.get_tab("slow_tab")
+        self.assertEqual({"tab": tab_one}, tab_one._data)
+        self.assertEqual({"tab": slow_tab}, slow_tab._data)
+        self.assertFalse(tg.get_tab("recoverable_error_tab")._data)
+        self.assertEqual(1, len(request._messages._queued_messages))
+
+    def test_load_tab_data_parallel_messages(self):
+        MessageTab.threads = []
+        request = self.factory.get("/")
+        tg = MessageGroup(request)
+        add = request._messages.add
+        adding_threads = []
+
+        def add_message(*args, **kwargs):
+            adding_threads.append(threading.current_thread())
+            return add(*args, **kwargs)
+
+        with mock.patch.object(request._messages, 'add',
+                               side_effect=add_message):
+            tg.load_tab_data()
+
+        # The messages are added by the request thread, in the order of the
+        # tabs, once their data is loaded.
+        self.assertEqual(2, len(MessageTab.threads))
+        self.assertNotIn(threading.current_thread(), MessageTab.threads)
+        queued = request._messages._queued_messages
+        self.assertEqual(5, len(queued))
+        self.assertEqual([threading.current_thread()] * 5, adding_threads)
+        self.assertEqual(
+            ["Loaded message_tab", "Loaded other_message_tab"],
+            [str(m.message) for m in queued[0:3:2]])
+        self.assertIn('"message_tab"', str(queued[1].message))
+        self.assertIn('"other_message_tab"', str(queued[3].message))
+        self.assertIn('"Recoverable!"', str(queued[4].message))
+        self.assertTrue(tg.get_tab("message_tab").data_loaded)
+        self.assertFalse(tg.get_tab("recoverable_error_tab")._data)
+
+    def test_load_tab_data_parallel_timeout(self):
+        tg = ParallelGroup(self.factory.get("/"))
+        tg.load_tab_data()
+
+        slow_tab = tg.get_tab("slow_tab")
+        self.assertFalse(slow_tab.data_loaded)
+        self.assertFalse(slow_tab.load)
+        self.assertEqual('', slow_tab.render())
+        self.assertTrue(tg.get_tab("tab_one").data_loaded)
+
+    def test_load_tab_data_parallel_active_tab_not_timed_out(self):
+        request = self.factory.get("/", {"tab": "tab_group__slow_tab"})
+        threading.Timer(0.3, SlowTab.release.set).start()
+        tg = ParallelGroup(request)
+        tg.load_tab_data()
+
+        slow_tab = tg.get_tab("slow_tab")
+        self.assertTrue(slow_tab.is_active())
+        self.assertEqual({"tab": slow_tab}, slow_tab._data)
+
+    def test_load_tab_data_parallel_shared_pool(self):
+        SlowTab.release.set()
+        ParallelGroup(self.factory.get("/")).load_tab_data()
+        pool = horizon_tabs.base._get_load_pool()
+
+        ParallelGroup(self.factory.get("/")).load_tab_data()
+
+        self.assertIs(pool, horizon_tabs.base._get_load_pool())
+        self.assertTrue(pool.alive)
+
+    def test_load_tab_data_nested_sequential(self):
+        SlowTab.release.set()
+        tg = ParallelGroup(self.factory.get("/"))
+        horizon_tabs.base._load_state.active = True
+        self.addCleanup(setattr, horizon_tabs.base._load_state, 'active',
+                        False)
+        with mock.patch.object(tg, '_load_tab_data_parallel') as mock_load:
+            tg.load_tab_data()
+
+        mock_load.assert_not_called()
+        self.assertTrue(tg.get_tab("slow_tab").data_loaded)
+
+    @override_settings(HORIZON_TAB_PARALLEL_LOAD={'enabled': True})
+    def test_load_tab_data_parallel_from_settings(self):
+        tg = Group(self.request)
+        with mock.patch.object(tg, '_load_tab_data_parallel') as mock_load:
+            tg.load_tab_data()
+        mock_load.assert_called_once_with([tg.get_tab("tab_one"),
+                                           tg.get_tab("tab_with_policy")])
@@ -18,10 +18,13 @@
 #    under the License.
 
 import importlib
+from unittest import mock
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
+from django import http
 from django.test.utils import override_settings
 from django import urls
 
@@ -563,3 +566,43 @@ class RbacHorizonTests(test.TestCase):
                                  transform=repr)
 
         self.assertTrue(dogs.can_access(context))
+
+    def _get_request(self, token_id):
+        request = http.HttpRequest()
+        request.session = {'token': mock.Mock(id=token_id)}
+        request.user = self.user
+        return request
+
+    def test_access_not_cached_by_default(self):
+        context = {'request': self._get_request('token-1')}
+        dogs = horizon.get_dashboard("dogs")
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=True) as mock_allowed:
+            self.assertTrue(dogs.can_access(context))
+            self.assertTrue(dogs.can_access(context))
+        self.assertEqual(2, mock_allowed.call_count)
+        self.assertNotIn('allowed', context['request'].session)
+
+    @override_settings(HORIZON_ACCESS_CACHE={'enabled': True})
+    def test_access_cached_per_token(self):
+        cache.clear()
+        dogs = horizon.get_dashboard("dogs")
+        with mock.patch.object(RbacYesAccessPanel, 'allowed',
+                               return_value=True) as mock_allowed:
+            context = {'request': self._get_request('token-1')}
+            self.assertTrue(dogs.can_access(context))
+            self.assertTrue(dogs.can_access(context))
+            # The whole navigation was checked in one pass.
+            self.assertFalse(horizon.get_dashboard("cats").can_access(context))
+            self.assertEqual(1, mock_allowed.call_count)
+
+            # The next request with the same token reads the cache.
+            context = {'request': self._get_request('token-1')}
+            self.assertTrue(dogs.can_access(context))
+            self.assertEqual(1, mock_allowed.call_count)
+
+            # A new token, e.g. after switching projects, is checked again.
+            context = {'request': self._get_request('token-2')}
+            self.assertTrue(dogs.can_access(context))
+            self.assertEqual(2, mock_allowed.call_count)
+        self.assertNotIn('allowed', context['request'].session)
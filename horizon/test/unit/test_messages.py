@@ -14,6 +14,7 @@
 
 import json
 
+from django.contrib.messages import constants
 from django import http
 from django.utils.encoding import force_str
 from django.utils.safestring import mark_safe
@@ -53,3 +54,15 @@ class MessageTests(test.TestCase):
             ._process_response(req, res)
         self.assertEqual(json.dumps([expected]),
                          res['X-Horizon-Messages'])
+
+    def test_collect_messages(self):
+        req = self.request
+        req.META['HTTP_X_REQUESTED_WITH'] = 'XMLHttpRequest'
+        with messages.collect_messages() as collected:
+            messages.warning(req, "Ants!", extra_tags="insects")
+        self.assertEqual([(constants.WARNING, "Ants!", "insects", False)],
+                         collected)
+        self.assertCountEqual(req.horizon['async_messages'], [])
+        messages.add_message(req, *collected[0])
+        self.assertCountEqual(req.horizon['async_messages'],
+                              [["warning", "Ants!", "insects"]])
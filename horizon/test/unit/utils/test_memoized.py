@@ -10,6 +10,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
 from horizon.test import helpers as test
 from horizon.utils import memoized
 
@@ -80,3 +87,205 @@ class MemoizedTests(test.TestCase):
         cache_calls(4)
         self.assertEqual(9, len(values_list))
         # 4 is readded, 5 is dropped
+
+
+SHARED_CACHE_ENABLED = {
+    'enabled': True,
+    'cache_alias': 'default',
+    'timeout': 30,
+    'timeouts': {},
+}
+
+
+def _fake_request(project_id='p1', roles=('member',), region='RegionOne'):
+    user = mock.Mock(project_id=project_id,
+                     roles=[{'name': role} for role in roles],
+                     services_region=region)
+    return mock.Mock(user=user)
+
+
+@override_settings(MEMOIZED_SHARED_CACHE=SHARED_CACHE_ENABLED)
+class SharedMemoizedTests(test.TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.calls = []
+
+        @memoized.shared_memoized('thing')
+        def thing_list(request, **params):
+            self.calls.append(params)
+            return ['thing', params.get('name')]
+
+        @memoized.invalidates_shared_memoized('thing')
+        def thing_create(request):
+            pass
+
+        self.thing_list = thing_list
+        self.thing_create = thing_create
+
+    def test_cached_across_requests(self):
+        self.assertEqual(['thing', 'a'],
+                         self.thing_list(_fake_request(), name='a'))
+        self.assertEqual(['thing', 'a'],
+                         self.thing_list(_fake_request(), name='a'))
+        self.assertEqual(1, len(self.calls))
+
+    def test_keyed_by_arguments(self):
+        self.thing_list(_fake_request(), name='a')
+        self.thing_list(_fake_request(), name='b')
+        self.assertEqual(2, len(self.calls))
+
+    def test_keyed_by_project_roles_and_region(self):
+        self.thing_list(_fake_request())
+        self.thing_list(_fake_request(project_id='p2'))
+        self.thing_list(_fake_request(roles=('admin', 'member')))
+        self.thing_list(_fake_request(region='RegionTwo'))
+        self.assertEqual(4, len(self.calls))
+        self.thing_list(_fake_request(roles=('member',)))
+        self.assertEqual(4, len(self.calls))
+
+    def test_invalidated_by_decorated_call(self):
+        self.thing_list(_fake_request())
+        self.thing_create(_fake_request())
+        self.thing_list(_fake_request())
+        self.assertEqual(2, len(self.calls))
+
+    def test_invalidated_when_decorated_call_fails(self):
+        @memoized.invalidates_shared_memoized('thing')
+        def thing_delete(request):
+            raise ValueError()
+
+        self.thing_list(_fake_request())
+        self.assertRaises(ValueError, thing_delete, _fake_request())
+        self.thing_list(_fake_request())
+        self.assertEqual(2, len(self.calls))
+
+    def test_not_cacheable_arguments_are_not_cached(self):
+        self.thing_list(_fake_request(), name='a', obj=object())
+        self.thing_list(_fake_request(), name='a', obj=object())
+        self.assertEqual(2, len(self.calls))
+
+    def test_dump_and_load(self):
+        @memoized.shared_memoized(
+            'thing',
+            dump=lambda value: value['id'],
+            load=lambda request, value: {'id': value, 'loaded': True})
+        def thing_get(request):
+            self.calls.append(None)
+            return {'id': 'foo', 'client': object()}
+
+        expected = {'id': 'foo', 'loaded': True}
+        self.assertEqual(expected, thing_get(_fake_request()))
+        self.assertEqual(expected, thing_get(_fake_request()))
+        self.assertEqual(1, len(self.calls))
+
+    def test_cache_unavailable(self):
+        with mock.patch.object(cache, 'get', side_effect=IOError), \
+                mock.patch.object(cache, 'set', side_effect=IOError):
+            self.assertEqual(['thing', 'a'],
+                             self.thing_list(_fake_request(), name='a'))
+            self.assertEqual(['thing', 'a'],
+                             self.thing_list(_fake_request(), name='a'))
+            # The cache cannot be invalidated either.
+            self.thing_create(_fake_request())
+        self.assertEqual(2, len(self.calls))
+
+    def test_cache_not_keeping_generation(self):
+        with mock.patch.object(cache, 'get', return_value=None), \
+                mock.patch.object(cache, 'set') as mock_set:
+            self.thing_list(_fake_request())
+            self.thing_list(_fake_request())
+        self.assertEqual(2, len(self.calls))
+        mock_set.assert_not_called()
+
+    @override_settings(MEMOIZED_SHARED_CACHE=dict(SHARED_CACHE_ENABLED,
+                                                  enabled=False))
+    def test_disabled(self):
+        self.thing_list(_fake_request())
+        self.thing_list(_fake_request())
+        self.assertEqual(2, len(self.calls))
+
+
+@override_settings(MEMOIZED_REQUEST_COALESCING=True)
+class CoalescedTests(test.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        self.calls = []
+
+        @memoized.coalesced
+        def thing_list(request, search_opts=None):
+            self.calls.append(search_opts)
+            return ['thing']
+
+        self.thing_list = thing_list
+
+    def test_equal_arguments_are_shared(self):
+        request = self.factory.get('/')
+        first = self.thing_list(request, search_opts={'name': 'a'})
+        second = self.thing_list(request, search_opts={'name': 'a'})
+        self.assertIs(first, second)
+        self.assertEqual(1, len(self.calls))
+        self.thing_list(request, search_opts={'name': 'b'})
+        self.assertEqual(2, len(self.calls))
+        self.assertEqual(
+            {"%s.%s(){'search_opts':{'name':'a'}}" % (
+                __name__, self.thing_list.__qualname__): 1},
+            memoized.get_coalesced_duplicates(request))
+
+    def test_not_shared_between_requests(self):
+        self.thing_list(self.factory.get('/'))
+        self.thing_list(self.factory.get('/'))
+        self.assertEqual(2, len(self.calls))
+
+    def test_not_shared_for_post_requests(self):
+        request = self.factory.post('/')
+        self.thing_list(request)
+        self.thing_list(request)
+        self.assertEqual(2, len(self.calls))
+        self.assertEqual({}, memoized.get_coalesced_duplicates(request))
+
+    @override_settings(MEMOIZED_REQUEST_COALESCING=False)
+    def test_disabled(self):
+        request = self.factory.get('/')
+        self.thing_list(request)
+        self.thing_list(request)
+        self.assertEqual(2, len(self.calls))
+
+    def test_failed_calls_are_not_shared(self):
+        @memoized.coalesced
+        def thing_get(request):
+            self.calls.append(None)
+            raise ValueError()
+
+        request = self.factory.get('/')
+        self.assertRaises(ValueError, thing_get, request)
+        self.assertRaises(ValueError, thing_get, request)
+        self.assertEqual(2, len(self.calls))
+
+    def test_concurrent_calls_are_shared(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        @memoized.coalesced
+        def thing_get(request):
+            self.calls.append(None)
+            started.set()
+            release.wait(5)
+            return 'thing'
+
+        request = self.factory.get('/')
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(thing_get(request)))
+            for i in range(3)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(['thing'] * 3, results)
+        self.assertEqual(1, len(self.calls))
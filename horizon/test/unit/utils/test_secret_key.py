@@ -11,6 +11,8 @@
 #    under the License.
 
 import os
+import shutil
+import tempfile
 import unittest
 
 from horizon.utils import secret_key
@@ -25,7 +27,11 @@ class SecretKeyTests(unittest.TestCase):
         self.assertNotEqual(key, secret_key.generate_key(32))
 
     def test_generate_or_read_key_from_file(self):
-        key_file = ".test_secret_key_store"
+        # The key file and its lock file are written to a temporary
+        # directory rather than the current one.
+        key_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, key_dir)
+        key_file = os.path.join(key_dir, ".test_secret_key_store")
         key = secret_key.generate_or_read_from_file(key_file)
 
         # Consecutive reads should come from the already existing file:
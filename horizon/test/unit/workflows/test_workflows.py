@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
 from unittest import mock
 
 from django import forms
@@ -182,6 +183,38 @@ class FullscreenWorkflowView(workflows.WorkflowView):
     template_name = "workflow.html"
 
 
+class LazyMembershipAction(workflows.MembershipAction):
+    lazy = True
+
+    def __init__(self, request, *args, **kwargs):
+        super().__init__(request, *args, **kwargs)
+        field_name = self.get_member_field_name('role-1')
+        self.fields[field_name] = self.get_member_field(
+            'Role 1', [('user-1', 'User 1')])
+
+    def get_search_url(self):
+        return '/search/'
+
+    class Meta(object):
+        name = "Lazy Members"
+        slug = "lazy_members"
+
+
+class LazyMembersStep(workflows.UpdateMembersStep):
+    action_class = LazyMembershipAction
+
+
+class LazyMembersWorkflow(workflows.Workflow):
+    slug = "lazy_members_workflow"
+    default_steps = (LazyMembersStep,)
+
+
+class MembershipSearchViewForTesting(workflows.MembershipSearchView):
+    def get_candidates(self, request, query):
+        return [('id-%d' % i, 'User %d' % i) for i in range(5)
+                if query in 'User %d' % i]
+
+
 class WorkflowsTests(test.TestCase):
     def setUp(self):
         super().setUp()
@@ -430,3 +463,37 @@ class WorkflowsTests(test.TestCase):
         view.request = request
         context = view.get_context_data()
         self.assertIsNone(context['REDIRECT_URL'])
+
+    def test_lazy_membership_action(self):
+        flow = LazyMembersWorkflow(self.request)
+        step = flow.get_step('lazy_members')
+        self.assertTrue(step.lazy)
+        self.assertEqual('/search/', step.get_search_url())
+
+        request = self.factory.post('/', {
+            'lazy_members_role_role-1': ['user-1', 'user-2']})
+        action = LazyMembershipAction(request, {})
+        # Members found by a search are not in the choices of the field.
+        self.assertTrue(action.is_valid())
+        self.assertEqual(['user-1', 'user-2'],
+                         action.cleaned_data['lazy_members_role_role-1'])
+
+    @override_settings(API_RESULT_PAGE_SIZE=2)
+    def test_membership_search_view(self):
+        view = MembershipSearchViewForTesting.as_view()
+
+        response = view(self.factory.get('/', {'q': 'User'}))
+        self.assertEqual({'items': [{'id': 'id-0', 'name': 'User 0'},
+                                    {'id': 'id-1', 'name': 'User 1'}],
+                          'more': True},
+                         json.loads(response.content))
+
+        response = view(self.factory.get('/', {'q': 'User',
+                                               'marker': 'id-3'}))
+        self.assertEqual({'items': [{'id': 'id-4', 'name': 'User 4'}],
+                          'more': False},
+                         json.loads(response.content))
+
+        response = view(self.factory.get('/', {'q': ' '}))
+        self.assertEqual({'items': [], 'more': False},
+                         json.loads(response.content))
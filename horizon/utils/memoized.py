@@ -14,11 +14,20 @@
 
 import collections
 import functools
+import hashlib
+import logging
 import threading
+import uuid
 import warnings
 import weakref
 
 from django.conf import settings
+from django.core.cache import caches
+
+from horizon.utils import settings as utils_settings
+
+
+LOG = logging.getLogger(__name__)
 
 
 class UnhashableKeyWarning(RuntimeWarning):
@@ -132,6 +141,280 @@ def memoized(func=None, max_size=None):
     return decorate
 
 
+class _NotCacheable(Exception):
+    """Raised when an argument cannot be turned into a shared cache key."""
+
+
+def _normalize_arg(arg):
+    """Return a stable, printable representation of a call argument.
+
+    Only plain values and containers of plain values can be shared between
+    requests, everything else raises ``_NotCacheable``.
+    """
+    if arg is None or isinstance(arg, (bool, int, float, str)):
+        return repr(arg)
+    if isinstance(arg, (list, tuple)):
+        return '(%s)' % ','.join(_normalize_arg(a) for a in arg)
+    if isinstance(arg, (set, frozenset)):
+        return '{%s}' % ','.join(sorted(_normalize_arg(a) for a in arg))
+    if isinstance(arg, dict):
+        return '{%s}' % ','.join(
+            sorted('%s:%s' % (_normalize_arg(k), _normalize_arg(v))
+                   for k, v in arg.items()))
+    raise _NotCacheable(type(arg).__name__)
+
+
+def _get_shared_config(key):
+    return utils_settings.get_dict_config('MEMOIZED_SHARED_CACHE', key)
+
+
+def _get_shared_cache():
+    return caches[_get_shared_config('cache_alias')]
+
+
+def _get_generation_key(group):
+    return 'horizon:memoized:generation:%s' % group
+
+
+def _get_generation(cache, group):
+    """Return the current generation token of a cache group.
+
+    The token is random rather than a counter, so that the eviction of the
+    generation entry can never bring stale entries back to life. ``None``
+    is returned when the cache does not keep the token.
+    """
+    key = _get_generation_key(group)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        generation = cache.get(key)
+    return generation
+
+
+def _get_shared_key(func, group, generation, request, args, kwargs):
+    user = request.user
+    scope = (
+        getattr(user, 'project_id', None),
+        sorted(role['name'] for role in getattr(user, 'roles', None) or []),
+        getattr(user, 'services_region', None),
+    )
+    raw_key = '|'.join((
+        '%s.%s' % (func.__module__, func.__qualname__),
+        generation,
+        _normalize_arg(scope),
+        _normalize_arg(args),
+        _normalize_arg(kwargs),
+    ))
+    digest = hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+    return 'horizon:memoized:%s:%s' % (group, digest)
+
+
+def shared_memoized(group, timeout=None, dump=None, load=None):
+    """Decorator that caches API read results across requests.
+
+    It is a no-op unless ``MEMOIZED_SHARED_CACHE['enabled']`` is set. When
+    enabled, the return value of the decorated function is stored in the
+    Django cache configured by ``MEMOIZED_SHARED_CACHE['cache_alias']``,
+    keyed by the project, the role names and the region of the user of
+    the request passed as the first argument, and by the other arguments.
+
+    :param group: name of the resource group the results belong to.
+        All cached results of a group are dropped together by
+        :func:`invalidate_shared_memoized` or by a function decorated with
+        :func:`invalidates_shared_memoized`.
+    :param timeout: time to live of the cached values in seconds.
+        It can be overridden per group by
+        ``MEMOIZED_SHARED_CACHE['timeouts']`` and defaults to
+        ``MEMOIZED_SHARED_CACHE['timeout']``.
+    :param dump: optional callable converting the return value into
+        a picklable value which can safely be shared, for example by
+        dropping references to API clients.
+    :param load: optional callable taking the request and the cached value
+        and returning the value to be returned to the caller.
+    """
+
+    def decorate(func):
+
+        @functools.wraps(func)
+        def wrapped(request, *args, **kwargs):
+            if (not _get_shared_config('enabled') or
+                    not hasattr(request, 'user')):
+                return func(request, *args, **kwargs)
+
+            cache = _get_shared_cache()
+            try:
+                generation = _get_generation(cache, group)
+                cached = None
+                if generation is not None:
+                    key = _get_shared_key(func, group, generation,
+                                          request, args, kwargs)
+                    cached = cache.get(key)
+            except _NotCacheable as e:
+                LOG.debug("Arguments of %s.%s cannot be shared between "
+                          "requests (%s), the result is not cached.",
+                          func.__module__, func.__name__, e)
+                return func(request, *args, **kwargs)
+            except Exception:
+                LOG.warning("Failed to read the result of %s.%s from the "
+                            "shared cache, it is not cached.",
+                            func.__module__, func.__name__, exc_info=True)
+                return func(request, *args, **kwargs)
+            if generation is None:
+                return func(request, *args, **kwargs)
+
+            if cached is None:
+                value = func(request, *args, **kwargs)
+                cached = dump(value) if dump else value
+                ttl = _get_shared_config('timeouts').get(group, timeout)
+                if ttl is None:
+                    ttl = _get_shared_config('timeout')
+                try:
+                    cache.set(key, cached, ttl)
+                except Exception:
+                    LOG.warning("Failed to store the result of %s.%s in "
+                                "the shared cache.",
+                                func.__module__, func.__name__,
+                                exc_info=True)
+                if not dump:
+                    return value
+            return load(request, cached) if load else cached
+        return wrapped
+    return decorate
+
+
+def invalidate_shared_memoized(*groups):
+    """Drop all results cached by :func:`shared_memoized` for given groups."""
+    if not _get_shared_config('enabled'):
+        return
+    cache = _get_shared_cache()
+    for group in groups:
+        try:
+            cache.set(_get_generation_key(group), uuid.uuid4().hex, None)
+        except Exception:
+            LOG.warning("Failed to drop the results of group %s from the "
+                        "shared cache.", group, exc_info=True)
+
+
+def invalidates_shared_memoized(*groups):
+    """Decorator for API calls which modify resources of given groups.
+
+    The cached results of the groups are dropped after the decorated
+    function returns, and also when it fails as the resource may have been
+    modified partially.
+    """
+
+    def decorate(func):
+
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                invalidate_shared_memoized(*groups)
+        return wrapped
+    return decorate
+
+
+class _CoalescedCall(object):
+    """A call shared by all identical calls made while serving a request."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.exception = None
+
+
+class _CoalescingRegistry(object):
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.counts = collections.Counter()
+
+
+_coalescing_registry_lock = threading.Lock()
+
+
+def _get_coalescing_registry(request):
+    with _coalescing_registry_lock:
+        registry = getattr(request, '_horizon_coalesced_calls', None)
+        if registry is None:
+            registry = _CoalescingRegistry()
+            request._horizon_coalesced_calls = registry
+    return registry
+
+
+def coalesced(func):
+    """Decorator that shares identical API reads made within a request.
+
+    Unlike :func:`memoized`, calls are matched on the values of their
+    arguments rather than on their identity, so a dict of search options
+    built twice by two callers still results in a single API call. If an
+    identical call is already running in another thread, the caller waits
+    for its result instead of issuing the call again.
+
+    The first argument of the decorated function must be the request.
+    Only reads of ``GET`` and ``HEAD`` requests are shared, so that data
+    modified while processing a form or a REST call is always reloaded.
+    Failed calls are not remembered.
+
+    The callers get the same result objects, so this is only done when the
+    ``MEMOIZED_REQUEST_COALESCING`` setting is enabled.
+    """
+
+    @functools.wraps(func)
+    def wrapped(request, *args, **kwargs):
+        if (not settings.MEMOIZED_REQUEST_COALESCING or
+                getattr(request, 'method', None) not in ('GET', 'HEAD')):
+            return func(request, *args, **kwargs)
+        try:
+            key = '%s.%s%s%s' % (func.__module__, func.__qualname__,
+                                 _normalize_arg(args),
+                                 _normalize_arg(kwargs))
+        except _NotCacheable:
+            return func(request, *args, **kwargs)
+
+        registry = _get_coalescing_registry(request)
+        with registry.lock:
+            registry.counts[key] += 1
+            call = registry.calls.get(key)
+            owner = call is None
+            if owner:
+                call = registry.calls[key] = _CoalescedCall()
+
+        if not owner:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.value
+
+        try:
+            call.value = func(request, *args, **kwargs)
+        except Exception as e:
+            call.exception = e
+            with registry.lock:
+                registry.calls.pop(key, None)
+            raise
+        finally:
+            call.done.set()
+        return call.value
+    return wrapped
+
+
+def get_coalesced_duplicates(request):
+    """Return how many times each coalesced call was repeated in a request.
+
+    :returns: a dict mapping call signatures to the number of calls
+        which were served without calling the API again.
+    """
+    registry = getattr(request, '_horizon_coalesced_calls', None)
+    if registry is None:
+        return {}
+    with registry.lock:
+        return {key: count - 1 for key, count in registry.counts.items()
+                if count > 1}
+
+
 # We can use @memoized for methods now too, because it uses weakref and so
 # it doesn't keep the instances in memory forever. We might want to separate
 # them in the future, however.
@@ -17,12 +17,14 @@ from horizon.workflows.base import MembershipAction
 from horizon.workflows.base import Step
 from horizon.workflows.base import UpdateMembersStep
 from horizon.workflows.base import Workflow
+from horizon.workflows.views import MembershipSearchView
 from horizon.workflows.views import WorkflowView
 
 
 __all__ = [
     'Action',
     'MembershipAction',
+    'MembershipSearchView',
     'Step',
     'UpdateMembersStep',
     'Workflow',
@@ -203,18 +203,62 @@ class Action(forms.Form, metaclass=ActionMetaclass):
         return None
 
 
+class _MemberChoiceField(forms.MultipleChoiceField):
+    """A multiple choice field which accepts values outside its choices.
+
+    In lazy mode the choices only hold the current members, the members
+    added from the search results are checked by the service when the
+    workflow is handled.
+    """
+
+    def valid_value(self, value):
+        return True
+
+
 class MembershipAction(Action):
     """An action that allows a user to add/remove members from a group.
 
     Extend the Action class with additional helper method for membership
     management.
+
+    .. attribute:: lazy
+
+        Set to ``True`` to only load the current members with the action.
+        The other candidates are then searched from the browser through the
+        JSON view at :meth:`get_search_url`, see
+        :class:`~horizon.workflows.MembershipSearchView`. Defaults to
+        ``False``.
     """
+    lazy = False
+
     def get_default_role_field_name(self):
         return "default_" + self.slug + "_role"
 
     def get_member_field_name(self, role_id):
         return self.slug + "_role_" + role_id
 
+    def get_member_field(self, label, choices):
+        """Returns a field for the members having a role.
+
+        :param label: the label of the field, usually the role name.
+        :param choices: the ``(id, name)`` pairs of the candidates, or in
+            lazy mode of the current members only.
+        """
+        if self.lazy:
+            field = _MemberChoiceField(required=False, label=label)
+        else:
+            field = forms.MultipleChoiceField(required=False, label=label)
+        field.choices = choices
+        field.initial = []
+        return field
+
+    def get_search_url(self):
+        """Returns the URL of the view searching the candidates.
+
+        It must be implemented by actions in lazy mode.
+        """
+        raise NotImplementedError
+
 
 class Step(object):
     """A wrapper around an action which defines its context in a workflow.
@@ -509,6 +553,11 @@ class UpdateMembersStep(Step):
 
         The placeholder text used when the members list is empty.
 
+    .. attribute:: search_text
+
+        The placeholder text of the available list in lazy mode, before
+        anything was searched.
+
     """
     template_name = "horizon/common/_workflow_step_update_members.html"
     show_roles = True
@@ -516,6 +565,17 @@ class UpdateMembersStep(Step):
     members_list_title = _("Members")
     no_available_text = _("None available.")
     no_members_text = _("No members.")
+    search_text = _("Enter a name to search.")
+
+    @property
+    def lazy(self):
+        """Whether the candidates are searched from the browser."""
+        return getattr(self.action, 'lazy', False)
+
+    def get_search_url(self):
+        if self.lazy:
+            return self.action.get_search_url()
+        return None
 
     def get_member_field_name(self, role_id):
         if issubclass(self.action_class, MembershipAction):
@@ -25,6 +25,7 @@ from horizon import exceptions
 from horizon.forms import views as hz_views
 from horizon.forms.views import ADD_TO_FIELD_HEADER
 from horizon import messages
+from horizon.utils import functions
 from horizon.utils import http as http_utils
 
 
@@ -225,3 +226,43 @@ class WorkflowView(hz_views.ModalBackdropMixin, generic.TemplateView):
             return response
         next_url = self.request.POST.get(workflow.redirect_param_name)
         return shortcuts.redirect(next_url or workflow.get_success_url())
+
+
+class MembershipSearchView(generic.View):
+    """Returns a page of the candidates of a lazy membership step as JSON.
+
+    The view answers ``GET`` requests with the text to search in ``q`` and
+    optionally, in ``marker``, the id of the last candidate of the previous
+    page. The response is an object with the ``items`` of the page, each
+    with an ``id`` and a ``name``, and ``more`` telling whether there are
+    more pages. Nothing is searched when ``q`` is empty.
+
+    Subclasses must implement :meth:`get_candidates`.
+    """
+
+    def get_candidates(self, request, query):
+        """Returns the ``(id, name)`` pairs of the candidates for a query.
+
+        The candidates should be filtered by the service so that only those
+        matching ``query`` are transferred.
+        """
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        query = request.GET.get('q', '').strip()
+        candidates = []
+        if query:
+            candidates = sorted(self.get_candidates(request, query),
+                                key=lambda c: (c[1].lower(), c[0]))
+        start = 0
+        marker = request.GET.get('marker')
+        if marker:
+            ids = [candidate_id for candidate_id, unused in candidates]
+            if marker in ids:
+                start = ids.index(marker) + 1
+        end = start + functions.get_page_size(request)
+        return http.JsonResponse({
+            'items': [{'id': candidate_id, 'name': name}
+                      for candidate_id, name in candidates[start:end]],
+            'more': end < len(candidates),
+        })
@@ -178,5 +178,16 @@ POLICY_FILES_PATH = ''
 POLICY_FILES = {}
 POLICY_DIRS = {}
 DEFAULT_POLICY_FILES = {}
+# Reuse the result of identical policy checks made while serving a request.
+POLICY_CHECK_CACHE = True
+
+# Cache the projects of a user listed with their unscoped token, for the
+# project switcher rendered on every page. See
+# openstack_auth.utils.get_cached_project_list.
+PROJECT_LIST_CACHE = {
+    'enabled': False,
+    'cache_alias': 'default',
+    'timeout': 300,
+}
 
 OPENSTACK_KEYSTONE_MFA_TOTP_ENABLED = False
@@ -17,6 +17,7 @@ import logging
 import os.path
 
 from django.conf import settings
+from django.contrib import auth
 from oslo_config import cfg
 from oslo_policy import opts as policy_opts
 from oslo_policy import policy
@@ -28,6 +29,12 @@ from openstack_auth import utils as auth_utils
 LOG = logging.getLogger(__name__)
 
 _ENFORCER = None
+# Incremented whenever the enforcers are dropped so that check results
+# memoized on requests are not reused with the new rules.
+_GENERATION = 0
+# Rules of each enforcer and name of the rule deciding each action among
+# them, see _get_rule_name().
+_RULE_NAMES = {}
 _BASE_PATH = settings.POLICY_FILES_PATH
 
 
@@ -147,7 +154,83 @@ def _get_enforcer():
 
 def reset():
     global _ENFORCER
+    global _GENERATION
     _ENFORCER = None
+    _GENERATION += 1
+    _RULE_NAMES.clear()
+
+
+class _CheckCache(dict):
+    """Results of the policy checks made while serving a request.
+
+    It also holds the user of the request and its credentials, which are
+    otherwise rebuilt from the session for every check.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.evaluated = 0
+        self.reused = 0
+        self.user_key = None
+        self.credentials = None
+        self.credentials_key = None
+
+
+def _get_check_cache(request):
+    cache = getattr(request, '_policy_check_cache', None)
+    if not isinstance(cache, _CheckCache):
+        cache = _CheckCache()
+        try:
+            request._policy_check_cache = cache
+        except AttributeError:
+            pass
+    return cache
+
+
+def _freeze(values):
+    if values is None:
+        return None
+    return tuple(sorted((key, repr(value)) for key, value in values.items()))
+
+
+def _get_credentials(request, cache):
+    """Returns the user of the request and its credentials.
+
+    The result is a tuple of the user, its project credentials and its
+    domain credentials, or ``None`` if there is no domain scoped token.
+    """
+    if cache is not None:
+        session = getattr(request, 'session', None) or {}
+        user_key = (session.get(auth.SESSION_KEY),
+                    getattr(session.get('token'), 'id', None))
+        if cache.credentials is not None and cache.user_key == user_key:
+            return cache.credentials
+
+    user = auth_utils.get_user(request)
+    credentials = _user_to_credentials(user)
+    domain_credentials = _domain_to_credentials(request, user)
+    # if there is a domain token use the domain_id instead of the user's domain
+    if domain_credentials:
+        credentials['domain_id'] = domain_credentials.get('domain_id')
+
+    if cache is not None:
+        cache.user_key = user_key
+        cache.credentials = (user, credentials, domain_credentials)
+        cache.credentials_key = (_freeze(credentials),
+                                 _freeze(domain_credentials))
+    return user, credentials, domain_credentials
+
+
+def get_check_statistics(request):
+    """Returns the numbers of policy rules evaluated and reused.
+
+    :param request: django http request object
+    :returns: a dict with the number of rule evaluations made while serving
+        the request (``evaluated``) and the number of checks answered from
+        the results of earlier identical checks (``reused``).
+    """
+    cache = _get_check_cache(request)
+    return {'evaluated': cache.evaluated, 'reused': cache.reused}
 
 
 def check(actions, request, target=None):
@@ -190,7 +273,14 @@ def check(actions, request, target=None):
     """
     if target is None:
         target = {}
-    user = auth_utils.get_user(request)
+
+    # The same checks are made over and over while rendering a page, for
+    # example for each row action of each row of a table, so their results
+    # are kept on the request for the time it is served.
+    cache = None
+    if settings.POLICY_CHECK_CACHE:
+        cache = _get_check_cache(request)
+    user, credentials, domain_credentials = _get_credentials(request, cache)
 
     # Several service policy engines default to a project id check for
     # ownership. Since the user is already scoped to a project, if a
@@ -231,30 +321,28 @@ def check(actions, request, target=None):
         if target.get(key) is None:
             target[key] = user.user_domain_id
 
-    credentials = _user_to_credentials(user)
-    domain_credentials = _domain_to_credentials(request, user)
-    # if there is a domain token use the domain_id instead of the user's domain
-    if domain_credentials:
-        credentials['domain_id'] = domain_credentials.get('domain_id')
-
     enforcer = _get_enforcer()
+    if cache is not None:
+        key_base = (_GENERATION, _freeze(target)) + cache.credentials_key
 
     for action in actions:
         scope, action = action[0], action[1]
         if scope in enforcer:
-            # this is for handling the v3 policy file and will only be
-            # needed when a domain scoped token is present
-            if scope == 'identity' and domain_credentials:
-                # use domain credentials
-                if not _check_credentials(enforcer[scope],
-                                          action,
-                                          target,
-                                          domain_credentials):
-                    return False
-
-            # use project credentials
-            if not _check_credentials(enforcer[scope],
-                                      action, target, credentials):
+            if cache is None:
+                allowed = _check_action(enforcer[scope], scope, action,
+                                        target, credentials,
+                                        domain_credentials)
+            else:
+                key = (scope, action) + key_base
+                allowed = cache.get(key)
+                if allowed is None:
+                    allowed = cache[key] = _check_action(
+                        enforcer[scope], scope, action, target, credentials,
+                        domain_credentials)
+                    cache.evaluated += 1
+                else:
+                    cache.reused += 1
+            if not allowed:
                 return False
 
         # if no policy for scope, allow action, underlying API will
@@ -263,21 +351,60 @@ def check(actions, request, target=None):
     return True
 
 
+def _check_action(enforcer_scope, scope, action, target, credentials,
+                  domain_credentials):
+    # this is for handling the v3 policy file and will only be
+    # needed when a domain scoped token is present
+    if scope == 'identity' and domain_credentials:
+        # use domain credentials
+        if not _check_credentials(enforcer_scope, action,
+                                  target, domain_credentials):
+            return False
+
+    # use project credentials
+    return _check_credentials(enforcer_scope, action, target, credentials)
+
+
+def _get_rule_name(enforcer_scope, action):
+    """Returns the name of the rule deciding ``action``.
+
+    To match service implementations, if a rule is not found, the default
+    rule for that service policy is used. If there is no default rule
+    either, ``None`` is returned and the action is allowed. The name is
+    remembered for the rules the enforcer has loaded, which saves a second
+    evaluation of the rules for actions which are not defined, and is
+    resolved again once the enforcer reloads changed policy files.
+    """
+    rules = enforcer_scope.rules
+    cached = _RULE_NAMES.get((enforcer_scope, action))
+    # The rules are kept with the name, so they cannot be garbage collected
+    # and the identity check cannot match new rules reusing their address.
+    if cached is not None and cached[0] is rules:
+        return cached[1]
+    if action in rules:
+        rule = action
+    elif 'default' in rules:
+        rule = 'default'
+    else:
+        rule = None
+    _RULE_NAMES[(enforcer_scope, action)] = (rules, rule)
+    return rule
+
+
 def _check_credentials(enforcer_scope, action, target, credentials):
-    is_valid = True
-    if not enforcer_scope.enforce(action, target, credentials):
-        # to match service implementations, if a rule is not found,
-        # use the default rule for that service policy
-        #
-        # waiting to make the check because the first call to
-        # enforce loads the rules
-        if action not in enforcer_scope.rules:
-            if not enforcer_scope.enforce('default', target, credentials):
-                if 'default' in enforcer_scope.rules:
-                    is_valid = False
-        else:
-            is_valid = False
-    return is_valid
+    rules = enforcer_scope.rules
+    rule = _get_rule_name(enforcer_scope, action)
+    if rule is None:
+        return True
+    allowed = bool(enforcer_scope.enforce(rule, target, credentials))
+    if enforcer_scope.rules is not rules:
+        # The policy files changed and enforce() reloaded the rules, which
+        # may decide the action with another rule.
+        rule = _get_rule_name(enforcer_scope, action)
+        if rule is None:
+            return True
+        allowed = bool(enforcer_scope.enforce(rule, target, credentials))
+    return allowed
 
 
 def _user_to_credentials(user):
@@ -1273,11 +1273,12 @@ class OpenStackAuthTests(test.TestCase):
         mock_get_access_token.assert_called_with(IsA(session.Session))
         mock_project_list.assert_called_once_with(user=user.id)
 
+    @mock.patch.object(utils, 'clear_cached_project_list')
     @mock.patch.object(v3_auth.Token, 'get_access')
     @mock.patch.object(password.PasswordPlugin, 'list_projects')
     @mock.patch.object(v3_auth.Password, 'get_access')
     def test_switch(self, mock_get_access, mock_project_list,
-                    mock_get_access_token,
+                    mock_get_access_token, mock_clear_cached_project_list,
                     next=None):
         project = self.data.project_two
         projects = [self.data.project_one, self.data.project_two]
@@ -1322,6 +1323,9 @@ class OpenStackAuthTests(test.TestCase):
             IsA(session.Session),
             IsA(v3_auth.Password),
             self.data.unscoped_access_info)
+        # The endpoint of the user is the identity endpoint of the catalog.
+        mock_clear_cached_project_list.assert_called_once_with(
+            user.id, mock.ANY, self.data.unscoped_access_info.auth_token)
 
     def test_switch_with_next(self):
         self.test_switch(next='/next_url')
@@ -15,6 +15,7 @@ from unittest import mock
 
 from django import http
 from django import test
+from oslo_policy import policy as oslo_policy
 
 from openstack_auth import policy
 from openstack_auth import user
@@ -94,6 +95,47 @@ class PolicyTestCaseNonAdmin(PolicyTestCase):
                              request=self.request)
         self.assertTrue(value)
 
+    def test_check_result_reused(self):
+        policy.reset()
+        for i in range(3):
+            value = policy.check((("identity", "admin_required"),),
+                                 request=self.request)
+            self.assertFalse(value)
+        self.assertEqual({'evaluated': 1, 'reused': 2},
+                         policy.get_check_statistics(self.request))
+        # The user and its credentials are only built once per request.
+        self.MockClass.assert_called_once_with(self.request)
+
+    def test_check_result_per_target(self):
+        policy.reset()
+        policy.check((("compute", "context_is_admin"),),
+                     request=self.request, target={'project_id': '1'})
+        policy.check((("compute", "context_is_admin"),),
+                     request=self.request, target={'project_id': '2'})
+        policy.check((("compute", "context_is_admin"),),
+                     request=self.request, target={'project_id': '1'})
+        self.assertEqual({'evaluated': 2, 'reused': 1},
+                         policy.get_check_statistics(self.request))
+
+    def test_check_result_not_reused_after_reset(self):
+        policy.reset()
+        policy.check((("identity", "admin_required"),), request=self.request)
+        policy.reset()
+        policy.check((("identity", "admin_required"),), request=self.request)
+        self.assertEqual({'evaluated': 2, 'reused': 0},
+                         policy.get_check_statistics(self.request))
+
+    @test.override_settings(POLICY_CHECK_CACHE=False)
+    def test_check_cache_disabled(self):
+        policy.reset()
+        for i in range(2):
+            value = policy.check((("identity", "admin_required"),),
+                                 request=self.request)
+            self.assertFalse(value)
+        self.assertEqual({'evaluated': 0, 'reused': 0},
+                         policy.get_check_statistics(self.request))
+        self.assertEqual(2, self.MockClass.call_count)
+
 
 @test.override_settings(
     POLICY_FILES={
@@ -151,6 +193,21 @@ class PolicyTestCheckCredentials(PolicyTestCase):
                                              credentials)
         self.assertFalse(is_valid)
 
+    def test_check_credentials_rules_reloaded(self):
+        policy.reset()
+        enforcer = policy._get_enforcer()
+        scope = enforcer['with_default']
+        user = utils.get_user()
+        credentials = policy._user_to_credentials(user)
+        target = {'project_id': user.project_id}
+        self.assertFalse(policy._check_credentials(scope, 'action', target,
+                                                   credentials))
+        # Loading changed policy files replaces the rules of the enforcer,
+        # the action is then decided by its own rule without a reset().
+        scope.set_rules(oslo_policy.Rules.load('{"action": "@"}'))
+        self.assertTrue(policy._check_credentials(scope, 'action', target,
+                                                  credentials))
+
 
 class PolicyTestCaseAdmin(PolicyTestCase):
     _roles = [{'id': '1', 'name': 'admin'}]
@@ -11,11 +11,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from unittest import mock
+
+from django.core.cache import cache
 from django import http
 from django import test
 from django.test import client
 from django.test.utils import override_settings
 
+from openstack_auth.tests import data_v3
 from openstack_auth import utils
 
 
@@ -82,6 +86,57 @@ class UtilsTestCase(test.TestCase):
         self.assertEqual("RegionOne", default_region)
 
 
+@override_settings(PROJECT_LIST_CACHE={'enabled': True,
+                                       'cache_alias': 'default',
+                                       'timeout': 60})
+class ProjectListCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        data = data_v3.generate_test_data()
+        self.projects = [data.project_one, data.project_two]
+        patcher = mock.patch.object(utils, 'get_project_list',
+                                    return_value=self.projects)
+        self.mock_get_project_list = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get_cached_project_list(self, token='token-1'):
+        return utils.get_cached_project_list(
+            user_id='user-1', auth_url='http://keystone/v3', token=token)
+
+    def test_get_cached_project_list(self):
+        self.assertEqual(self.projects, self._get_cached_project_list())
+        cached = self._get_cached_project_list()
+
+        self.assertEqual([p.to_dict() for p in self.projects],
+                         [p.to_dict() for p in cached])
+        self.assertEqual(self.projects[0].name, cached[0].name)
+        self.mock_get_project_list.assert_called_once_with(
+            user_id='user-1', auth_url='http://keystone/v3', token='token-1',
+            is_federated=False)
+
+        # Another unscoped token, e.g. after logging in again.
+        self._get_cached_project_list(token='token-2')
+        self.assertEqual(2, self.mock_get_project_list.call_count)
+
+    def test_clear_cached_project_list(self):
+        self._get_cached_project_list()
+        utils.clear_cached_project_list('user-1', 'http://keystone/v3',
+                                        'token-1')
+        self._get_cached_project_list()
+
+        self.assertEqual(2, self.mock_get_project_list.call_count)
+
+    @override_settings(PROJECT_LIST_CACHE={'enabled': False})
+    def test_get_cached_project_list_disabled(self):
+        self._get_cached_project_list()
+        self._get_cached_project_list()
+
+        self.assertEqual(2, self.mock_get_project_list.call_count)
+
+
 class BehindProxyTestCase(test.TestCase):
 
     def setUp(self):
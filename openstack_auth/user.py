@@ -297,11 +297,15 @@ class User(models.AbstractBaseUser, models.AnonymousUser):
 
     @property
     def authorized_tenants(self):
-        """Returns a memoized list of tenants this user may access."""
+        """Returns a memoized list of tenants this user may access.
+
+        The list is also kept across requests when ``PROJECT_LIST_CACHE`` is
+        enabled, see :func:`openstack_auth.utils.get_cached_project_list`.
+        """
         if self.is_authenticated and self._authorized_tenants is None:
             endpoint = self.endpoint
             try:
-                self._authorized_tenants = utils.get_project_list(
+                self._authorized_tenants = utils.get_cached_project_list(
                     user_id=self.id,
                     auth_url=endpoint,
                     token=self.unscoped_token,
@@ -12,6 +12,7 @@
 # limitations under the License.
 
 import datetime
+import hashlib
 import logging
 import re
 from urllib import parse
@@ -19,12 +20,14 @@ from urllib import parse
 from django.conf import settings
 from django.contrib import auth
 from django.contrib.auth import models
+from django.core.cache import caches
 from django.utils import timezone
 from keystoneauth1 import exceptions as keystone_exceptions
 from keystoneauth1.identity import v3 as v3_auth
 from keystoneauth1 import session
 from keystoneauth1 import token_endpoint
 from keystoneclient.v3 import client as client_v3
+from keystoneclient.v3 import projects as projects_v3
 
 from openstack_auth import defaults
 
@@ -329,6 +332,63 @@ def get_project_list(*args, **kwargs):
     return projects
 
 
+def _get_project_list_cache():
+    return caches[_get_dict_config('PROJECT_LIST_CACHE', 'cache_alias')]
+
+
+def _get_project_list_cache_key(user_id, auth_url, token):
+    raw_key = '%s|%s|%s' % (user_id, auth_url, token)
+    digest = hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+    return 'openstack_auth:projects:%s' % digest
+
+
+def get_cached_project_list(user_id, auth_url, token, is_federated=False):
+    """Returns the projects of a user, cached per unscoped token.
+
+    The projects listed with an unscoped token are stored in the Django
+    cache configured by ``PROJECT_LIST_CACHE``, so that the requests of a
+    session do not list them again. The projects are rebuilt from their
+    attributes when read from the cache. Without the cache, this is
+    :func:`get_project_list`.
+    """
+    if not _get_dict_config('PROJECT_LIST_CACHE', 'enabled'):
+        return get_project_list(user_id=user_id, auth_url=auth_url,
+                                token=token, is_federated=is_federated)
+    key = _get_project_list_cache_key(user_id, auth_url, token)
+    try:
+        project_infos = _get_project_list_cache().get(key)
+    except Exception:
+        LOG.warning("Unable to read the project list from the cache.",
+                    exc_info=True)
+        project_infos = None
+    if project_infos is not None:
+        return [projects_v3.Project(None, info, loaded=True)
+                for info in project_infos]
+
+    projects = get_project_list(user_id=user_id, auth_url=auth_url,
+                                token=token, is_federated=is_federated)
+    timeout = _get_dict_config('PROJECT_LIST_CACHE', 'timeout')
+    try:
+        _get_project_list_cache().set(
+            key, [project.to_dict() for project in projects], timeout)
+    except Exception:
+        LOG.warning("Unable to store the project list in the cache.",
+                    exc_info=True)
+    return projects
+
+
+def clear_cached_project_list(user_id, auth_url, token):
+    """Drops the projects of a user cached by get_cached_project_list."""
+    if not _get_dict_config('PROJECT_LIST_CACHE', 'enabled'):
+        return
+    key = _get_project_list_cache_key(user_id, auth_url, token)
+    try:
+        _get_project_list_cache().delete(key)
+    except Exception:
+        LOG.warning("Unable to remove the project list from the cache.",
+                    exc_info=True)
+
+
 def get_system_access(user_id, auth_url, token, is_federated):
     session = get_session()
     auth_url, _ = fix_auth_url_version_prefix(auth_url)
@@ -285,6 +285,10 @@ def switch(request, tenant_id, redirect_field_name=auth.REDIRECT_FIELD_NAME):
     auth = utils.get_token_auth_plugin(auth_url=endpoint,
                                        token=unscoped_token,
                                        project_id=tenant_id)
+    # Refresh the project list on the next page, the user may have been
+    # added to or removed from projects since it was cached.
+    utils.clear_cached_project_list(request.user.id, request.user.endpoint,
+                                    unscoped_token)
 
     try:
         auth_ref = auth.get_access(session)
@@ -28,6 +28,7 @@ from openstack_dashboard.api import base
 from openstack_dashboard.api import glance
 from openstack_dashboard.api import microversions
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import http_session_pool
 
 
 # Supported compute versions
@@ -168,6 +169,13 @@ def cached_novaclient(request, version=None):
     ) = get_auth_params_from_request(request)
     if version is None:
         version = VERSIONS.get_active_version()['version']
+    nova_session = http_session_pool.get_token_session(request, nova_url,
+                                                       token_id)
+    if nova_session is not None:
+        return nova_client.Client(version,
+                                  session=nova_session,
+                                  http_log_debug=settings.DEBUG,
+                                  endpoint_override=nova_url)
     c = nova_client.Client(version,
                            username,
                            token_id,
@@ -194,6 +202,7 @@ def get_novaclient_with_instance_desc(request):
 
 
 @profiler.trace
+@memoized.coalesced
 def server_get(request, instance_id):
     return Server(get_novaclient_with_instance_desc(request).servers.get(
         instance_id), request)
@@ -122,26 +122,58 @@ class APIVersionManager(object):
         self._active = None
 
 
+class _ResourceAttribute(object):
+    """Descriptor proxying an attribute to the wrapped api object."""
+
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance._apiresource, self.name)
+
+
 class APIResourceWrapper(object):
     """Simple wrapper for api objects.
 
     Define _attrs on the child class and pass in the
     api object as the only argument to the constructor
+
+    A descriptor is added to the child class for each of the ``_attrs``
+    which is not already defined by the class, so that the proxied
+    attributes are looked up like regular ones.
     """
     _attrs = []
+    _attrs_set = frozenset()
     _apiresource = None  # Make sure _apiresource is there even in __init__.
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._attrs_set = frozenset(cls._attrs)
+        for attr in cls._attrs_set:
+            if not hasattr(cls, attr):
+                setattr(cls, attr, _ResourceAttribute(attr))
+
     def __init__(self, apiresource):
         self._apiresource = apiresource
 
-    def __getattribute__(self, attr):
-        try:
-            return object.__getattribute__(self, attr)
-        except AttributeError:
-            if attr not in self._attrs:
-                raise
-            # __getattr__ won't find properties
-            return getattr(self._apiresource, attr)
+    def __getattr__(self, attr):
+        # Only called when the regular lookup fails, for instance when a
+        # property raises AttributeError.
+        if attr not in self._attrs_set:
+            raise AttributeError("'%s' object has no attribute '%s'"
+                                 % (self.__class__.__name__, attr))
+        return getattr(self._apiresource, attr)
+
+    def __dir__(self):
+        # Django templates re-raise the AttributeError of an attribute
+        # listed by dir(), so proxied attributes missing from the api
+        # object are not listed, as before they had descriptors.
+        return [attr for attr in super().__dir__()
+                if attr not in self._attrs_set or hasattr(self, attr)]
 
     def __repr__(self):
         return "<%s: %s>" % (self.__class__.__name__,
@@ -176,13 +208,12 @@ class APIDictWrapper(object):
     def __init__(self, apidict):
         self._apidict = apidict
 
-    def __getattribute__(self, attr):
-        try:
-            return object.__getattribute__(self, attr)
-        except AttributeError:
-            if attr not in self._apidict:
-                raise
-            return self._apidict[attr]
+    def __getattr__(self, attr):
+        # Only called when the regular lookup fails.
+        if attr not in self._apidict:
+            raise AttributeError("'%s' object has no attribute '%s'"
+                                 % (self.__class__.__name__, attr))
+        return self._apidict[attr]
 
     def __getitem__(self, item):
         try:
@@ -31,12 +31,14 @@ from cinderclient import exceptions as cinder_exception
 from cinderclient.v3.contrib import list_extensions as cinder_list_extensions
 
 from horizon import exceptions
+from horizon.utils.memoized import coalesced
 from horizon.utils.memoized import memoized
 
 from openstack_dashboard.api import _nova
 from openstack_dashboard.api import base
 from openstack_dashboard.api import microversions
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import http_session_pool
 from openstack_dashboard.utils import settings as utils
 
 
@@ -232,6 +234,14 @@ def _find_cinder_url(request, version=None):
 def cinderclient(request, version=None):
     version, cinder_url = _find_cinder_url(request, version)
 
+    cinder_session = http_session_pool.get_token_session(
+        request, cinder_url, request.user.token.id)
+    if cinder_session is not None:
+        return cinder_client.Client(version,
+                                    session=cinder_session,
+                                    os_endpoint=cinder_url,
+                                    http_log_debug=settings.DEBUG)
+
     insecure = settings.OPENSTACK_SSL_NO_VERIFY
     cacert = settings.OPENSTACK_SSL_CACERT
 
@@ -293,6 +303,7 @@ def version_get():
     return api_version['version']
 
 
+@coalesced
 def volume_list(request, search_opts=None, marker=None, sort_dir="desc"):
     volumes, _, __ = volume_list_paged(
         request, search_opts=search_opts, marker=marker, paginate=False,
@@ -364,6 +375,7 @@ def volume_list_paged(request, search_opts=None, marker=None, paginate=False,
 
 
 @profiler.trace
+@coalesced
 def volume_get(request, volume_id):
     client = _cinderclient_with_generic_groups(request)
     volume_data = client.volumes.get(volume_id)
@@ -16,24 +16,30 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import _thread as thread
 import collections
 from collections import abc
+import io
 import itertools
 import json
 import logging
 import os
+import threading
+import time
 
 from django.conf import settings
+from django.core.cache import caches
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.utils.translation import gettext_lazy as _
+import futurist
+from futurist import rejection
 
 from glanceclient.v2 import client
 
 
+from horizon import exceptions
 from horizon import messages
+from horizon.utils.memoized import coalesced
 from horizon.utils.memoized import memoized
 from openstack_dashboard.api import base
 from openstack_dashboard.contrib.developer.profiler import api as profiler
@@ -46,6 +52,12 @@ VERSIONS = base.APIVersionManager("image", preferred_version=2)
 VERSIONS.load_supported_version(2, {"client": client,
                                     "version": 2})
 
+# Minimum number of seconds between two records of the progress of an upload.
+UPLOAD_STATUS_INTERVAL = 1
+
+_upload_pool = None
+_upload_pool_lock = threading.Lock()
+
 
 class Image(base.APIResourceWrapper):
     _attrs = {"architecture", "container_format", "disk_format", "created_at",
@@ -55,17 +67,16 @@ class Image(base.APIResourceWrapper):
     _ext_attrs = {"file", "locations", "schema", "tags", "virtual_size",
                   "kernel_id", "ramdisk_id", "image_url"}
 
-    def __getattribute__(self, attr):
+    def __getattr__(self, attr):
         # Because Glance v2 treats custom properties as normal
         # attributes, we need to be more flexible than the resource
         # wrappers usually allow.
-        if attr == "properties":
-            return {k: v for (k, v) in self._apiresource.items()
-                    if self.property_visible(k)}
-        try:
-            return object.__getattribute__(self, attr)
-        except AttributeError:
-            return getattr(self._apiresource, attr)
+        return getattr(self._apiresource, attr)
+
+    @property
+    def properties(self):
+        return {k: v for (k, v) in self._apiresource.items()
+                if self.property_visible(k)}
 
     @property
     def name(self):
@@ -197,6 +208,7 @@ def image_reactivate(request, image_id):
 
 
 @profiler.trace
+@coalesced
 def image_list_detailed(request, marker=None, sort_dir='desc',
                         sort_key='created_at', filters=None, paginate=False,
                         reversed_order=False, **kwargs):
@@ -451,6 +463,104 @@ def _handle_unknown_properties(data, properties):
     properties.update(other_props)
 
 
+def _get_upload_pool():
+    """Return the thread pool uploading image data to Glance."""
+    global _upload_pool
+    with _upload_pool_lock:
+        if _upload_pool is None:
+            max_backlog = utils.get_dict_config('HORIZON_IMAGES_UPLOAD_POOL',
+                                                'max_backlog')
+            check_and_reject = None
+            if max_backlog is not None:
+                check_and_reject = rejection.reject_when_reached(max_backlog)
+            _upload_pool = futurist.ThreadPoolExecutor(
+                max_workers=utils.get_dict_config(
+                    'HORIZON_IMAGES_UPLOAD_POOL', 'max_workers'),
+                check_and_reject=check_and_reject)
+        return _upload_pool
+
+
+def _get_upload_status_cache():
+    return caches[utils.get_dict_config('HORIZON_IMAGES_UPLOAD_POOL',
+                                        'cache_alias')]
+
+
+def _remove_image_file(data):
+    try:
+        filename = str(data.file.name)
+    except AttributeError:
+        return
+    try:
+        os.remove(filename)
+    except OSError as e:
+        LOG.warning('Failed to remove temporary image file '
+                    '%(file)s (%(e)s)',
+                    {'file': filename, 'e': e})
+
+
+class _ImageUploadReader(object):
+    """Streams the data of an image to Glance and records its progress.
+
+    Glance client reads the data in chunks, so the whole image is never
+    held in memory. The progress is recorded in the cache configured by
+    ``HORIZON_IMAGES_UPLOAD_POOL`` at most every
+    ``UPLOAD_STATUS_INTERVAL`` seconds.
+    """
+
+    def __init__(self, request, image_id, data, size):
+        self.image_id = image_id
+        self.project_id = request.user.project_id
+        self.data = data
+        self.size = size
+        self.bytes_sent = 0
+        self._recorded = 0
+
+    def read(self, size=-1):
+        chunk = self.data.read(size)
+        self.bytes_sent += len(chunk)
+        if time.monotonic() - self._recorded >= UPLOAD_STATUS_INTERVAL:
+            self.record('uploading')
+        return chunk
+
+    def record(self, status):
+        # The progress is only informative, a cache failure must neither
+        # abort the upload nor leave the image behind.
+        self._recorded = time.monotonic()
+        try:
+            _get_upload_status_cache().set(
+                'glance_upload:%s' % self.image_id,
+                {'status': status,
+                 'bytes_sent': self.bytes_sent,
+                 'size': self.size,
+                 'project_id': self.project_id},
+                utils.get_dict_config('HORIZON_IMAGES_UPLOAD_POOL',
+                                      'timeout'))
+        except Exception:
+            LOG.warning("Unable to record the upload status of image %s "
+                        "in the cache.", self.image_id, exc_info=True)
+
+
+def image_upload_status(request, image_id):
+    """Returns the progress of an upload of image data by image_create.
+
+    :returns: a dict with the ``status`` of the upload (``queued``,
+        ``uploading``, ``completed`` or ``failed``), the number of bytes
+        sent to Glance (``bytes_sent``) and the ``size`` of the image data,
+        or None if no upload of the image by the project is known.
+    """
+    try:
+        upload = _get_upload_status_cache().get('glance_upload:%s' % image_id)
+    except Exception:
+        LOG.warning("Unable to read the upload status of image %s from the "
+                    "cache.", image_id, exc_info=True)
+        return None
+    if not upload or upload['project_id'] != request.user.project_id:
+        return None
+    return {'status': upload['status'],
+            'bytes_sent': upload['bytes_sent'],
+            'size': upload['size']}
+
+
 @profiler.trace
 def image_create(request, **kwargs):
     """Create image.
@@ -466,7 +576,10 @@ def image_create(request, **kwargs):
     asynchronously.
 
     In the case of 'data' the process of uploading the data may take
-    some time and is handed off to a separate thread.
+    some time and is handed off to a pool of threads configured by
+    ``HORIZON_IMAGES_UPLOAD_POOL``. Its progress is returned by
+    image_upload_status. When too many uploads are waiting for a thread,
+    the image is deleted and NotAvailable is raised.
     """
     data = kwargs.pop('data', None)
     location = kwargs.pop('location', None)
@@ -485,28 +598,41 @@ def image_create(request, **kwargs):
             # Hack to fool Django, so we can keep file open in the new thread.
             data.file._closer.close_called = True
         elif isinstance(data, InMemoryUploadedFile):
-            # Clone a new file for InMemeoryUploadedFile.
-            # Because the old one will be closed by Django.
-            data = SimpleUploadedFile(data.name,
-                                      data.read(),
-                                      data.content_type)
+            # Take the buffer of InMemoryUploadedFile rather than copying it,
+            # because the old one will be closed by Django.
+            buf, data.file = data.file, io.BytesIO()
+            data = InMemoryUploadedFile(buf, data.field_name, data.name,
+                                        data.content_type, data.size,
+                                        data.charset)
+        reader = _ImageUploadReader(request, image.id, data,
+                                    getattr(data, 'size', None))
 
         def upload():
             try:
-                return glanceclient(request).images.upload(image.id, data)
+                glanceclient(request).images.upload(image.id, reader)
+            except Exception:
+                LOG.exception('Failed to upload the data of image %s.',
+                              image.id)
+                reader.record('failed')
+            else:
+                reader.record('completed')
+            finally:
+                _remove_image_file(data)
+
+        reader.record('queued')
+        try:
+            _get_upload_pool().submit(upload)
+        except futurist.RejectedSubmission:
+            LOG.warning('Too many images are being uploaded, deleting image '
+                        '%s.', image.id)
+            try:
+                glanceclient(request).images.delete(image.id)
             finally:
-                try:
-                    filename = str(data.file.name)
-                except AttributeError:
-                    pass
-                else:
-                    try:
-                        os.remove(filename)
-                    except OSError as e:
-                        LOG.warning('Failed to remove temporary image file '
-                                    '%(file)s (%(e)s)',
-                                    {'file': filename, 'e': e})
-        thread.start_new_thread(upload, ())
+                _remove_image_file(data)
+            reader.record('failed')
+            raise exceptions.NotAvailable(
+                _('Too many images are being uploaded, please try again '
+                  'later.'))
 
     return Image(image)
 
@@ -36,6 +36,8 @@ from horizon import exceptions
 from openstack_dashboard.api import base
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 from openstack_dashboard import policy
+from openstack_dashboard.utils import futurist_utils
+from openstack_dashboard.utils import http_session_pool
 from openstack_dashboard.utils import settings as setting_utils
 
 
@@ -183,9 +185,11 @@ def keystoneclient(request, admin=False, force_scoped=False):
         remote_addr = auth_utils.get_client_ip(request)
         token_auth = token_endpoint.Token(endpoint=endpoint,
                                           token=token_id)
-        keystone_session = session.Session(auth=token_auth,
-                                           original_ip=remote_addr,
-                                           verify=verify)
+        keystone_session = session.Session(
+            auth=token_auth,
+            session=http_session_pool.get_http_session(endpoint),
+            original_ip=remote_addr,
+            verify=verify)
         conn = client_version['client'].Client(session=keystone_session,
                                                debug=settings.DEBUG)
         setattr(request, cache_attr, conn)
@@ -778,6 +782,65 @@ def remove_group_roles(request, group, domain=None, project=None):
                           domain=domain, project=project)
 
 
+def update_project_roles(request, project, grants=(), revokes=(),
+                         group=False):
+    """Grants and revokes roles of users or groups on a project.
+
+    The assignments are granted and revoked in parallel, by at most half of
+    the threads of ``PARALLEL_CALLS_POOL``, or by the calling thread when
+    the pool is saturated. A failure to grant or revoke one of them does
+    not prevent the others from being processed.
+
+    :param request: the request entity containing the login user information
+    :param project: the project ID
+    :param grants: the ``(actor_id, role_id)`` pairs to grant, where the
+                   actors are users, or groups if ``group`` is True
+    :param revokes: the ``(actor_id, role_id)`` pairs to revoke
+    :param group: whether the actors are groups
+
+    :returns: a tuple of the lists of pairs which could not be granted and
+              of the pairs which could not be revoked
+    """
+    if group:
+        def grant(actor_id, role_id):
+            add_group_role(request, role=role_id, group=actor_id,
+                           project=project)
+
+        def revoke(actor_id, role_id):
+            remove_group_role(request, role=role_id, group=actor_id,
+                              project=project)
+    else:
+        def grant(actor_id, role_id):
+            add_tenant_user_role(request, project=project, user=actor_id,
+                                 role=role_id)
+
+        def revoke(actor_id, role_id):
+            remove_tenant_user_role(request, project=project, user=actor_id,
+                                    role=role_id)
+
+    changes = ([(grant, pair) for pair in sorted(grants)] +
+               [(revoke, pair) for pair in sorted(revokes)])
+
+    def apply_change(change):
+        func, pair = change
+        try:
+            func(*pair)
+        except Exception:
+            LOG.exception('Unable to update role %(role)s of %(actor)s '
+                          'on project %(project)s.',
+                          {'role': pair[1], 'actor': pair[0],
+                           'project': project})
+            return False
+        return True
+
+    applied = futurist_utils.call_for_each_parallel(apply_change, changes)
+    failures = {grant: [], revoke: []}
+    for (func, pair), done in zip(changes, applied):
+        if not done:
+            failures[func].append(pair)
+    return failures[grant], failures[revoke]
+
+
 def get_default_role(request):
     """Gets the default role object from Keystone and saves it as a global.
 
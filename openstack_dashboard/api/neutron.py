@@ -42,11 +42,17 @@ from openstack_auth import utils as auth_utils
 
 from horizon import exceptions
 from horizon import messages
+from horizon.utils.memoized import coalesced
+from horizon.utils.memoized import invalidates_shared_memoized
 from horizon.utils.memoized import memoized
+from horizon.utils.memoized import shared_memoized
+from horizon.utils import settings as horizon_settings
 from openstack_dashboard.api import base
 from openstack_dashboard.api import nova
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 from openstack_dashboard import policy
+from openstack_dashboard.utils import futurist_utils
+from openstack_dashboard.utils import http_session_pool
 from openstack_dashboard.utils import settings as setting_utils
 
 
@@ -787,6 +793,7 @@ class FloatingIpManager(object):
         self.client.delete_floatingip(floating_ip_id)
 
     @profiler.trace
+    @invalidates_shared_memoized('floating_ip_target')
     def associate(self, floating_ip_id, port_id):
         """Associates the floating IP to the port.
 
@@ -804,6 +811,7 @@ class FloatingIpManager(object):
                                       {'floatingip': update_dict})
 
     @profiler.trace
+    @invalidates_shared_memoized('floating_ip_target')
     def disassociate(self, floating_ip_id):
         """Disassociates the floating IP specified."""
         update_dict = {'port_id': None}
@@ -846,12 +854,18 @@ class FloatingIpManager(object):
         'id' and 'name' attributes must be defined in each object.
         FloatingIpTarget.id can be passed as port_id in associate().
         FloatingIpTarget.name is displayed in Floating Ip Association Form.
+
+        The targets of the project are computed once per request, and shared
+        between requests for a few seconds when ``MEMOIZED_SHARED_CACHE`` is
+        enabled.
         """
+        return list(_floating_ip_targets(self.request))
+
+    def _list_targets(self):
         tenant_id = self.request.user.tenant_id
         ports = port_list(self.request, tenant_id=tenant_id)
         servers, has_more = nova.server_list(self.request, detailed=False)
-        server_dict = collections.OrderedDict(
-            [(s.id, s.name) for s in servers])
+        server_dict = dict((s.id, s.name) for s in servers)
         reachable_subnets = self._get_reachable_subnets(ports)
 
         targets = []
@@ -860,17 +874,19 @@ class FloatingIpManager(object):
             if p.device_owner.startswith('network:'):
                 continue
             server_name = server_dict.get(p.device_id)
-
-            for ip in p.fixed_ips:
-                if ip['subnet_id'] not in reachable_subnets:
-                    continue
-                # Floating IPs can only target IPv4 addresses.
-                if netaddr.IPAddress(ip['ip_address']).version != 4:
-                    continue
-                targets.append(FloatingIpTarget(p, ip['ip_address'],
-                                                server_name))
+            targets.extend(FloatingIpTarget(p, ip_address, server_name)
+                           for ip_address in self._get_target_ips(
+                               p, reachable_subnets))
         return targets
 
+    def _get_target_ips(self, port, reachable_subnets):
+        # Floating IPs can only target IPv4 addresses. Neutron returns
+        # addresses in their canonical form, in which only IPv6 ones
+        # contain a colon.
+        return [ip['ip_address'] for ip in port.fixed_ips
+                if (ip['subnet_id'] in reachable_subnets and
+                    ':' not in ip['ip_address'])]
+
     def _target_ports_by_instance(self, instance_id):
         if not instance_id:
             return None
@@ -885,9 +901,20 @@ class FloatingIpManager(object):
         :param target_list: (optional) a list returned by list_targets().
             If specified, looking up is done against the specified list
             to save extra API calls to a back-end. Otherwise target list
-            is retrieved from a back-end inside the method.
+            is retrieved from a back-end inside the method, or looked up
+            in the targets of the project shared between requests when
+            ``MEMOIZED_SHARED_CACHE`` is enabled.
         """
-        if target_list is not None:
+        if target_list is None and horizon_settings.get_dict_config(
+                'MEMOIZED_SHARED_CACHE', 'enabled'):
+            targets = [target for target
+                       in _floating_ip_targets(self.request)
+                       if target['instance_id'] == instance_id]
+            # The instance may belong to another project, or be a new
+            # one the shared targets do not know yet.
+            if targets:
+                return targets
+        elif target_list is not None:
             # We assume that target_list was returned by list_targets()
             # so we can assume checks for subnet reachability and IP version
             # have been done already. We skip all checks here.
@@ -900,13 +927,9 @@ class FloatingIpManager(object):
         name = self._get_server_name(instance_id)
         targets = []
         for p in ports:
-            for ip in p.fixed_ips:
-                if ip['subnet_id'] not in reachable_subnets:
-                    continue
-                # Floating IPs can only target IPv4 addresses.
-                if netaddr.IPAddress(ip['ip_address']).version != 4:
-                    continue
-                targets.append(FloatingIpTarget(p, ip['ip_address'], name))
+            targets.extend(FloatingIpTarget(p, ip_address, name)
+                           for ip_address in self._get_target_ips(
+                               p, reachable_subnets))
         return targets
 
     def _get_server_name(self, server_id):
@@ -933,6 +956,13 @@ class FloatingIpManager(object):
             'OPENSTACK_NEUTRON_NETWORK', 'enable_router')
 
 
+@memoized
+@shared_memoized('floating_ip_target', timeout=10)
+def _floating_ip_targets(request):
+    """Returns the floating IP association targets of the project."""
+    return tuple(FloatingIpManager(request)._list_targets())
+
+
 def get_ipver_str(ip_version):
     """Convert an ip version number to a human-friendly string."""
     return IP_VERSION_DICT.get(ip_version, '')
@@ -949,6 +979,11 @@ def get_auth_params_from_request(request):
 @memoized
 def neutronclient(request):
     token_id, neutron_url, auth_url = get_auth_params_from_request(request)
+    neutron_session = http_session_pool.get_token_session(
+        request, neutron_url, token_id)
+    if neutron_session is not None:
+        return neutron_client.Client(session=neutron_session,
+                                     endpoint_override=neutron_url)
     insecure = settings.OPENSTACK_SSL_NO_VERIFY
     cacert = settings.OPENSTACK_SSL_CACERT
     c = neutron_client.Client(token=token_id,
@@ -971,6 +1006,7 @@ def networkclient(request):
         token=token_id)
     k_session = session.Session(
         auth=token_auth,
+        session=http_session_pool.get_http_session(neutron_url),
         original_ip=auth_utils.get_client_ip(request),
         verify=verify,
         # TODO(lajoskatona): cert should be None of a tuple in the form of
@@ -987,6 +1023,28 @@ def networkclient(request):
     return c.network
 
 
+# Part of the URI taken by the endpoint, the resource path and other query
+# parameters than the filter split into chunks.
+_URI_RESERVED_LENGTH = 512
+
+
+def _filter_length(filter_attr, filter_values):
+    # Length of each query filter is:
+    # <key>=<value>& (e.g., id=<uuid>)
+    # The length will be key_len + value_maxlen + 2
+    return sum(len(filter_attr) + len(val) + 2 for val in filter_values)
+
+
+def _list_chunks_parallel(list_method, filter_attr, filter_values,
+                          chunk_size, params):
+    chunks = [filter_values[i:i + chunk_size]
+              for i in range(0, len(filter_values), chunk_size)]
+    results = futurist_utils.call_functions_parallel(
+        *[(list_method, [], dict(params, **{filter_attr: chunk}))
+          for chunk in chunks])
+    return list(itertools.chain.from_iterable(results))
+
+
 @profiler.trace
 def list_resources_with_long_filters(list_method,
                                      filter_attr, filter_values, **params):
@@ -995,7 +1053,11 @@ def list_resources_with_long_filters(list_method,
     If filter parameters are long, list resources API request leads to
     414 error (URL is too long). For such case, this method split
     list parameters specified by a list_field argument into chunks
-    and call the specified list_method repeatedly.
+    and call the specified list_method for the chunks in parallel.
+
+    When ``OPENSTACK_NEUTRON_NETWORK['max_uri_length']`` is set, the
+    filter values are split up front when they would not fit in a URI of
+    that length, rather than after a first request failed.
 
     :param list_method: Method used to retrieve resource list.
     :param filter_attr: attribute name to be filtered. The value corresponding
@@ -1010,6 +1072,20 @@ def list_resources_with_long_filters(list_method,
         without any changes. You can specify more filter conditions
         in addition to a pair of filter_attr and filter_values.
     """
+    max_uri_length = setting_utils.get_dict_config(
+        'OPENSTACK_NEUTRON_NETWORK', 'max_uri_length')
+    if (max_uri_length and filter_values and
+            not isinstance(filter_values, str)):
+        allowed_filter_len = max_uri_length - _URI_RESERVED_LENGTH
+        if _filter_length(filter_attr, filter_values) > allowed_filter_len:
+            if not isinstance(filter_values, Sequence):
+                filter_values = list(filter_values)
+            val_maxlen = max(len(val) for val in filter_values)
+            filter_maxlen = len(filter_attr) + val_maxlen + 2
+            chunk_size = max(allowed_filter_len // filter_maxlen, 1)
+            return _list_chunks_parallel(list_method, filter_attr,
+                                         filter_values, chunk_size, params)
+
     try:
         params[filter_attr] = filter_values
         return list_method(**params)
@@ -1027,22 +1103,15 @@ def list_resources_with_long_filters(list_method,
         elif not isinstance(filter_values, Sequence):
             filter_values = list(filter_values)
 
-        # Length of each query filter is:
-        # <key>=<value>& (e.g., id=<uuid>)
-        # The length will be key_len + value_maxlen + 2
-        all_filter_len = sum(len(filter_attr) + len(val) + 2
-                             for val in filter_values)
+        all_filter_len = _filter_length(filter_attr, filter_values)
         allowed_filter_len = all_filter_len - uri_len_exc.excess
 
         val_maxlen = max(len(val) for val in filter_values)
         filter_maxlen = len(filter_attr) + val_maxlen + 2
         chunk_size = allowed_filter_len // filter_maxlen
 
-        resources = []
-        for i in range(0, len(filter_values), chunk_size):
-            params[filter_attr] = filter_values[i:i + chunk_size]
-            resources.extend(list_method(**params))
-        return resources
+        return _list_chunks_parallel(list_method, filter_attr,
+                                     filter_values, chunk_size, params)
 
 
 @profiler.trace
@@ -1186,6 +1255,7 @@ def _network_list_paged(request, page_data, params):
 
 
 @profiler.trace
+@coalesced
 def network_list(request, single_page=False, **params):
     LOG.debug("network_list(): params=%s", params)
     list_values = []
@@ -1682,6 +1752,7 @@ def network_update(request, network_id, **kwargs):
 
 
 @profiler.trace
+@invalidates_shared_memoized('subnet', 'floating_ip_target')
 def network_delete(request, network_id):
     LOG.debug("network_delete(): netid=%s", network_id)
     networkclient(request).delete_network(network_id)
@@ -1690,6 +1761,7 @@ def network_delete(request, network_id):
 
 @profiler.trace
 @memoized
+@shared_memoized('subnet')
 def subnet_list(request, **params):
     LOG.debug("subnet_list(): params=%s", params)
     subnets = networkclient(request).subnets(**params)
@@ -1707,6 +1779,7 @@ def subnet_get(request, subnet_id, **params):
 
 
 @profiler.trace
+@invalidates_shared_memoized('subnet', 'floating_ip_target')
 def subnet_create(request, network_id, **kwargs):
     """Create a subnet on a specified network.
 
@@ -1736,6 +1809,7 @@ def subnet_create(request, network_id, **kwargs):
 
 
 @profiler.trace
+@invalidates_shared_memoized('subnet')
 def subnet_update(request, subnet_id, **kwargs):
     LOG.debug("subnet_update(): subnetid=%(subnet_id)s, kwargs=%(kwargs)s",
               {'subnet_id': subnet_id, 'kwargs': kwargs})
@@ -1745,6 +1819,7 @@ def subnet_update(request, subnet_id, **kwargs):
 
 
 @profiler.trace
+@invalidates_shared_memoized('subnet', 'floating_ip_target')
 def subnet_delete(request, subnet_id):
     LOG.debug("subnet_delete(): subnetid=%s", subnet_id)
     networkclient(request).delete_subnet(subnet_id)
@@ -1889,6 +1964,7 @@ def unescape_port_kwargs(**kwargs):
 
 
 @profiler.trace
+@invalidates_shared_memoized('floating_ip_target')
 def port_create(request, network_id, **kwargs):
     """Create a port on a specified network.
 
@@ -1910,12 +1986,14 @@ def port_create(request, network_id, **kwargs):
 
 
 @profiler.trace
+@invalidates_shared_memoized('floating_ip_target')
 def port_delete(request, port_id):
     LOG.debug("port_delete(): portid=%s", port_id)
     networkclient(request).delete_port(port_id)
 
 
 @profiler.trace
+@invalidates_shared_memoized('floating_ip_target')
 def port_update(request, port_id, **kwargs):
     LOG.debug("port_update(): portid=%(port_id)s, kwargs=%(kwargs)s",
               {'port_id': port_id, 'kwargs': kwargs})
@@ -1967,11 +2045,13 @@ def router_list_on_l3_agent(request, l3_agent_id, **params):
 
 
 @profiler.trace
+@invalidates_shared_memoized('floating_ip_target')
 def router_delete(request, router_id):
     neutronclient(request).delete_router(router_id)
 
 
 @profiler.trace
+@invalidates_shared_memoized('floating_ip_target')
 def router_add_interface(request, router_id, subnet_id=None, port_id=None):
     body = {}
     if subnet_id:
@@ -1983,6 +2063,7 @@ def router_add_interface(request, router_id, subnet_id=None, port_id=None):
 
 
 @profiler.trace
+@invalidates_shared_memoized('floating_ip_target')
 def router_remove_interface(request, router_id, subnet_id=None, port_id=None):
     body = {}
     if subnet_id:
@@ -1993,6 +2074,7 @@ def router_remove_interface(request, router_id, subnet_id=None, port_id=None):
 
 
 @profiler.trace
+@invalidates_shared_memoized('floating_ip_target')
 def router_add_gateway(request, router_id, network_id, enable_snat=None):
     body = {'network_id': network_id}
     if enable_snat is not None:
@@ -2001,6 +2083,7 @@ def router_add_gateway(request, router_id, network_id, enable_snat=None):
 
 
 @profiler.trace
+@invalidates_shared_memoized('floating_ip_target')
 def router_remove_gateway(request, router_id):
     neutronclient(request).remove_gateway_router(router_id)
 
@@ -2043,6 +2126,7 @@ def router_static_route_add(request, router_id, newroute):
 
 
 @profiler.trace
+@coalesced
 def tenant_quota_get(request, tenant_id):
     return base.QuotaSet(neutronclient(request).show_quota(tenant_id)['quota'])
 
@@ -2180,6 +2264,7 @@ def floating_ip_supported(request):
 
 
 @memoized
+@shared_memoized('security_group')
 def security_group_list(request, **params):
     return SecurityGroupManager(request).list(**params)
 
@@ -2188,18 +2273,22 @@ def security_group_get(request, sg_id):
     return SecurityGroupManager(request).get(sg_id)
 
 
+@invalidates_shared_memoized('security_group')
 def security_group_create(request, name, desc):
     return SecurityGroupManager(request).create(name, desc)
 
 
+@invalidates_shared_memoized('security_group')
 def security_group_delete(request, sg_id):
     return SecurityGroupManager(request).delete(sg_id)
 
 
+@invalidates_shared_memoized('security_group')
 def security_group_update(request, sg_id, name, desc):
     return SecurityGroupManager(request).update(sg_id, name, desc)
 
 
+@invalidates_shared_memoized('security_group')
 def security_group_rule_create(request, parent_group_id,
                                direction, ethertype,
                                ip_protocol, from_port, to_port,
@@ -2209,6 +2298,7 @@ def security_group_rule_create(request, parent_group_id,
         from_port, to_port, cidr, group_id, description)
 
 
+@invalidates_shared_memoized('security_group')
 def security_group_rule_delete(request, sgr_id):
     return SecurityGroupManager(request).rule_delete(sgr_id)
 
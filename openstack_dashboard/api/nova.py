@@ -19,6 +19,7 @@
 #    under the License.
 
 import collections
+import functools
 import logging
 from operator import attrgetter
 
@@ -26,6 +27,7 @@ from django.utils.translation import gettext_lazy as _
 
 from novaclient import api_versions
 from novaclient import exceptions as nova_exceptions
+from novaclient.v2 import flavors as nova_flavors
 from novaclient.v2 import instance_action as nova_instance_action
 from novaclient.v2 import servers as nova_servers
 
@@ -230,6 +232,7 @@ def server_mks_console(request, instance_id):
 
 
 @profiler.trace
+@memoized.invalidates_shared_memoized('flavor')
 def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
                   ephemeral=0, swap=0, metadata=None, is_public=True,
                   rxtx_factor=1):
@@ -245,6 +248,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
 
 
 @profiler.trace
+@memoized.invalidates_shared_memoized('flavor')
 def flavor_delete(request, flavor_id):
     _nova.novaclient(request).flavors.delete(flavor_id)
 
@@ -257,8 +261,27 @@ def flavor_get(request, flavor_id, get_extras=False):
     return flavor
 
 
+def _dump_flavors(flavors):
+    # Detach flavors from the novaclient manager (and so from the token
+    # of the current user) before they are stored in the shared cache.
+    return [(flavor.to_dict(), getattr(flavor, 'extras', None))
+            for flavor in flavors]
+
+
+def _load_flavors(request, flavors):
+    manager = _nova.novaclient(request).flavors
+    loaded = []
+    for info, extras in flavors:
+        flavor = nova_flavors.Flavor(manager, info, loaded=True)
+        if extras is not None:
+            flavor.extras = extras
+        loaded.append(flavor)
+    return loaded
+
+
 @profiler.trace
 @memoized.memoized
+@memoized.shared_memoized('flavor', dump=_dump_flavors, load=_load_flavors)
 def flavor_list(request, is_public=True, get_extras=False):
     """Get the list of available instance sizes (flavors)."""
     flavors = _nova.novaclient(request).flavors.list(is_public=is_public)
@@ -328,6 +351,7 @@ def flavor_access_list(request, flavor=None):
 
 
 @profiler.trace
+@memoized.invalidates_shared_memoized('flavor')
 def add_tenant_to_flavor(request, flavor, tenant):
     """Add a tenant to the given flavor access list."""
     return _nova.novaclient(request).flavor_access.add_tenant_access(
@@ -335,6 +359,7 @@ def add_tenant_to_flavor(request, flavor, tenant):
 
 
 @profiler.trace
+@memoized.invalidates_shared_memoized('flavor')
 def remove_tenant_from_flavor(request, flavor, tenant):
     """Remove a tenant from the given flavor access list."""
     return _nova.novaclient(request).flavor_access.remove_tenant_access(
@@ -354,6 +379,7 @@ def flavor_get_extras(request, flavor_id, raw=False, flavor=None):
 
 
 @profiler.trace
+@memoized.invalidates_shared_memoized('flavor')
 def flavor_extra_delete(request, flavor_id, keys):
     """Unset the flavor extra spec keys."""
     flavor = _nova.novaclient(request).flavors.get(flavor_id)
@@ -361,6 +387,7 @@ def flavor_extra_delete(request, flavor_id, keys):
 
 
 @profiler.trace
+@memoized.invalidates_shared_memoized('flavor')
 def flavor_extra_set(request, flavor_id, metadata):
     """Set the flavor extra spec keys."""
     flavor = _nova.novaclient(request).flavors.get(flavor_id)
@@ -405,6 +432,7 @@ def keypair_get(request, name):
 
 
 @profiler.trace
+@memoized.invalidates_shared_memoized('floating_ip_target')
 def server_create(request, name, image, flavor, key_name, user_data,
                   security_groups, block_device_mapping=None,
                   block_device_mapping_v2=None, nics=None,
@@ -444,6 +472,7 @@ def server_create(request, name, image, flavor, key_name, user_data,
 
 
 @profiler.trace
+@memoized.invalidates_shared_memoized('floating_ip_target')
 def server_delete(request, instance_id):
     _nova.novaclient(request).servers.delete(instance_id)
     # Session is available and consistent for the current view
@@ -461,11 +490,72 @@ def get_novaclient_with_locked_status(request):
     return _nova.novaclient(request, version=microversion)
 
 
+def _remember_page_cursors(request, servers):
+    """Remembers the neighbours of the markers of the displayed page.
+
+    The links to the next and previous pages use the last and first servers
+    of the page as markers. When one of them is deleted, the server next to
+    it on the page is an equivalent marker which still exists, so the
+    neighbouring page can be listed without probing for a deleted marker.
+    Only the current page is remembered to keep the session small.
+    """
+    cursors = {}
+    if len(servers) > 1:
+        cursors['desc:%s' % servers[-1].id] = servers[-2].id
+        cursors['asc:%s' % servers[0].id] = servers[1].id
+    if request.session.get('server_page_cursors') != cursors:
+        request.session['server_page_cursors'] = cursors
+
+
+def _get_page_cursor(request, marker, sort_dir):
+    cursors = request.session.get('server_page_cursors') or {}
+    return cursors.get('%s:%s' % (sort_dir, marker))
+
+
+# NOTE(amotoki): It looks like the 'sort_keys' must be unique to make
+# the pagination in the nova API works as expected. Multiple servers
+# can have a same 'created_at' as its resolution is a second.
+# To ensure the uniqueness we add 'uuid' to the sort keys.
+# 'display_name' is added before 'uuid' to list servers in the
+# alphabetical order.
+_SERVER_SORT_KEYS = ['created_at', 'display_name', 'uuid']
+
+
+def server_list_page_loader(request, search_opts=None, detailed=True):
+    """Returns a function listing a page of servers without the request.
+
+    The function lists the raw servers of the page following
+    ``search_opts['marker']`` in the descending order, as
+    :func:`server_list_paged` does when paginating. It only uses a client
+    created here, so it can be called in another thread once the request is
+    finished. Its results are passed as ``prefetched`` to
+    :func:`server_list_paged`, which updates the session of the request
+    showing the page.
+    """
+    nova_client = get_novaclient_with_locked_status(request)
+    search_opts = dict(search_opts or {},
+                       limit=utils.get_page_size(request) + 1)
+    search_opts.pop('paginate', None)
+    if not search_opts.get('all_tenants', False):
+        search_opts['project_id'] = request.user.tenant_id
+    return functools.partial(nova_client.servers.list, detailed, search_opts,
+                             sort_keys=_SERVER_SORT_KEYS,
+                             sort_dirs=['desc'] * 3)
+
+
 @profiler.trace
+@memoized.coalesced
 def server_list_paged(request,
                       search_opts=None,
                       detailed=True,
-                      sort_dir="desc"):
+                      sort_dir="desc",
+                      prefetched=None):
+    """Lists a page of servers.
+
+    ``prefetched`` are the raw servers listed by the function returned by
+    :func:`server_list_page_loader` for the same page. They are used instead
+    of listing the page again unless a server was deleted since.
+    """
     has_more_data = False
     has_prev_data = False
     nova_client = get_novaclient_with_locked_status(request)
@@ -484,39 +574,45 @@ def server_list_paged(request,
                                       None)
         view_marker = 'possibly_deleted' if deleted and marker else 'ok'
         search_opts['marker'] = marker if marker or deleted else None
+        if view_marker == 'possibly_deleted' and deleted == marker:
+            cursor = _get_page_cursor(request, marker, sort_dir)
+            if cursor:
+                search_opts['marker'] = cursor
+                view_marker = 'ok'
         search_opts['limit'] = page_size + 1
-        # NOTE(amotoki): It looks like the 'sort_keys' must be unique to make
-        # the pagination in the nova API works as expected. Multiple servers
-        # can have a same 'created_at' as its resolution is a second.
-        # To ensure the uniqueness we add 'uuid' to the sort keys.
-        # 'display_name' is added before 'uuid' to list servers in the
-        # alphabetical order.
-        sort_keys = ['created_at', 'display_name', 'uuid']
+        sort_keys = _SERVER_SORT_KEYS
 
-        servers = [Server(s, request)
-                   for s in nova_client.servers.list(detailed, search_opts,
-                                                     sort_keys=sort_keys,
-                                                     sort_dirs=[sort_dir] * 3)]
+        if prefetched is None or deleted:
+            prefetched = nova_client.servers.list(detailed, search_opts,
+                                                  sort_keys=sort_keys,
+                                                  sort_dirs=[sort_dir] * 3)
+        servers = [Server(s, request) for s in prefetched]
 
+        # NOTE: The listing in the same direction as the first one would
+        # return the same empty result, so it is not made again.
         if view_marker == 'possibly_deleted':
             if not servers:
                 view_marker = 'head_deleted'
                 reversed_order = False
-                servers = [Server(s, request)
-                           for s in
-                           nova_client.servers.list(detailed,
-                                                    search_opts=search_opts,
-                                                    sort_keys=sort_keys,
-                                                    sort_dirs=['desc'] * 3)]
+                if sort_dir != 'desc':
+                    servers = [Server(s, request)
+                               for s in
+                               nova_client.servers.list(
+                                   detailed,
+                                   search_opts=search_opts,
+                                   sort_keys=sort_keys,
+                                   sort_dirs=['desc'] * 3)]
             if not servers:
                 view_marker = 'tail_deleted'
                 reversed_order = True
-                servers = [Server(s, request)
-                           for s in
-                           nova_client.servers.list(detailed,
-                                                    search_opts=search_opts,
-                                                    sort_keys=sort_keys,
-                                                    sort_dirs=['asc'] * 3)]
+                if sort_dir != 'asc':
+                    servers = [Server(s, request)
+                               for s in
+                               nova_client.servers.list(
+                                   detailed,
+                                   search_opts=search_opts,
+                                   sort_keys=sort_keys,
+                                   sort_dirs=['asc'] * 3)]
         (servers, has_more_data, has_prev_data) = update_pagination(
             servers, page_size, marker, reversed_order)
         has_prev_data = (False
@@ -525,6 +621,7 @@ def server_list_paged(request,
         has_more_data = (False
                          if view_marker == 'tail_deleted'
                          else has_more_data)
+        _remember_page_cursors(request, servers)
     else:
         servers = [Server(s, request)
                    for s in nova_client.servers.list(detailed, search_opts)]
@@ -532,6 +629,7 @@ def server_list_paged(request,
 
 
 @profiler.trace
+@memoized.coalesced
 def server_list(request, search_opts=None, detailed=True):
     (servers, has_more_data, _) = server_list_paged(request,
                                                     search_opts,
@@ -596,6 +694,7 @@ def server_rebuild(request, instance_id, image_id, password=None,
 
 
 @profiler.trace
+@memoized.invalidates_shared_memoized('floating_ip_target')
 def server_update(request, instance_id, name, description=None):
     nc = _nova.get_novaclient_with_instance_desc(request)
     return nc.servers.update(instance_id, name=name.strip(),
@@ -889,6 +988,7 @@ def migrate_host(request, host, live_migrate=False, disk_over_commit=False,
 
 
 @profiler.trace
+@memoized.coalesced
 def tenant_absolute_limits(request, reserved=False, tenant_id=None):
     # Nova does not allow to specify tenant_id for non-admin users
     # even if tenant_id matches a tenant_id of the user.
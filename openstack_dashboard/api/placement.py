@@ -10,12 +10,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
+
 from django.conf import settings
+from django.core.cache import caches
 from keystoneauth1 import adapter
 from keystoneauth1 import identity
 from keystoneauth1 import session
+import requests
 
 from openstack_dashboard.api import base
+from openstack_dashboard.utils import futurist_utils
+from openstack_dashboard.utils import settings as utils
 
 from horizon.utils.memoized import memoized
 
@@ -47,8 +53,15 @@ def make_adapter(request):
         verify = False
     elif settings.OPENSTACK_SSL_CACERT:
         verify = settings.OPENSTACK_SSL_CACERT
+    # The details of the resource providers are fetched in parallel, so
+    # keep as many connections alive as there can be parallel calls.
+    pool_size = utils.get_dict_config('PARALLEL_CALLS_POOL', 'max_workers')
+    keep_alive = session.TCPKeepAliveAdapter(pool_maxsize=pool_size)
+    http = requests.Session()
+    http.mount('https://', keep_alive)
+    http.mount('http://', keep_alive)
     return Adapter(
-        session.Session(auth=auth, verify=verify),
+        session.Session(auth=auth, verify=verify, session=http),
         api_version="placement 1.6",
     )
 
@@ -93,62 +106,108 @@ def resource_provider_traits(request, uuid):
     return _get_json(request, f'/resource_providers/{uuid}/traits')['traits']
 
 
-def get_providers(request):
+def _get_provider_details(request, provider, aggregates, traits):
+    uuid = provider['uuid']
+    provider['inventories'] = resource_provider_inventories(request, uuid)
+    provider['usages'] = resource_provider_usages(request, uuid)
+    if aggregates:
+        provider['aggregates'] = resource_provider_aggregates(request, uuid)
+    if traits:
+        provider['traits'] = resource_provider_traits(request, uuid)
+
+
+def _set_provider_capacities(p):
+    inventories = p['inventories']
+    usages = p['usages']
+    vcpus = inventories.get('VCPU')
+    pcpus = inventories.get('PCPU')
+    memory = inventories.get('MEMORY_MB')
+    disk = inventories.get('DISK_GB')
+
+    p['vcpus_used'] = usages.get('VCPU')
+    # Reserved:
+    # The actual amount of the resource that the provider can accommodate
+    # Total:
+    # Overall capacity
+    if vcpus is not None:
+        p.update(vcpus_reserved=vcpus['reserved'],
+                 vcpus=vcpus['total'],
+                 vcpus_ar=vcpus['allocation_ratio'])
+        p['vcpus_capacity'] = int(p['vcpus_ar'] * p['vcpus'])
+    else:
+        p.update(vcpus_reserved=None, vcpus=None,
+                 vcpus_ar=None, vcpus_capacity=None)
+
+    p['pcpus_used'] = usages.get('PCPU')
+    if pcpus is not None:
+        p.update(pcpus_reserved=pcpus['reserved'],
+                 pcpus=pcpus['total'],
+                 pcpus_ar=pcpus['allocation_ratio'])
+        p['pcpus_capacity'] = int(p['pcpus_ar'] * p['pcpus'])
+    else:
+        p.update(pcpus_reserved=None, pcpus=None,
+                 pcpus_ar=None, pcpus_capacity=None)
+
+    p['memory_mb_used'] = usages.get('MEMORY_MB')
+    if memory is not None:
+        p.update(memory_mb_reserved=memory['reserved'],
+                 memory_mb=memory['total'],
+                 memory_mb_ar=memory['allocation_ratio'])
+        p['memory_mb_capacity'] = p['memory_mb_ar'] * p['memory_mb']
+    else:
+        p.update(memory_mb_reserved=None, memory_mb=None,
+                 memory_mb_ar=None, memory_mb_capacity=None)
+
+    p['disk_gb_used'] = usages.get('DISK_GB')
+    if disk is not None:
+        p.update(disk_gb_reserved=disk['reserved'],
+                 disk_gb=disk['total'],
+                 disk_gb_ar=disk['allocation_ratio'])
+        p['disk_gb_capacity'] = p['disk_gb_ar'] * p['disk_gb']
+    else:
+        p.update(disk_gb_reserved=None, disk_gb=None,
+                 disk_gb_ar=None, disk_gb_capacity=None)
+
+
+def _get_providers_cache_key(request, aggregates, traits):
+    raw_key = '%s|%s|%s' % (base.url_for(request, 'placement'),
+                            aggregates, traits)
+    digest = hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+    return 'placement:providers:%s' % digest
+
+
+@memoized
+def get_providers(request, aggregates=True, traits=True):
+    """Returns the resource providers with their inventories and usages.
+
+    The inventories, usages, aggregates and traits of the providers are
+    fetched in parallel, by at most half of the threads of
+    ``PARALLEL_CALLS_POOL``. When ``PLACEMENT_PROVIDERS_CACHE`` is enabled,
+    the providers are cached for the placement endpoint of the region, so
+    they are shared by all the users of the region.
+
+    :param aggregates: whether to fetch the aggregates of the providers.
+    :param traits: whether to fetch the traits of the providers.
+    """
+    cache = None
+    if utils.get_dict_config('PLACEMENT_PROVIDERS_CACHE', 'enabled'):
+        cache = caches[utils.get_dict_config('PLACEMENT_PROVIDERS_CACHE',
+                                             'cache_alias')]
+        key = _get_providers_cache_key(request, aggregates, traits)
+        providers = cache.get(key)
+        if providers is not None:
+            return providers
+
     providers = resource_providers(request)
+    futurist_utils.call_for_each_parallel(
+        lambda provider: _get_provider_details(request, provider,
+                                               aggregates, traits),
+        providers)
     for p in providers:
-        inventories = resource_provider_inventories(request, p['uuid'])
-        usages = resource_provider_usages(request, p['uuid'])
-        vcpus = inventories.get('VCPU')
-        pcpus = inventories.get('PCPU')
-        memory = inventories.get('MEMORY_MB')
-        disk = inventories.get('DISK_GB')
-        p['inventories'] = inventories
-        p['usages'] = usages
-        p['aggregates'] = resource_provider_aggregates(request, p['uuid'])
-        p['traits'] = resource_provider_traits(request, p['uuid'])
-
-        p['vcpus_used'] = usages.get('VCPU')
-        # Reserved:
-        # The actual amount of the resource that the provider can accommodate
-        # Total:
-        # Overall capacity
-        if vcpus is not None:
-            p.update(vcpus_reserved=vcpus['reserved'],
-                     vcpus=vcpus['total'],
-                     vcpus_ar=vcpus['allocation_ratio'])
-            p['vcpus_capacity'] = int(p['vcpus_ar'] * p['vcpus'])
-        else:
-            p.update(vcpus_reserved=None, vcpus=None,
-                     vcpus_ar=None, vcpus_capacity=None)
-
-        p['pcpus_used'] = usages.get('PCPU')
-        if pcpus is not None:
-            p.update(pcpus_reserved=pcpus['reserved'],
-                     pcpus=pcpus['total'],
-                     pcpus_ar=pcpus['allocation_ratio'])
-            p['pcpus_capacity'] = int(p['pcpus_ar'] * p['pcpus'])
-        else:
-            p.update(pcpus_reserved=None, pcpus=None,
-                     pcpus_ar=None, pcpus_capacity=None)
-
-        p['memory_mb_used'] = usages.get('MEMORY_MB')
-        if memory is not None:
-            p.update(memory_mb_reserved=memory['reserved'],
-                     memory_mb=memory['total'],
-                     memory_mb_ar=memory['allocation_ratio'])
-            p['memory_mb_capacity'] = p['memory_mb_ar'] * p['memory_mb']
-        else:
-            p.update(memory_mb_reserved=None, memory_mb=None,
-                     memory_mb_ar=None, memory_mb_capacity=None)
-
-        p['disk_gb_used'] = usages.get('DISK_GB')
-        if disk is not None:
-            p.update(disk_gb_reserved=disk['reserved'],
-                     disk_gb=disk['total'],
-                     disk_gb_ar=disk['allocation_ratio'])
-            p['disk_gb_capacity'] = p['disk_gb_ar'] * p['disk_gb']
-        else:
-            p.update(disk_gb_reserved=None, disk_gb=None,
-                     disk_gb_ar=None, disk_gb_capacity=None)
+        _set_provider_capacities(p)
 
+    if cache is not None:
+        cache.set(key, providers,
+                  utils.get_dict_config('PLACEMENT_PROVIDERS_CACHE',
+                                        'timeout'))
     return providers
@@ -111,6 +111,25 @@ class ImageReactivate(generic.View):
         return api.glance.image_reactivate(request, image_id)
 
 
+@urls.register
+class ImageUpload(generic.View):
+    """API for the progress of an upload of image data through Horizon"""
+    url_regex = r'glance/images/(?P<image_id>[^/]+)/upload/$'
+
+    @rest_utils.ajax()
+    def get(self, request, image_id):
+        """Get the progress of the upload of the data of a specific image
+
+        The response contains the status of the upload (queued, uploading,
+        completed or failed), the number of bytes sent to Glance and the
+        size of the image data.
+        """
+        upload = api.glance.image_upload_status(request, image_id)
+        if upload is None:
+            raise rest_utils.AjaxError(404, 'No upload of the image data')
+        return upload
+
+
 @urls.register
 class ImageProperties(generic.View):
     """API for retrieving only a custom properties of single image."""
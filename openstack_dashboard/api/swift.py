@@ -20,6 +20,10 @@ from datetime import datetime
 from urllib import parse
 
 import functools
+import json
+import logging
+import threading
+import time
 
 import swiftclient
 
@@ -30,6 +34,10 @@ from horizon import exceptions
 
 from openstack_dashboard.api import base
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import futurist_utils
+from openstack_dashboard.utils import settings as utils_settings
+
+LOG = logging.getLogger(__name__)
 
 FOLDER_DELIMITER = "/"
 CHUNK_SIZE = settings.SWIFT_FILE_TRANSFER_CHUNK_SIZE
@@ -330,6 +338,119 @@ def swift_copy_object(request, orig_container_name, orig_object_name,
     return StorageObject(obj_info, new_container_name)
 
 
+def _get_segment_size(request, size):
+    """Returns the size of the segments to upload an object of ``size`` in.
+
+    ``None`` is returned when the object is uploaded in a single request.
+    """
+    if not utils_settings.get_dict_config('SWIFT_SEGMENTED_UPLOAD',
+                                          'enabled'):
+        return None
+    segment_size = utils_settings.get_dict_config('SWIFT_SEGMENTED_UPLOAD',
+                                                  'segment_size')
+    if size <= segment_size:
+        return None
+    slo = swift_get_capabilities(request).get('slo')
+    if slo is None:
+        return None
+    max_segments = slo.get('max_manifest_segments')
+    if max_segments and size > segment_size * max_segments:
+        segment_size = -(-size // max_segments)
+    return segment_size
+
+
+class _SegmentReader(object):
+    """Reads a segment of an object file shared by the segment uploads."""
+
+    def __init__(self, object_file, lock, offset, length):
+        self.object_file = object_file
+        self.lock = lock
+        self.offset = offset
+        self.length = length
+        self.position = 0
+
+    def read(self, size=-1):
+        remaining = self.length - self.position
+        if size < 0 or size > remaining:
+            size = remaining
+        if not size:
+            return b''
+        with self.lock:
+            self.object_file.seek(self.offset + self.position)
+            chunk = self.object_file.read(size)
+        self.position += len(chunk)
+        return chunk
+
+    def tell(self):
+        return self.position
+
+    def seek(self, position):
+        # Used by swiftclient to send a segment again on retries.
+        self.position = position
+
+
+def _upload_segmented_object(request, container_name, object_name,
+                             object_file, size, segment_size, headers):
+    """Uploads an object as a Static Large Object.
+
+    The segments are stored in the ``<container>_segments`` container, like
+    the swift command line client does, and are uploaded in parallel on the
+    shared thread pool, each streamed from the object file in chunks. The
+    manifest is uploaded once all the segments are.
+    """
+    segment_container = '%s_segments' % container_name
+    prefix = '%s/slo/%f/%d/%d/' % (object_name, time.time(), size,
+                                   segment_size)
+    lock = threading.Lock()
+    errors = []
+
+    def upload_segment(segment):
+        index, offset = segment
+        if errors:
+            # Another segment failed, the upload is abandoned.
+            return None
+        length = min(segment_size, size - offset)
+        segment_name = '%s%08d' % (prefix, index)
+        try:
+            # Connections cannot be shared by threads.
+            etag = swift_api(request).put_object(
+                segment_container, segment_name,
+                _SegmentReader(object_file, lock, offset, length),
+                content_length=length)
+        except Exception as e:
+            errors.append(e)
+            return None
+        return {'path': '/%s/%s' % (segment_container, segment_name),
+                'etag': etag,
+                'size_bytes': length}
+
+    swift_api(request).put_container(segment_container)
+    max_workers = utils_settings.get_dict_config('SWIFT_SEGMENTED_UPLOAD',
+                                                 'max_workers')
+    manifest = futurist_utils.call_for_each_parallel(
+        upload_segment, enumerate(range(0, size, segment_size)),
+        max_workers=max_workers)
+    if errors:
+        _delete_segments(request, [segment for segment in manifest
+                                   if segment is not None])
+        raise errors[0]
+
+    return swift_api(request).put_object(
+        container_name, object_name, json.dumps(manifest),
+        headers=headers, query_string='multipart-manifest=put')
+
+
+def _delete_segments(request, segments):
+    conn = swift_api(request)
+    for segment in segments:
+        container, segment_name = segment['path'].lstrip('/').split('/', 1)
+        try:
+            conn.delete_object(container, segment_name)
+        except swiftclient.exceptions.ClientException:
+            LOG.warning('Failed to delete segment %s of a failed upload.',
+                        segment_name)
+
+
 @profiler.trace
 @safe_swift_exception
 def swift_upload_object(request, container_name, object_name,
@@ -340,6 +461,14 @@ def swift_upload_object(request, container_name, object_name,
         headers['X-Object-Meta-Orig-Filename'] = object_file.name
         size = object_file.size
 
+    segment_size = _get_segment_size(request, size)
+    if segment_size:
+        etag = _upload_segmented_object(request, container_name, object_name,
+                                        object_file, size, segment_size,
+                                        headers)
+        obj_info = {'name': object_name, 'bytes': size, 'etag': etag}
+        return StorageObject(obj_info, container_name)
+
     etag = swift_api(request).put_object(container_name,
                                          object_name,
                                          object_file,
@@ -49,8 +49,11 @@ class ProviderTab(tabs.TableTab):
 
     def get_providers_data(self):
         providers = []
+        # The table does not show the aggregates and traits of the providers.
         try:
-            providers = placement.get_providers(self.request)
+            providers = placement.get_providers(self.request,
+                                                aggregates=False,
+                                                traits=False)
         except Exception:
             exceptions.handle(self.request,
                               _('Unable to retrieve providers information.'))
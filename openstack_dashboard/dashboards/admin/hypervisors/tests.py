@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from unittest import mock
+
 from django.urls import reverse
 
 from openstack_dashboard import api
@@ -21,7 +23,8 @@ from openstack_dashboard.test import helpers as test
 class HypervisorViewTest(test.BaseAdminViewTests):
     @test.create_mocks({api.nova: ['hypervisor_list',
                                    'hypervisor_stats',
-                                   'service_list']})
+                                   'service_list'],
+                        api.placement: ['get_providers']})
     def test_index(self):
         hypervisors = self.hypervisors.list()
         compute_services = [service for service in self.services.list()
@@ -29,6 +32,7 @@ class HypervisorViewTest(test.BaseAdminViewTests):
         self.mock_hypervisor_list.return_value = hypervisors
         self.mock_hypervisor_stats.return_value = self.hypervisors.stats
         self.mock_service_list.return_value = compute_services
+        self.mock_get_providers.return_value = []
 
         res = self.client.get(reverse('horizon:admin:hypervisors:index'))
         self.assertTemplateUsed(res, 'admin/hypervisors/index.html')
@@ -63,6 +67,13 @@ class HypervisorViewTest(test.BaseAdminViewTests):
             test.IsHttpRequest())
         self.mock_service_list.assert_called_once_with(
             test.IsHttpRequest(), binary='nova-compute')
+        # Neither the statistics nor the providers table show the
+        # aggregates and traits of the providers.
+        self.mock_get_providers.assert_has_calls([
+            mock.call(test.IsHttpRequest(), aggregates=False, traits=False),
+            mock.call(test.IsHttpRequest(), aggregates=False, traits=False),
+        ])
+        self.assertEqual(2, self.mock_get_providers.call_count)
 
     @test.create_mocks({api.nova: ['hypervisor_list',
                                    'hypervisor_stats',
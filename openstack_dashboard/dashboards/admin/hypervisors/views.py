@@ -38,7 +38,8 @@ class AdminIndexView(tabs.TabbedTableView):
             exceptions.handle(self.request,
                               _('Unable to retrieve hypervisor statistics.'))
         try:
-            context["providers"] = api.placement.get_providers(self.request)
+            context["providers"] = api.placement.get_providers(
+                self.request, aggregates=False, traits=False)
         except Exception:
             exceptions.handle(self.request,
                               _('Unable to retrieve providers statistics.'))
@@ -95,16 +95,29 @@ class LiveMigrateInstance(policy.PolicyTargetMixin,
 class AdminUpdateRow(project_tables.UpdateRow):
     def get_data(self, request, instance_id):
         instance = super().get_data(request, instance_id)
-        try:
-            tenant = api.keystone.tenant_get(request,
-                                             instance.tenant_id,
-                                             admin=True)
-            instance.tenant_name = getattr(tenant, "name", instance.tenant_id)
-        except keystone_exceptions.NotFound:
-            instance.tenant_name = None
-
+        self._load_tenant_names(request, [instance])
         return instance
 
+    def get_data_batch(self, request, instance_ids):
+        data = super().get_data_batch(request, instance_ids)
+        self._load_tenant_names(
+            request, [instance for instance in data.values() if instance])
+        return data
+
+    def _load_tenant_names(self, request, instances):
+        tenant_names = {}
+        for instance in instances:
+            tenant_id = instance.tenant_id
+            if tenant_id not in tenant_names:
+                try:
+                    tenant = api.keystone.tenant_get(request, tenant_id,
+                                                     admin=True)
+                    tenant_names[tenant_id] = getattr(tenant, "name",
+                                                      tenant_id)
+                except keystone_exceptions.NotFound:
+                    tenant_names[tenant_id] = None
+            instance.tenant_name = tenant_names[tenant_id]
+
 
 class AdminInstanceFilterAction(tables.FilterAction):
     # Change default name of 'filter' to distinguish this one from the
@@ -13,12 +13,15 @@
 #    under the License.
 
 from collections import OrderedDict
+import json
 from unittest import mock
 import uuid
 
 from django.conf import settings
 from django.test import override_settings
 from django.urls import reverse
+from django.utils.http import urlencode
+from novaclient import exceptions as nova_exceptions
 
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
@@ -39,6 +42,49 @@ class InstanceViewTest(test.BaseAdminViewTests):
             return [[image for image in images if
                      image.visibility != 'community']]
 
+    @test.create_mocks({api.nova: ['server_list', 'server_get',
+                                   'flavor_list'],
+                        api.network: ['servers_update_addresses'],
+                        api.keystone: ['tenant_get']})
+    def test_rows_update(self):
+        servers = self.servers.list()[:2]
+        deleted_id = str(uuid.uuid4())
+        servers_by_id = dict((server.id, server) for server in servers)
+
+        def server_get(request, instance_id):
+            if instance_id not in servers_by_id:
+                raise nova_exceptions.NotFound(404)
+            return servers_by_id[instance_id]
+
+        self.mock_server_get.side_effect = server_get
+        self.mock_flavor_list.return_value = self.flavors.list()
+        self.mock_tenant_get.return_value = self.tenants.first()
+        self.mock_servers_update_addresses.return_value = None
+
+        obj_ids = [server.id for server in servers] + [deleted_id]
+        params = [('action', 'rows_update'), ('table', 'instances')]
+        params += [('obj_id', obj_id) for obj_id in obj_ids]
+        res = self.client.get(INDEX_URL + '?' + urlencode(params),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        data = json.loads(res.content)
+        self.assertEqual([deleted_id], data['deleted'])
+        self.assertEqual([], data['failed'])
+        for server in servers:
+            self.assertIn('test_tenant', data['rows'][server.id])
+
+        # novaclient would send a list of uuids as a single string, so the
+        # instances are fetched one by one rather than listed.
+        self.mock_server_list.assert_not_called()
+        self.mock_server_get.assert_has_calls(
+            [mock.call(test.IsHttpRequest(), obj_id) for obj_id in obj_ids],
+            any_order=True)
+        self.assertEqual(len(obj_ids), self.mock_server_get.call_count)
+        self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_tenant_get.assert_called_once_with(
+            test.IsHttpRequest(), servers[0].tenant_id, admin=True)
+        self.mock_servers_update_addresses.assert_called_once_with(
+            test.IsHttpRequest(), servers)
+
     @test.create_mocks({
         api.nova: ['flavor_list', 'server_list_paged'],
         api.keystone: ['tenant_list'],
@@ -17,6 +17,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+
 from django.urls import reverse
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
@@ -134,12 +136,27 @@ class AdminIndexView(tables.PagedTableMixin, tables.DataTableView):
             exceptions.handle(self.request, msg)
             return {}
 
+    def _list_instances(self, search_opts, marker, sort_dir, prefetched):
+        kwargs = {}
+        if prefetched is not None:
+            kwargs['prefetched'] = prefetched
+        return api.nova.server_list_paged(
+            self.request,
+            search_opts=dict(search_opts, marker=marker),
+            sort_dir=sort_dir, **kwargs)
+
+    def _prefetch_instances(self, search_opts, marker):
+        return api.nova.server_list_page_loader(
+            self.request, search_opts=dict(search_opts, marker=marker))
+
     def _get_instances(self, search_opts, sort_dir):
+        marker = search_opts.pop('marker', None)
         try:
-            instances, self._more, self._prev = api.nova.server_list_paged(
-                self.request,
-                search_opts=search_opts,
-                sort_dir=sort_dir)
+            instances, self._more, self._prev = self.get_paged_data(
+                functools.partial(self._list_instances, search_opts),
+                marker, sort_dir, filters=search_opts,
+                prefetch=functools.partial(self._prefetch_instances,
+                                           search_opts))
         except Exception:
             self._more = self._prev = False
             instances = []
@@ -204,9 +221,12 @@ class AdminIndexView(tables.PagedTableMixin, tables.DataTableView):
         if not filter_by_image_name:
             image_dict = self._get_images()
 
+        attachments_by_server = instance_utils.get_attachments_by_server(
+            volume_dict.values())
         # Loop through instances to get image, flavor and tenant info.
         for inst in instances:
-            self._populate_image_info(inst, image_dict, volume_dict)
+            self._populate_image_info(inst, image_dict, volume_dict,
+                                      attachments_by_server)
             if hasattr(inst, 'image') and isinstance(inst.image, dict):
                 image_id = inst.image.get('id')
                 if image_id in image_dict:
@@ -224,7 +244,8 @@ class AdminIndexView(tables.PagedTableMixin, tables.DataTableView):
             inst.tenant_name = getattr(tenant, "name", None)
         return instances
 
-    def _populate_image_info(self, instance, image_dict, volume_dict):
+    def _populate_image_info(self, instance, image_dict, volume_dict,
+                             attachments_by_server):
         if not hasattr(instance, 'image'):
             return
         # Instance from image returns dict
@@ -239,21 +260,10 @@ class AdminIndexView(tables.PagedTableMixin, tables.DataTableView):
                 instance.image['name'] = _("-")
         # Otherwise trying to get image from volume metadata
         else:
-            instance_volumes = [
-                attachment
-                for volume in volume_dict.values()
-                for attachment in volume.attachments
-                if attachment['server_id'] == instance.id
-            ]
-            # While instance from volume is being created,
-            # it does not have volumes
-            if not instance_volumes:
+            boot_volume = instance_utils.get_boot_volume(
+                instance, volume_dict, attachments_by_server)
+            if boot_volume is None:
                 return
-            # Sorting attached volumes by device name (eg '/dev/sda')
-            instance_volumes.sort(key=lambda attach: attach['device'])
-            # Getting volume object, which is as attached
-            # as the first device
-            boot_volume = volume_dict[instance_volumes[0]['id']]
             # There is a case where volume_image_metadata contains
             # only fields other than 'image_id' (See bug 1834747),
             # so we try to populate image information only when it is found.
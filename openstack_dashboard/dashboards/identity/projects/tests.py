@@ -21,6 +21,7 @@ from django.test.utils import override_settings
 from django.urls import reverse
 from django.utils import timezone
 
+from keystoneclient.v3 import role_assignments
 import pytest
 
 from horizon.workflows import views
@@ -303,7 +304,7 @@ class CreateProjectWorkflowTests(test.BaseAdminViewTests):
         self.mock_user_list.assert_called_once_with(test.IsHttpRequest(),
                                                     domain=domain_id)
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_role_list, 6,
+            self.mock_role_list, 2,
             mock.call(test.IsHttpRequest()))
         self.mock_group_list.assert_called_once_with(test.IsHttpRequest(),
                                                      domain=domain_id)
@@ -366,7 +367,7 @@ class CreateProjectWorkflowTests(test.BaseAdminViewTests):
         self.mock_user_list.assert_called_once_with(test.IsHttpRequest(),
                                                     domain=domain_id)
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_role_list, 4,
+            self.mock_role_list, 2,
             mock.call(test.IsHttpRequest()))
         self.mock_group_list.assert_called_once_with(test.IsHttpRequest(),
                                                      domain=domain_id)
@@ -437,7 +438,7 @@ class CreateProjectWorkflowTests(test.BaseAdminViewTests):
         self.mock_user_list.assert_called_once_with(test.IsHttpRequest(),
                                                     domain=domain_id)
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_role_list, 6,
+            self.mock_role_list, 2,
             mock.call(test.IsHttpRequest()))
         self.mock_group_list.assert_called_once_with(test.IsHttpRequest(),
                                                      domain=domain_id)
@@ -491,7 +492,7 @@ class CreateProjectWorkflowTests(test.BaseAdminViewTests):
         self.mock_user_list.assert_called_once_with(test.IsHttpRequest(),
                                                     domain=domain_id)
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_role_list, 4,
+            self.mock_role_list, 2,
             mock.call(test.IsHttpRequest()))
         self.mock_group_list.assert_called_once_with(test.IsHttpRequest(),
                                                      domain=domain_id)
@@ -613,11 +614,9 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
                                        'get_effective_domain_id',
                                        'tenant_update',
                                        'get_default_role',
-                                       'roles_for_user',
                                        'remove_tenant_user_role',
                                        'add_tenant_user_role',
                                        'user_list',
-                                       'roles_for_group',
                                        'remove_group_role',
                                        'add_group_role',
                                        'group_list',
@@ -632,126 +631,33 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
         roles = self.roles.list()
         role_assignments = self._get_proj_role_assignment(project.id)
 
-        # get/init
         self.mock_tenant_get.return_value = project
         self.mock_domain_get.return_value = self.domain
-
         self.mock_get_default_role.return_value = default_role
-        retvals_user_list = [users]
-        expected_user_list = [
-            mock.call(test.IsHttpRequest(), domain=domain_id)
-        ]
-        self.mock_user_list.side_effect = retvals_user_list
+        self.mock_user_list.return_value = users
         self.mock_role_list.return_value = roles
-        retvals_group_list = [groups]
-        expected_group_list = [
-            mock.call(test.IsHttpRequest(), domain=domain_id)
-        ]
-        self.mock_group_list.side_effect = retvals_group_list
-
-        workflow_data = {}
-
-        retvals_roles_for_user = []
-        expected_roles_for_user = []
-        self.mock_roles_for_user.side_effect = retvals_roles_for_user
-
-        workflow_data[USER_ROLE_PREFIX + "1"] = ['3']  # admin role
-        workflow_data[USER_ROLE_PREFIX + "2"] = ['2']  # member role
-        # Group assignment form  data
-        workflow_data[GROUP_ROLE_PREFIX + "1"] = ['3']  # admin role
-        workflow_data[GROUP_ROLE_PREFIX + "2"] = ['2']  # member role
-
-        # update some fields
-        project._info["domain_id"] = domain_id
-        project._info["name"] = "updated name"
-        project._info["description"] = "updated description"
-
-        # called once for tenant_update
+        self.mock_group_list.return_value = groups
+        self.mock_role_assignments_list.return_value = role_assignments
         self.mock_get_effective_domain_id.return_value = domain_id
-
-        # handle
         self.mock_tenant_update.return_value = project
 
-        retvals_user_list.append(users)
-        expected_user_list.append(
-            mock.call(test.IsHttpRequest(), domain=domain_id))
-
-        retvals_add_tenant_user_role = []
-        expected_add_tenant_user_role = []
-        self.mock_add_tenant_user_role.side_effect = \
-            retvals_add_tenant_user_role
-        retvals_remove_tenant_user_role = []
-        expected_remove_tenant_user_role = []
-        self.mock_remove_tenant_user_role.side_effect = \
-            retvals_remove_tenant_user_role
-        retvals_roles_for_group = []
-        expected_roles_for_group = []
-        self.mock_roles_for_group.side_effect = retvals_roles_for_group
-        retvals_remove_group_role = []
-        expected_remove_group_role = []
-        self.mock_remove_group_role.side_effect = retvals_remove_group_role
-
+        # The project members are user 1 (admin), users 2 and 3 (member)
+        # and group 1 (member).
+        workflow_data = {}
         # admin role with attempt to remove current admin, results in
         # warning message
         workflow_data[USER_ROLE_PREFIX + "1"] = ['3']
-
         # member role
         workflow_data[USER_ROLE_PREFIX + "2"] = ['1', '3']
-
         # admin role
         workflow_data[GROUP_ROLE_PREFIX + "1"] = ['2', '3']
-
         # member role
         workflow_data[GROUP_ROLE_PREFIX + "2"] = ['1', '2', '3']
-        self.mock_role_assignments_list.return_value = role_assignments
-        # Give user 1 role 2
-        retvals_add_tenant_user_role.append(None)
-        expected_add_tenant_user_role.append(
-            mock.call(test.IsHttpRequest(),
-                      project=self.tenant.id,
-                      user='1',
-                      role='2',))
-        # remove role 2 from user 2
-        retvals_remove_tenant_user_role.append(None)
-        expected_remove_tenant_user_role.append(
-            mock.call(test.IsHttpRequest(),
-                      project=self.tenant.id,
-                      user='2',
-                      role='2'))
-
-        # Give user 3 role 1
-        retvals_add_tenant_user_role.append(None)
-        expected_add_tenant_user_role.append(
-            mock.call(test.IsHttpRequest(),
-                      project=self.tenant.id,
-                      user='3',
-                      role='1'))
-        retvals_group_list.append(groups)
-        expected_group_list.append(
-            mock.call(test.IsHttpRequest(),
-                      domain=self.domain.id,
-                      project=self.tenant.id))
-        retvals_roles_for_group.append(roles)
-        expected_roles_for_group.append(
-            mock.call(test.IsHttpRequest(),
-                      group='1',
-                      project=self.tenant.id))
-        retvals_remove_group_role.append(None)
-        expected_remove_group_role.append(
-            mock.call(test.IsHttpRequest(),
-                      project=self.tenant.id,
-                      group='1',
-                      role='1'))
-        retvals_roles_for_group.append(roles)
-        expected_roles_for_group.append(
-            mock.call(test.IsHttpRequest(),
-                      group='2',
-                      project=self.tenant.id))
-        retvals_roles_for_group.append(roles)
-        expected_roles_for_group.append(
-            mock.call(test.IsHttpRequest(),
-                      group='3',
-                      project=self.tenant.id))
+
+        # update some fields
+        project._info["domain_id"] = domain_id
+        project._info["name"] = "updated name"
+        project._info["description"] = "updated description"
 
         # submit form data
         project_data = {"domain_id": project._info["domain_id"],
@@ -768,8 +674,8 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
         self.assertMessageCount(error=0, warning=1)
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
-        def _check_mock_calls(mocked_call, expected_calls, any_order=False):
-            mocked_call.assert_has_calls(expected_calls, any_order=any_order)
+        def _check_mock_calls(mocked_call, expected_calls):
+            mocked_call.assert_has_calls(expected_calls, any_order=True)
             self.assertEqual(len(expected_calls), mocked_call.call_count)
 
         self.mock_tenant_get.assert_called_once_with(test.IsHttpRequest(),
@@ -780,12 +686,17 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_get_default_role, 2,
             mock.call(test.IsHttpRequest()))
-        _check_mock_calls(self.mock_user_list, expected_user_list)
+        # The roles and members of the project are only retrieved once.
+        self.mock_user_list.assert_called_once_with(test.IsHttpRequest(),
+                                                    domain=domain_id)
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_role_list, 5,
+            self.mock_role_list, 2,
             mock.call(test.IsHttpRequest()))
-        _check_mock_calls(self.mock_group_list, expected_group_list)
-        _check_mock_calls(self.mock_roles_for_user, expected_roles_for_user)
+        self.mock_group_list.assert_called_once_with(test.IsHttpRequest(),
+                                                     domain=domain_id)
+        self.assert_mock_multiple_calls_with_same_arguments(
+            self.mock_role_assignments_list, 2,
+            mock.call(test.IsHttpRequest(), project=self.tenant.id))
 
         self.mock_get_effective_domain_id.assert_called_once_with(
             test.IsHttpRequest())
@@ -797,18 +708,85 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
             enabled=project.enabled,
             domain=domain_id)
 
-        _check_mock_calls(self.mock_add_tenant_user_role,
-                          expected_add_tenant_user_role, any_order=True)
-        _check_mock_calls(self.mock_remove_tenant_user_role,
-                          expected_remove_tenant_user_role, any_order=True)
-        _check_mock_calls(self.mock_roles_for_group,
-                          expected_roles_for_group)
-        _check_mock_calls(self.mock_remove_group_role,
-                          expected_remove_group_role)
+        # Give user 1 role 2 and user 3 role 1, remove role 2 from user 2.
+        # The admin role of user 1, the current user, is kept.
+        _check_mock_calls(self.mock_add_tenant_user_role, [
+            mock.call(test.IsHttpRequest(), project=self.tenant.id,
+                      user='1', role='2'),
+            mock.call(test.IsHttpRequest(), project=self.tenant.id,
+                      user='3', role='1'),
+        ])
+        _check_mock_calls(self.mock_remove_tenant_user_role, [
+            mock.call(test.IsHttpRequest(), project=self.tenant.id,
+                      user='2', role='2'),
+        ])
+        # Give groups 2 and 3 both roles, group 1 keeps its role.
+        _check_mock_calls(self.mock_add_group_role, [
+            mock.call(test.IsHttpRequest(), role=role_id, group=group_id,
+                      project=self.tenant.id)
+            for group_id in ('2', '3') for role_id in ('1', '2')
+        ])
+        self.mock_remove_group_role.assert_not_called()
 
-        self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_role_assignments_list, 3,
-            mock.call(test.IsHttpRequest(), project=self.tenant.id))
+    @test.create_mocks({api.keystone: ('tenant_get',
+                                       'domain_get',
+                                       'get_effective_domain_id',
+                                       'tenant_update',
+                                       'get_default_role',
+                                       'remove_tenant_user_role',
+                                       'add_tenant_user_role',
+                                       'user_list',
+                                       'remove_group_role',
+                                       'add_group_role',
+                                       'group_list',
+                                       'role_list',
+                                       'role_assignments_list')})
+    def test_update_project_save_partial_failure(self):
+        project = self.tenants.first()
+        domain_id = project.domain_id
+        roles = self.roles.list()
+
+        self.mock_tenant_get.return_value = project
+        self.mock_domain_get.return_value = self.domain
+        self.mock_get_default_role.return_value = self.roles.first()
+        self.mock_user_list.return_value = self._get_all_users(domain_id)
+        self.mock_role_list.return_value = roles
+        self.mock_group_list.return_value = self._get_all_groups(domain_id)
+        self.mock_role_assignments_list.return_value = \
+            self._get_proj_role_assignment(project.id)
+        self.mock_get_effective_domain_id.return_value = domain_id
+        self.mock_tenant_update.return_value = project
+
+        def add_tenant_user_role(request, project, user, role):
+            if user == '5':
+                raise self.exceptions.keystone
+        self.mock_add_tenant_user_role.side_effect = add_tenant_user_role
+
+        # Add users 5 and 6 as members, keep the other assignments.
+        workflow_data = {"domain_id": domain_id,
+                         "name": project.name,
+                         "id": project.id,
+                         "description": project.description,
+                         "enabled": project.enabled}
+        workflow_data[USER_ROLE_PREFIX + "1"] = ['1']
+        workflow_data[USER_ROLE_PREFIX + "2"] = ['2', '3', '5', '6']
+        workflow_data[GROUP_ROLE_PREFIX + "1"] = []
+        workflow_data[GROUP_ROLE_PREFIX + "2"] = ['1']
+        url = reverse('horizon:identity:projects:update',
+                      args=[self.tenant.id])
+        res = self.client.post(url, workflow_data)
+
+        self.assertNoFormErrors(res)
+        # One message for the failed assignment, one for the workflow.
+        self.assertMessageCount(error=2)
+        self.mock_add_tenant_user_role.assert_has_calls([
+            mock.call(test.IsHttpRequest(), project=self.tenant.id,
+                      user=user_id, role='2')
+            for user_id in ('5', '6')], any_order=True)
+        self.assertEqual(2, self.mock_add_tenant_user_role.call_count)
+        self.mock_remove_tenant_user_role.assert_not_called()
+        self.mock_add_group_role.assert_not_called()
+        self.mock_remove_group_role.assert_not_called()
 
     @test.create_mocks({api.keystone: ('tenant_get',)})
     def test_update_project_get_error(self):
@@ -917,7 +895,7 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
         self.assertEqual(len(expected_user_list),
                          self.mock_user_list.call_count)
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_role_list, 4,
+            self.mock_role_list, 2,
             mock.call(test.IsHttpRequest()))
         self.mock_group_list.assert_called_once_with(test.IsHttpRequest(),
                                                      domain=domain_id)
@@ -972,6 +950,105 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
         self.mock_domain_get.assert_called_once_with(test.IsHttpRequest(),
                                                      domain_id)
 
+    def _get_named_role_assignments(self, project_id, domain_id):
+        def assignment(kind, member_id, name, role_id, scope,
+                       member_domain_id=domain_id):
+            return role_assignments.RoleAssignment(
+                role_assignments.RoleAssignmentManager,
+                {kind: {'id': member_id, 'name': name,
+                        'domain': {'id': member_domain_id}},
+                 'role': {'id': role_id},
+                 'scope': scope})
+
+        project_scope = {'project': {'id': project_id}}
+        return [
+            assignment('user', '1', 'test_user', '1', project_scope),
+            assignment('user', '1', 'test_user', '2', project_scope),
+            assignment('user', '2', 'other_user', '2', project_scope),
+            assignment('user', '9', 'remote_user', '2', project_scope,
+                       member_domain_id='other'),
+            assignment('user', '3', 'domain_user', '2',
+                       {'domain': {'id': domain_id}}),
+            assignment('group', '1', 'test_group', '2', project_scope),
+        ]
+
+    @override_settings(OPENSTACK_KEYSTONE_LAZY_MEMBERSHIP=True)
+    @test.create_mocks({api.keystone: ('get_default_role',
+                                       'tenant_get',
+                                       'domain_get',
+                                       'user_list',
+                                       'group_list',
+                                       'role_list',
+                                       'role_assignments_list')})
+    def test_update_project_get_lazy_membership(self):
+        project = self.tenants.first()
+        domain_id = project.domain_id
+        self.mock_tenant_get.return_value = project
+        self.mock_domain_get.return_value = self.domain
+        self.mock_get_default_role.return_value = self.roles.first()
+        self.mock_role_list.return_value = self.roles.list()
+        self.mock_role_assignments_list.return_value = \
+            self._get_named_role_assignments(project.id, domain_id)
+
+        url = reverse('horizon:identity:projects:update',
+                      args=[self.tenant.id])
+        res = self.client.get(url)
+
+        workflow = res.context['workflow']
+        step = workflow.get_step(workflows.PROJECT_USER_MEMBER_SLUG)
+        self.assertTrue(step.lazy)
+        self.assertEqual({'1': 'test_user', '2': 'other_user'},
+                         step.action.members)
+        self.assertEqual({'1': ['1', '2'], '2': ['2']},
+                         step.action.members_roles)
+        self.assertEqual(
+            ['1'], step.action.fields[step.get_member_field_name('1')].initial)
+        search_url = reverse('horizon:identity:projects:search_members',
+                             args=['users'])
+        self.assertEqual(search_url + '?domain=' + domain_id,
+                         step.get_search_url())
+        self.assertContains(res, 'data-search-url="%s?domain=%s"'
+                            % (search_url, domain_id))
+        step = workflow.get_step(workflows.PROJECT_GROUP_MEMBER_SLUG)
+        self.assertEqual({'1': 'test_group'}, step.action.members)
+
+        self.mock_user_list.assert_not_called()
+        self.mock_group_list.assert_not_called()
+        self.mock_role_assignments_list.assert_has_calls([
+            mock.call(test.IsHttpRequest(), project=self.tenant.id,
+                      include_subtree=False, include_names=True)])
+
+    @override_settings(API_RESULT_PAGE_SIZE=1)
+    @test.create_mocks({api.keystone: ('user_list',
+                                       'group_list')})
+    def test_search_members(self):
+        self.mock_user_list.return_value = self.users.list()[:2]
+        self.mock_group_list.return_value = self.groups.list()[:1]
+
+        url = reverse('horizon:identity:projects:search_members',
+                      args=['users'])
+        res = self.client.get(url, {'q': 'user', 'domain': '1'})
+        self.assertEqual(
+            {'items': [{'id': self.users.first().id,
+                        'name': self.users.first().name}],
+             'more': True},
+            res.json())
+        self.mock_user_list.assert_called_once_with(
+            test.IsHttpRequest(), domain='1',
+            filters={'name__contains': 'user'})
+
+        url = reverse('horizon:identity:projects:search_members',
+                      args=['groups'])
+        res = self.client.get(url, {'q': 'group'})
+        self.assertEqual(
+            {'items': [{'id': self.groups.first().id,
+                        'name': self.groups.first().name}],
+             'more': False},
+            res.json())
+        self.mock_group_list.assert_called_once_with(
+            test.IsHttpRequest(), domain=None,
+            filters={'name__contains': 'group'})
+
 
 class UpdateQuotasWorkflowTests(test.BaseAdminViewTests):
 
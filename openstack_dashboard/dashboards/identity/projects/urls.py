@@ -32,4 +32,6 @@ urlpatterns = [
             views.DetailProjectView.as_view(), name='detail'),
     re_path(r'^(?P<tenant_id>[^/]+)/update_quotas/$',
             views.UpdateQuotasView.as_view(), name='update_quotas'),
+    re_path(r'^search/(?P<kind>users|groups)/$',
+            views.SearchMembersView.as_view(), name='search_members'),
 ]
@@ -260,3 +260,20 @@ class DetailProjectView(tabs.TabView):
     def get_tabs(self, request, *args, **kwargs):
         project = self.get_data()
         return self.tab_group_class(request, project=project, **kwargs)
+
+
+class SearchMembersView(workflows.MembershipSearchView):
+    """Searches the users or groups to add to a project by name."""
+
+    def get_candidates(self, request, query):
+        domain_id = request.GET.get('domain') or None
+        filters = {'name__contains': query}
+        if self.kwargs['kind'] == 'groups':
+            members = api.keystone.group_list(request, domain=domain_id,
+                                              filters=filters)
+        else:
+            members = api.keystone.user_list(request, domain=domain_id,
+                                             filters=filters)
+        # some backends (e.g. LDAP) do not provide group names
+        return [(member.id, getattr(member, 'name', member.id))
+                for member in members]
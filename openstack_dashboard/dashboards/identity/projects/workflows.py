@@ -17,7 +17,9 @@
 #    under the License.
 
 import abc
+import collections
 import logging
+from urllib import parse
 
 from django.conf import settings
 from django.urls import reverse
@@ -28,7 +30,6 @@ from openstack_auth import utils
 from horizon import exceptions
 from horizon import forms
 from horizon import messages
-from horizon.utils import memoized
 from horizon import workflows
 
 from openstack_dashboard import api
@@ -43,6 +44,7 @@ LOG = logging.getLogger(__name__)
 
 INDEX_URL = "horizon:identity:projects:index"
 ADD_USER_URL = "horizon:identity:projects:create_user"
+SEARCH_MEMBERS_URL = "horizon:identity:projects:search_members"
 PROJECT_USER_MEMBER_SLUG = "update_members"
 PROJECT_GROUP_MEMBER_SLUG = "update_group_members"
 COMMON_HORIZONTAL_TEMPLATE = "identity/projects/_common_horizontal_form.html"
@@ -262,12 +264,51 @@ class CreateProjectInfo(workflows.Step):
         self.contributes += tuple(EXTRA_INFO.keys())
 
 
+def _get_project_members(request, project_id, domain_id, group=False):
+    """Returns the users or groups of a project with their roles.
+
+    The names of the members come with their role assignments, so that the
+    members are known without listing all the users or groups of the domain.
+
+    :returns: a tuple of the ``(id, name)`` pairs of the members and of a
+              dict mapping their ids to the ids of their roles
+    """
+    kind = 'group' if group else 'user'
+    names = {}
+    members_roles = collections.defaultdict(list)
+    assignments = api.keystone.role_assignments_list(
+        request, project=project_id, include_subtree=False,
+        include_names=True)
+    for assignment in assignments:
+        member = getattr(assignment, kind, None)
+        if (member is None or
+                assignment.scope.get('project', {}).get('id') != project_id):
+            continue
+        # Only the members of the domain are managed, like when all the
+        # users or groups of the domain are listed.
+        if domain_id and member.get('domain', {}).get('id') != domain_id:
+            continue
+        names[member['id']] = member.get('name', member['id'])
+        members_roles[member['id']].append(assignment.role['id'])
+    members = sorted(names.items(), key=lambda m: (m[1].lower(), m[0]))
+    return members, members_roles
+
+
+def _get_search_url(kind, domain_id):
+    url = reverse(SEARCH_MEMBERS_URL, args=[kind])
+    if domain_id:
+        url += '?' + parse.urlencode({'domain': domain_id})
+    return url
+
+
 class UpdateProjectMembersAction(workflows.MembershipAction):
     def __init__(self, request, *args, **kwargs):
         super().__init__(request, *args, **kwargs)
         err_msg = _('Unable to retrieve user list. Please try again later.')
+        self.lazy = settings.OPENSTACK_KEYSTONE_LAZY_MEMBERSHIP
         # Use the domain_id from the project
         domain_id = self.initial.get("domain_id", None)
+        self.domain_id = domain_id
 
         project_id = ''
         if 'project_id' in self.initial:
@@ -290,14 +331,22 @@ class UpdateProjectMembersAction(workflows.MembershipAction):
         self.fields[default_role_name] = forms.CharField(required=False)
         self.fields[default_role_name].initial = default_role.id
 
-        # Get list of available users
-        all_users = []
+        # Get list of available users, in lazy mode only the project
+        # members are listed, the others are searched by the browser.
+        users_list = []
+        users_roles = {}
         try:
-            all_users = api.keystone.user_list(request,
-                                               domain=domain_id)
+            if self.lazy:
+                if project_id:
+                    users_list, users_roles = _get_project_members(
+                        request, project_id, domain_id)
+            else:
+                all_users = api.keystone.user_list(request,
+                                                   domain=domain_id)
+                users_list = [(user.id, user.name) for user in all_users]
         except Exception:
             exceptions.handle(request, err_msg)
-        users_list = [(user.id, user.name) for user in all_users]
+        self.members = dict(users_list)
 
         # Get list of roles
         role_list = []
@@ -307,16 +356,14 @@ class UpdateProjectMembersAction(workflows.MembershipAction):
             exceptions.handle(request,
                               err_msg,
                               redirect=reverse(INDEX_URL))
+        self.roles = role_list
         for role in role_list:
             field_name = self.get_member_field_name(role.id)
-            label = role.name
-            self.fields[field_name] = forms.MultipleChoiceField(required=False,
-                                                                label=label)
-            self.fields[field_name].choices = users_list
-            self.fields[field_name].initial = []
+            self.fields[field_name] = self.get_member_field(role.name,
+                                                            users_list)
 
         # Figure out users & roles
-        if project_id:
+        if project_id and not self.lazy:
             try:
                 users_roles = api.keystone.get_project_users_roles(request,
                                                                    project_id)
@@ -325,11 +372,15 @@ class UpdateProjectMembersAction(workflows.MembershipAction):
                                   err_msg,
                                   redirect=reverse(INDEX_URL))
 
-            for user_id in users_roles:
-                roles_ids = users_roles[user_id]
-                for role_id in roles_ids:
-                    field_name = self.get_member_field_name(role_id)
-                    self.fields[field_name].initial.append(user_id)
+        self.members_roles = users_roles
+        for user_id in users_roles:
+            roles_ids = users_roles[user_id]
+            for role_id in roles_ids:
+                field_name = self.get_member_field_name(role_id)
+                self.fields[field_name].initial.append(user_id)
+
+    def get_search_url(self):
+        return _get_search_url('users', self.domain_id)
 
     class Meta(object):
         name = _("Project Members")
@@ -345,14 +396,8 @@ class UpdateProjectMembers(workflows.UpdateMembersStep):
 
     def contribute(self, data, context):
         if data:
-            try:
-                roles = api.keystone.role_list(self.workflow.request)
-            except Exception:
-                exceptions.handle(self.workflow.request,
-                                  _('Unable to retrieve user list.'))
-
             post = self.workflow.request.POST
-            for role in roles:
+            for role in self.action.roles:
                 field = self.get_member_field_name(role.id)
                 context[field] = post.getlist(field)
         return context
@@ -362,8 +407,10 @@ class UpdateProjectGroupsAction(workflows.MembershipAction):
     def __init__(self, request, *args, **kwargs):
         super().__init__(request, *args, **kwargs)
         err_msg = _('Unable to retrieve group list. Please try again later.')
+        self.lazy = settings.OPENSTACK_KEYSTONE_LAZY_MEMBERSHIP
         # Use the domain_id from the project
         domain_id = self.initial.get("domain_id", None)
+        self.domain_id = domain_id
         project_id = ''
         if 'project_id' in self.initial:
             project_id = self.initial['project_id']
@@ -385,17 +432,25 @@ class UpdateProjectGroupsAction(workflows.MembershipAction):
         self.fields[default_role_name] = forms.CharField(required=False)
         self.fields[default_role_name].initial = default_role.id
 
-        # Get list of available groups
-        all_groups = []
+        # Get list of available groups, in lazy mode only the project
+        # groups are listed, the others are searched by the browser.
+        groups_list = []
+        groups_roles = {}
         try:
-            all_groups = api.keystone.group_list(request,
-                                                 domain=domain_id)
+            if self.lazy:
+                if project_id:
+                    groups_list, groups_roles = _get_project_members(
+                        request, project_id, domain_id, group=True)
+            else:
+                all_groups = api.keystone.group_list(request,
+                                                     domain=domain_id)
+                # some backends (e.g. LDAP) do not provide group names
+                groups_list = [
+                    (group.id, getattr(group, 'name', group.id))
+                    for group in all_groups]
         except Exception:
             exceptions.handle(request, err_msg)
-        # some backends (e.g. LDAP) do not provide group names
-        groups_list = [
-            (group.id, getattr(group, 'name', group.id))
-            for group in all_groups]
+        self.members = dict(groups_list)
 
         # Get list of roles
         role_list = []
@@ -405,16 +460,14 @@ class UpdateProjectGroupsAction(workflows.MembershipAction):
             exceptions.handle(request,
                               err_msg,
                               redirect=reverse(INDEX_URL))
+        self.roles = role_list
         for role in role_list:
             field_name = self.get_member_field_name(role.id)
-            label = role.name
-            self.fields[field_name] = forms.MultipleChoiceField(required=False,
-                                                                label=label)
-            self.fields[field_name].choices = groups_list
-            self.fields[field_name].initial = []
+            self.fields[field_name] = self.get_member_field(role.name,
+                                                            groups_list)
 
         # Figure out groups & roles
-        if project_id:
+        if project_id and not self.lazy:
             try:
                 groups_roles = api.keystone.get_project_groups_roles(
                     request, project_id)
@@ -423,11 +476,15 @@ class UpdateProjectGroupsAction(workflows.MembershipAction):
                                   err_msg,
                                   redirect=reverse(INDEX_URL))
 
-            for group_id in groups_roles:
-                roles_ids = groups_roles[group_id]
-                for role_id in roles_ids:
-                    field_name = self.get_member_field_name(role_id)
-                    self.fields[field_name].initial.append(group_id)
+        self.members_roles = groups_roles
+        for group_id in groups_roles:
+            roles_ids = groups_roles[group_id]
+            for role_id in roles_ids:
+                field_name = self.get_member_field_name(role_id)
+                self.fields[field_name].initial.append(group_id)
+
+    def get_search_url(self):
+        return _get_search_url('groups', self.domain_id)
 
     class Meta(object):
         name = _("Project Groups")
@@ -443,19 +500,51 @@ class UpdateProjectGroups(workflows.UpdateMembersStep):
 
     def contribute(self, data, context):
         if data:
-            try:
-                roles = api.keystone.role_list(self.workflow.request)
-            except Exception:
-                exceptions.handle(self.workflow.request,
-                                  _('Unable to retrieve role list.'))
-
             post = self.workflow.request.POST
-            for role in roles:
+            for role in self.action.roles:
                 field = self.get_member_field_name(role.id)
                 context[field] = post.getlist(field)
         return context
 
 
+def _get_requested_roles(step, data):
+    """Returns the (member_id, role_id) pairs selected in a members step."""
+    return {(member_id, role.id)
+            for role in step.action.roles
+            for member_id in data[step.get_member_field_name(role.id)]}
+
+
+def _get_current_roles(step):
+    """Returns the (member_id, role_id) pairs of the project of a step.
+
+    Only the roles of the members listed by the step are returned, Horizon
+    does not manage the roles of the users and groups of other domains.
+    """
+    action = step.action
+    return {(member_id, role_id)
+            for member_id, role_ids in action.members_roles.items()
+            if member_id in action.members
+            for role_id in role_ids}
+
+
+def _report_role_failures(request, step, failed_grants, failed_revokes):
+    """Adds an error message per role which could not be updated."""
+    role_names = {role.id: role.name for role in step.action.roles}
+    for pairs, msg in (
+            (failed_grants, _('Unable to grant role "%(role)s" to: '
+                              '%(members)s.')),
+            (failed_revokes, _('Unable to revoke role "%(role)s" from: '
+                               '%(members)s.'))):
+        members = collections.defaultdict(list)
+        for member_id, role_id in pairs:
+            members[role_id].append(step.action.members.get(member_id,
+                                                            member_id))
+        for role_id, names in sorted(members.items()):
+            messages.error(request, msg % {
+                'role': role_names.get(role_id, role_id),
+                'members': ', '.join(names)})
+
+
 class CreateProject(workflows.Workflow):
     slug = "create_project"
     name = _("Create Project")
@@ -504,65 +593,29 @@ class CreateProject(workflows.Workflow):
             return
 
     def _update_project_members(self, request, data, project_id):
-        # update project members
-        users_to_add = 0
+        # add new users to project
+        member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
         try:
-            available_roles = api.keystone.role_list(request)
-            member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
-            # count how many users are to be added
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                users_to_add += len(role_list)
-            # add new users to project
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                users_added = 0
-                for user in role_list:
-                    api.keystone.add_tenant_user_role(request,
-                                                      project=project_id,
-                                                      user=user,
-                                                      role=role.id)
-                    users_added += 1
-                users_to_add -= users_added
+            failures = api.keystone.update_project_roles(
+                request, project_id,
+                grants=_get_requested_roles(member_step, data))
         except Exception:
-            group_msg = _(", add project groups")
-            exceptions.handle(request,
-                              _('Failed to add %(users_to_add)s project '
-                                'members%(group_msg)s and set project quotas.')
-                              % {'users_to_add': users_to_add,
-                                 'group_msg': group_msg})
+            exceptions.handle(request, _('Failed to add project members.'))
+            return
+        _report_role_failures(request, member_step, *failures)
 
     def _update_project_groups(self, request, data, project_id):
-        # update project groups
-        groups_to_add = 0
+        # add new groups to project
+        member_step = self.get_step(PROJECT_GROUP_MEMBER_SLUG)
         try:
-            available_roles = api.keystone.role_list(request)
-            member_step = self.get_step(PROJECT_GROUP_MEMBER_SLUG)
-
-            # count how many groups are to be added
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                groups_to_add += len(role_list)
-            # add new groups to project
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                groups_added = 0
-                for group in role_list:
-                    api.keystone.add_group_role(request,
-                                                role=role.id,
-                                                group=group,
-                                                project=project_id)
-                    groups_added += 1
-                groups_to_add -= groups_added
+            failures = api.keystone.update_project_roles(
+                request, project_id,
+                grants=_get_requested_roles(member_step, data),
+                group=True)
         except Exception:
-            exceptions.handle(request,
-                              _('Failed to add %s project groups '
-                                'and update project quotas.')
-                              % groups_to_add)
+            exceptions.handle(request, _('Failed to add project groups.'))
+            return
+        _report_role_failures(request, member_step, *failures)
 
     def handle(self, request, data):
         project = self._create_project(request, data)
@@ -645,10 +698,6 @@ class UpdateProject(workflows.Workflow):
             return message % self.context.get('name', 'unknown project')
         return message
 
-    @memoized.memoized_method
-    def _get_available_roles(self, request):
-        return api.keystone.role_list(request)
-
     def _update_project(self, request, data):
         """Update project info"""
         domain_id = identity.get_domain_id_for_operation(request)
@@ -676,39 +725,6 @@ class UpdateProject(workflows.Workflow):
             exceptions.handle(request, ignore=True)
             return
 
-    def _add_roles_to_users(self, request, data, project_id, user_id,
-                            role_ids, available_roles):
-        member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
-        current_role_ids = list(role_ids)
-
-        for role in available_roles:
-            field_name = member_step.get_member_field_name(role.id)
-            # Check if the user is in the list of users with this role.
-            if user_id in data[field_name]:
-                # Add it if necessary
-                if role.id not in current_role_ids:
-                    # user role has changed
-                    api.keystone.add_tenant_user_role(
-                        request,
-                        project=project_id,
-                        user=user_id,
-                        role=role.id)
-                else:
-                    # User role is unchanged, so remove it from the
-                    # remaining roles list to avoid removing it later.
-                    index = current_role_ids.index(role.id)
-                    current_role_ids.pop(index)
-        return current_role_ids
-
-    def _remove_roles_from_user(self, request, project_id, user_id,
-                                current_role_ids):
-        for id_to_delete in current_role_ids:
-            api.keystone.remove_tenant_user_role(
-                request,
-                project=project_id,
-                user=user_id,
-                role=id_to_delete)
-
     def _is_removing_self_admin_role(self, request, project_id, user_id,
                                      available_roles, current_role_ids):
         is_current_user = user_id == request.user.id
@@ -736,172 +752,54 @@ class UpdateProject(workflows.Workflow):
         return False
 
     def _update_project_members(self, request, data, project_id):
-        # update project members
-        users_to_modify = 0
-        # Project-user member step
         member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
         try:
-            # Get our role options
-            available_roles = self._get_available_roles(request)
-            # Get the users currently associated with this project so we
-            # can diff against it.
-            users_roles = api.keystone.get_project_users_roles(
-                request, project=project_id)
-            users_to_modify = len(users_roles)
-
-            # TODO(bpokorny): The following lines are needed to make sure we
-            # only modify roles for users who are in the current domain.
-            # Otherwise, we'll end up removing roles for users who have roles
-            # on the project but aren't in the domain.  For now, Horizon won't
-            # support managing roles across domains.  The Keystone CLI
-            # supports it, so we may want to add that in the future.
-            all_users = api.keystone.user_list(request,
-                                               domain=data['domain_id'])
-            users_dict = {user.id: user.name for user in all_users}
-
-            for user_id in users_roles:
-                # Don't remove roles if the user isn't in the domain
-                if user_id not in users_dict:
-                    users_to_modify -= 1
-                    continue
-
-                # Check if there have been any changes in the roles of
-                # Existing project members.
-                current_role_ids = list(users_roles[user_id])
-                modified_role_ids = self._add_roles_to_users(
-                    request, data, project_id, user_id,
-                    current_role_ids, available_roles)
-                # Prevent admins from doing stupid things to themselves.
-                removing_admin = self._is_removing_self_admin_role(
-                    request, project_id, user_id, available_roles,
-                    modified_role_ids)
-                # Otherwise go through and revoke any removed roles.
-                if not removing_admin:
-                    self._remove_roles_from_user(request, project_id, user_id,
-                                                 modified_role_ids)
-                users_to_modify -= 1
-
-            # Grant new roles on the project.
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                # Count how many users may be added for exception handling.
-                users_to_modify += len(data[field_name])
-            for role in available_roles:
-                users_added = 0
-                field_name = member_step.get_member_field_name(role.id)
-                for user_id in data[field_name]:
-                    if user_id not in users_roles:
-                        api.keystone.add_tenant_user_role(request,
-                                                          project=project_id,
-                                                          user=user_id,
-                                                          role=role.id)
-                    users_added += 1
-                users_to_modify -= users_added
-            return True
+            requested = _get_requested_roles(member_step, data)
+            current = _get_current_roles(member_step)
+            revokes = current - requested
+            # Prevent admins from doing stupid things to themselves.
+            user_id = request.user.id
+            if self._is_removing_self_admin_role(
+                    request, project_id, user_id, member_step.action.roles,
+                    [role_id for member_id, role_id in revokes
+                     if member_id == user_id]):
+                revokes = {(member_id, role_id)
+                           for member_id, role_id in revokes
+                           if member_id != user_id}
+            failures = api.keystone.update_project_roles(
+                request, project_id, grants=requested - current,
+                revokes=revokes)
         except Exception:
-            group_msg = _(", update project groups")
             exceptions.handle(request,
-                              _('Failed to modify %(users_to_modify)s'
-                                ' project members%(group_msg)s and '
-                                'update project quotas.')
-                              % {'users_to_modify': users_to_modify,
-                                 'group_msg': group_msg})
+                              _('Failed to modify project members.'))
             return False
+        _report_role_failures(request, member_step, *failures)
+        return not any(failures)
 
-    def _update_project_groups(self, request, data, project_id, domain_id):
-        # update project groups
-        groups_to_modify = 0
+    def _update_project_groups(self, request, data, project_id):
         member_step = self.get_step(PROJECT_GROUP_MEMBER_SLUG)
         try:
-            available_roles = self._get_available_roles(request)
-            # Get the groups currently associated with this project so we
-            # can diff against it.
-            project_groups = api.keystone.group_list(request,
-                                                     domain=domain_id,
-                                                     project=project_id)
-            groups_to_modify = len(project_groups)
-            for group in project_groups:
-                # Check if there have been any changes in the roles of
-                # Existing project members.
-                current_roles = api.keystone.roles_for_group(
-                    self.request,
-                    group=group.id,
-                    project=project_id)
-                current_role_ids = [role.id for role in current_roles]
-                for role in available_roles:
-                    # Check if the group is in the list of groups with
-                    # this role.
-                    field_name = member_step.get_member_field_name(role.id)
-                    if group.id in data[field_name]:
-                        # Add it if necessary
-                        if role.id not in current_role_ids:
-                            # group role has changed
-                            api.keystone.add_group_role(
-                                request,
-                                role=role.id,
-                                group=group.id,
-                                project=project_id)
-                        else:
-                            # Group role is unchanged, so remove it from
-                            # the remaining roles list to avoid removing it
-                            # later.
-                            index = current_role_ids.index(role.id)
-                            current_role_ids.pop(index)
-
-                # Revoke any removed roles.
-                for id_to_delete in current_role_ids:
-                    api.keystone.remove_group_role(request,
-                                                   role=id_to_delete,
-                                                   group=group.id,
-                                                   project=project_id)
-                groups_to_modify -= 1
-
-            # Grant new roles on the project.
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                # Count how many groups may be added for error handling.
-                groups_to_modify += len(data[field_name])
-            for role in available_roles:
-                groups_added = 0
-                field_name = member_step.get_member_field_name(role.id)
-                project_group_ids = [x.id for x in project_groups]
-                for group_id in data[field_name]:
-                    if group_id not in project_group_ids:
-                        api.keystone.add_group_role(request,
-                                                    role=role.id,
-                                                    group=group_id,
-                                                    project=project_id)
-                    groups_added += 1
-                groups_to_modify -= groups_added
-            return True
+            requested = _get_requested_roles(member_step, data)
+            current = _get_current_roles(member_step)
+            failures = api.keystone.update_project_roles(
+                request, project_id, grants=requested - current,
+                revokes=current - requested, group=True)
         except Exception:
             exceptions.handle(request,
-                              _('Failed to modify %s project '
-                                'members, update project groups '
-                                'and update project quotas.')
-                              % groups_to_modify)
+                              _('Failed to modify project groups.'))
             return False
+        _report_role_failures(request, member_step, *failures)
+        return not any(failures)
 
     def handle(self, request, data):
-        # FIXME(gabriel): This should be refactored to use Python's built-in
-        # sets and do this all in a single "roles to add" and "roles to remove"
-        # pass instead of the multi-pass thing happening now.
-
         project = self._update_project(request, data)
         if not project:
             return False
 
         project_id = data['project_id']
-        # Use the domain_id from the project if available
-        domain_id = getattr(project, "domain_id", '')
-
-        ret = self._update_project_members(request, data, project_id)
-        if not ret:
-            return False
-
-        ret = self._update_project_groups(request, data,
-                                          project_id, domain_id)
-        if not ret:
-            return False
-
-        return True
+        # Update the groups even if some members could not be updated.
+        members_updated = self._update_project_members(request, data,
+                                                       project_id)
+        groups_updated = self._update_project_groups(request, data,
+                                                     project_id)
+        return members_updated and groups_updated
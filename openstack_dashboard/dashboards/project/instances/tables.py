@@ -46,6 +46,7 @@ from openstack_dashboard.dashboards.project.instances.workflows \
 from openstack_dashboard.dashboards.project.instances.workflows \
     import update_instance
 from openstack_dashboard import policy
+from openstack_dashboard.utils import futurist_utils
 from openstack_dashboard.views import get_url_with_pagination
 
 LOG = logging.getLogger(__name__)
@@ -783,25 +784,70 @@ class UpdateRow(tables.Row):
 
     def get_data(self, request, instance_id):
         instance = api.nova.server_get(request, instance_id)
+        self._load_details(request, [instance])
+        return instance
+
+    def get_data_batch(self, request, instance_ids):
+        data = self._get_instances(request, instance_ids)
+        self._load_batch_details(
+            request, [instance for instance in data.values() if instance])
+        return data
+
+    def _get_instances(self, request, instance_ids):
+        def get_instance(instance_id):
+            try:
+                return api.nova.server_get(request, instance_id), None
+            except Exception:
+                return None, exceptions.handle(request, ignore=True)
+
+        # NOTE: Nova only honours the uuid filter of the server list for
+        # admins and novaclient cannot send several values of a filter, so
+        # the instances are fetched by a few threads instead and their
+        # details are then loaded once for the whole batch.
+        results = futurist_utils.call_for_each_parallel(get_instance,
+                                                        instance_ids)
+        data = {}
+        for instance_id, (instance, error) in zip(instance_ids, results):
+            if instance is not None:
+                data[instance_id] = instance
+            elif error.status_code != 404:
+                data[instance_id] = None
+        return data
+
+    def _load_batch_details(self, request, instances):
+        if not instances:
+            return
+        flavors = None
+        if len(instances) > 1:
+            try:
+                flavors = dict((flavor.id, flavor)
+                               for flavor in api.nova.flavor_list(request))
+            except Exception:
+                exceptions.handle(request, ignore=True)
+        self._load_details(request, instances, flavors)
+
+    def _load_details(self, request, instances, flavors=None):
+        for instance in instances:
+            try:
+                instance.full_flavor = instance_utils.resolve_flavor(
+                    request, instance, flavors)
+            except Exception:
+                exceptions.handle(request,
+                                  _('Unable to retrieve flavor information '
+                                    'for instance "%s".') % instance.id,
+                                  ignore=True)
         try:
-            instance.full_flavor = instance_utils.resolve_flavor(request,
-                                                                 instance)
-        except Exception:
-            exceptions.handle(request,
-                              _('Unable to retrieve flavor information '
-                                'for instance "%s".') % instance_id,
-                              ignore=True)
-        try:
-            api.network.servers_update_addresses(request, [instance])
+            api.network.servers_update_addresses(request, instances)
         except Exception:
             exceptions.handle(request,
                               _('Unable to retrieve Network information '
-                                'for instance "%s".') % instance_id,
+                                'for instance "%s".') %
+                              ', '.join(instance.id for instance in instances),
                               ignore=True)
-        error = get_instance_error(instance)
-        if error:
-            messages.error(request, error)
-        return instance
+        for instance in instances:
+            error = get_instance_error(instance)
+            if error:
+                messages.error(request, error)
 
 
 class StartInstance(policy.PolicyTargetMixin, tables.BatchAction):
@@ -19,6 +19,7 @@
 import collections
 import json
 import logging
+import threading
 from unittest import mock
 
 from django.conf import settings
@@ -28,6 +29,7 @@ from django.test.utils import override_settings
 from django.urls import reverse
 from django.utils.http import urlencode
 from novaclient import api_versions
+from novaclient import exceptions as nova_exceptions
 
 from horizon import exceptions
 from horizon import forms
@@ -36,8 +38,10 @@ from openstack_dashboard import api
 from openstack_dashboard.dashboards.project.instances import console
 from openstack_dashboard.dashboards.project.instances import tables
 from openstack_dashboard.dashboards.project.instances import tabs
+from openstack_dashboard.dashboards.project.instances import utils
 from openstack_dashboard.dashboards.project.instances import workflows
 from openstack_dashboard.test import helpers
+from openstack_dashboard.utils import futurist_utils
 from openstack_dashboard.views import get_url_with_pagination
 
 
@@ -254,6 +258,36 @@ class InstanceTableTests(InstanceTestBase, InstanceTableTestMixin):
         self.assertNotContains(res, "Launch Instance (Quota exceeded)")
         self._check_get_index()
 
+    @override_settings(PARALLEL_CALLS_POOL={'max_workers': 1,
+                                            'max_backlog': 1,
+                                            'timeout': None})
+    def test_index_parallel_calls_pool_saturated(self):
+        futurist_utils._reset_pool()
+        self.addCleanup(futurist_utils._reset_pool)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(10)
+
+        # Other requests of the process hold the thread of the pool and
+        # fill its backlog.
+        pool = futurist_utils._get_pool()
+        pool.submit(block)
+        started.wait(5)
+        pool.submit(block)
+
+        res = self._get_index()
+
+        self.assertTemplateUsed(res, INDEX_TEMPLATE)
+        instances = res.context['instances_table'].data
+        self.assertCountEqual(instances, self.servers.list())
+        self._check_get_index()
+        self.assertGreater(
+            futurist_utils.get_pool_statistics()['rejected'], 0)
+
     @override_settings(OPENSTACK_INSTANCE_RETRIEVE_IP_ADDRESSES=False)
     def test_index_without_servers_update_addresses(self):
         res = self._get_index(use_servers_update_address=False)
@@ -2934,6 +2968,67 @@ class InstanceAjaxTests(helpers.TestCase):
         self.mock_tenant_absolute_limits.assert_called_once_with(
             helpers.IsHttpRequest(), reserved=True)
 
+    @helpers.create_mocks({api.nova: ("server_get",
+                                      "flavor_list",
+                                      "is_feature_available",
+                                      "tenant_absolute_limits"),
+                           api.network: ('servers_update_addresses',)})
+    def test_rows_update(self):
+        servers = self.servers.list()[:2]
+        servers_by_id = dict((server.id, server) for server in servers)
+
+        self.mock_is_feature_available.return_value = True
+        self.mock_server_get.side_effect = \
+            lambda request, instance_id: servers_by_id[instance_id]
+        self.mock_flavor_list.return_value = self.flavors.list()
+        self.mock_servers_update_addresses.return_value = None
+        self.mock_tenant_absolute_limits.return_value = self.limits['absolute']
+
+        params = [('action', 'rows_update'), ('table', 'instances')]
+        params += [('obj_id', server.id) for server in servers]
+        res = self.client.get('?'.join((INDEX_URL, urlencode(params))),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        data = json.loads(res.content)
+        self.assertEqual([], data['deleted'])
+        self.assertEqual([], data['failed'])
+        for server in servers:
+            self.assertIn(server.name, data['rows'][server.id])
+
+        self.assertEqual(2, self.mock_server_get.call_count)
+        self.mock_flavor_list.assert_called_once_with(
+            helpers.IsHttpRequest())
+        self.mock_servers_update_addresses.assert_called_once_with(
+            helpers.IsHttpRequest(), servers)
+        self.mock_tenant_absolute_limits.assert_called_once_with(
+            helpers.IsHttpRequest(), reserved=True)
+
+    @helpers.create_mocks({api.nova: ("server_get",
+                                      "flavor_get",
+                                      "is_feature_available",
+                                      "tenant_absolute_limits"),
+                           api.network: ('servers_update_addresses',)})
+    def test_rows_update_instance_deleted(self):
+        server = self.servers.first()
+
+        self.mock_is_feature_available.return_value = True
+        self.mock_server_get.side_effect = nova_exceptions.NotFound(404)
+        self.mock_tenant_absolute_limits.return_value = self.limits['absolute']
+
+        params = {'action': 'rows_update',
+                  'table': 'instances',
+                  'obj_id': server.id,
+                  }
+        res = self.client.get('?'.join((INDEX_URL, urlencode(params))),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        data = json.loads(res.content)
+        self.assertEqual({}, data['rows'])
+        self.assertEqual([server.id], data['deleted'])
+
+        self.mock_server_get.assert_called_once_with(helpers.IsHttpRequest(),
+                                                     server.id)
+        self.mock_flavor_get.assert_not_called()
+        self.mock_servers_update_addresses.assert_not_called()
+
 
 class ConsoleManagerTests(helpers.ResetImageAPIVersionMixin, helpers.TestCase):
 
@@ -3393,3 +3488,65 @@ class ConsoleManagerTests(helpers.ResetImageAPIVersionMixin, helpers.TestCase):
                                                     device_id=server.id)
         self.mock_interface_detach.assert_called_once_with(
             helpers.IsHttpRequest(), server.id, port.id)
+
+
+class _CountingVolume(object):
+    reads = 0
+
+    def __init__(self, volume_id, server_ids):
+        self.id = volume_id
+        self._attachments = [
+            {'id': volume_id, 'server_id': server_id,
+             'device': '/dev/vd%s' % chr(ord('a') + i)}
+            for i, server_id in enumerate(server_ids)]
+
+    @property
+    def attachments(self):
+        _CountingVolume.reads += 1
+        return self._attachments
+
+
+class InstanceUtilsTests(helpers.TestCase):
+
+    def _lookup_boot_volumes(self, num_instances, num_volumes):
+        instances = [mock.Mock(id='server-%d' % i)
+                     for i in range(num_instances)]
+        volume_dict = {}
+        for i in range(num_volumes):
+            volume_id = 'volume-%d' % i
+            server_id = 'server-%d' % (i % num_instances)
+            volume_dict[volume_id] = _CountingVolume(volume_id, [server_id])
+        _CountingVolume.reads = 0
+        attachments = utils.get_attachments_by_server(volume_dict.values())
+        boot_volumes = [
+            utils.get_boot_volume(instance, volume_dict, attachments)
+            for instance in instances]
+        return boot_volumes, _CountingVolume.reads
+
+    def test_get_boot_volume(self):
+        volume_dict = {
+            'data': _CountingVolume('data', ['other']),
+            'root': _CountingVolume('root', []),
+        }
+        volume_dict['data']._attachments[0].update(
+            server_id='server', device='/dev/vdb')
+        volume_dict['root']._attachments = [
+            {'id': 'root', 'server_id': 'server', 'device': '/dev/vda'}]
+        attachments = utils.get_attachments_by_server(volume_dict.values())
+
+        self.assertIs(volume_dict['root'], utils.get_boot_volume(
+            mock.Mock(id='server'), volume_dict, attachments))
+        self.assertIsNone(utils.get_boot_volume(
+            mock.Mock(id='unknown'), volume_dict, attachments))
+
+    def test_get_boot_volume_scales_linearly(self):
+        # Each volume's attachments are read once, however many instances
+        # are looked up, so the cost grows with instances + volumes rather
+        # than instances x volumes.
+        for num_instances, num_volumes in ((10, 100), (100, 1000),
+                                           (1000, 1000)):
+            boot_volumes, reads = self._lookup_boot_volumes(num_instances,
+                                                            num_volumes)
+            self.assertEqual(num_volumes, reads)
+            self.assertEqual(num_instances,
+                             len([v for v in boot_volumes if v]))
@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from collections import defaultdict
 from collections import namedtuple
 import logging
 from operator import itemgetter
@@ -276,3 +277,37 @@ def resolve_flavor(request, instance, flavors=None, **kwargs):
     else:
         instance.flavor['name'] = instance.flavor['original_name']
         return flavor_from_dict(instance.flavor)
+
+
+def get_attachments_by_server(volumes):
+    """Index the attachments of volumes by the ID of the attached server.
+
+    Building the index once makes looking up the volumes of each server of
+    a list independent of the number of volumes.
+
+    :param volumes: iterable of api.cinder.Volume
+    :return: dict mapping server IDs to lists of attachment dicts
+    """
+    attachments = defaultdict(list)
+    for volume in volumes:
+        for attachment in volume.attachments:
+            attachments[attachment['server_id']].append(attachment)
+    return attachments
+
+
+def get_boot_volume(instance, volume_dict, attachments_by_server):
+    """Returns the volume attached to an instance as its first device.
+
+    :param instance: api._nova.Server instance
+    :param volume_dict: dict of volumes by ID
+    :param attachments_by_server: index built by get_attachments_by_server
+    :return: api.cinder.Volume or None if no volume is attached
+    """
+    attachments = attachments_by_server.get(instance.id)
+    # While instance from volume is being created,
+    # it does not have volumes
+    if not attachments:
+        return None
+    # Getting the volume attached as the first device name (eg '/dev/sda')
+    attachment = min(attachments, key=itemgetter('device'))
+    return volume_dict[attachment['id']]
@@ -56,6 +56,85 @@ class NetworkTopologyTests(test.TestCase):
     def test_json_view_console_disabled(self):
         self._test_json_view(with_console=False)
 
+    @django.test.utils.override_settings(
+        OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
+    @test.create_mocks({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'port_list')})
+    def test_json_view_port_list_error(self):
+        self.mock_server_list.return_value = [self.servers.list(), False]
+        tenant_networks = [net for net in self.networks.list()
+                           if not net['is_router_external']]
+        self.mock_network_list_for_tenant.return_value = tenant_networks
+        self.mock_port_list.side_effect = self.exceptions.neutron
+
+        res = self.client.get(JSON_URL)
+
+        data = jsonutils.loads(res.content)
+        self.assertEqual([], data['ports'])
+        self.assertEqual([server.id for server in self.servers.list()],
+                         [server['id'] for server in data['servers']])
+        self.assertEqual([net.id for net in tenant_networks],
+                         [net['id'] for net in data['networks']])
+        self.mock_port_list.assert_called_once_with(test.IsHttpRequest())
+
+    @django.test.utils.override_settings(
+        OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
+    @test.create_mocks({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'port_list')})
+    def test_json_view_delta(self):
+        servers = self.servers.list()
+        self.mock_server_list.return_value = [servers, False]
+        self.mock_network_list_for_tenant.return_value = [
+            net for net in self.networks.list()
+            if not net['is_router_external']]
+        self.mock_port_list.return_value = self.ports.list()
+
+        full = jsonutils.loads(self.client.get(JSON_URL).content)
+        self.assertFalse(full['delta'])
+        self.assertEqual(len(servers), len(full['fingerprints']['servers']))
+
+        # Nothing changed since the version of the client.
+        res = self.client.get(JSON_URL, {'version': full['version']})
+        data = jsonutils.loads(res.content)
+        self.assertTrue(data['delta'])
+        self.assertEqual(full['version'], data['version'])
+        for kind in ('servers', 'networks', 'ports', 'routers'):
+            self.assertEqual([], data[kind])
+        self.assertEqual(full['fingerprints'], data['fingerprints'])
+
+        # Only the changed server is sent.
+        servers[0].name = 'renamed'
+        res = self.client.get(JSON_URL, {'version': full['version']})
+        data = jsonutils.loads(res.content)
+        self.assertTrue(data['delta'])
+        self.assertNotEqual(full['version'], data['version'])
+        self.assertEqual(['renamed'],
+                         [server['name'] for server in data['servers']])
+        self.assertEqual([], data['networks'])
+        self.assertEqual([], data['ports'])
+        self.assertEqual(full['fingerprints']['servers'][1:],
+                         data['fingerprints']['servers'][1:])
+
+        # An unknown version gets all the resources.
+        res = self.client.get(JSON_URL, {'version': 'unknown'})
+        data = jsonutils.loads(res.content)
+        self.assertFalse(data['delta'])
+        self.assertEqual(len(servers), len(data['servers']))
+
+    @django.test.utils.override_settings(
+        NETWORK_TOPOLOGY_DELTA={'enabled': False})
+    @test.create_mocks({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'network_list',
+                                      'router_list',
+                                      'port_list')})
+    def test_json_view_delta_disabled(self):
+        data = self._test_json_view()
+        self.assertNotIn('version', data)
+        self.assertNotIn('fingerprints', data)
+
     def _test_json_view(self, router_enable=True, with_console=True):
         self.mock_server_list.return_value = [self.servers.list(), False]
 
@@ -183,6 +262,7 @@ class NetworkTopologyTests(test.TestCase):
                 test.IsHttpRequest(), **{'router:external': True})
         self.mock_port_list.assert_called_once_with(
             test.IsHttpRequest())
+        return data
 
 
 class NetworkTopologyCreateTests(test.TestCase):
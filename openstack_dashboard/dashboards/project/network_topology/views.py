@@ -16,9 +16,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import json
+import logging
 
 from django.conf import settings
+from django.core.cache import caches
 from django.http import HttpResponse
 from django.urls import reverse
 from django.urls import reverse_lazy
@@ -74,8 +77,11 @@ from openstack_dashboard.dashboards.project.routers.tables import \
 from openstack_dashboard.dashboards.project.routers import\
     views as r_views
 from openstack_dashboard import policy
+from openstack_dashboard.utils import futurist_utils
 from openstack_dashboard.utils import settings as setting_utils
 
+LOG = logging.getLogger(__name__)
+
 # List of known server statuses that wont connect to the console
 console_invalid_status = {
     'shutoff', 'suspended', 'resize', 'verify_resize',
@@ -201,43 +207,77 @@ class NetworkTopologyView(tabs.TabView):
 
 
 class JSONView(View):
+    """Returns the resources drawn by the network topology as JSON.
+
+    The servers, networks, ports and routers are retrieved in parallel and
+    joined with dicts keyed by network and device IDs.
+
+    When ``NETWORK_TOPOLOGY_DELTA`` is enabled, the response carries a
+    ``version`` and the ``fingerprints`` of the resources. A client passing
+    that version back in the ``version`` query parameter only receives the
+    resources which are not part of it, with ``delta`` set, and rebuilds
+    the lists from the fingerprints.
+    """
     trans = TranslationHelper()
+    resource_types = ('servers', 'networks', 'ports', 'routers')
 
     @property
     def is_router_enabled(self):
         return setting_utils.get_dict_config('OPENSTACK_NEUTRON_NETWORK',
                                              'enable_router')
 
-    def add_resource_url(self, view, resources):
-        tenant_id = self.request.user.tenant_id
-        for resource in resources:
-            if (resource.get('tenant_id') and
-                    tenant_id != resource.get('tenant_id')):
-                continue
-            resource['url'] = reverse(view, None, [str(resource['id'])])
-
-    def _check_router_external_port(self, ports, router_id, network_id):
-        for port in ports:
-            if (port['network_id'] == network_id and
-                    port['device_id'] == router_id):
-                return True
-        return False
-
-    def _get_servers(self, request):
-        # Get nova data
+    def _call(self, func, *args, **kwargs):
+        # A resource which cannot be retrieved is not drawn rather than
+        # failing the whole topology.
         try:
-            servers, more = api.nova.server_list(request)
+            return func(*args, **kwargs)
         except Exception:
-            servers = []
+            return []
+
+    def _list_servers(self, request):
+        servers = self._call(api.nova.server_list, request)
+        return servers[0] if servers else []
+
+    def _list_networks(self, request):
+        # if we didn't specify tenant_id, all networks shown as admin user.
+        # so it is need to specify the networks. However there is no need to
+        # specify tenant_id for subnet. The subnet which belongs to the public
+        # network is needed to draw subnet information on public network.
+        # NOTE(amotoki):
+        # To support auto allocated network in the network topology view,
+        # we need to handle the auto allocated network which haven't been
+        # created yet. The current network topology logic cannot not handle
+        # fake network ID properly, so we temporarily exclude
+        # pre-auto-allocated-network from the network topology view.
+        # It would be nice if someone is interested in supporting it.
+        return self._call(api.neutron.network_list_for_tenant,
+                          request, request.user.tenant_id,
+                          include_pre_auto_allocate=False)
+
+    def _list_public_networks(self, request):
+        return self._call(api.neutron.network_list, request,
+                          **{'router:external': True})
+
+    def _list_routers(self, request):
+        return self._call(api.neutron.router_list, request,
+                          tenant_id=request.user.tenant_id)
+
+    def _list_ports(self, request):
+        return self._call(api.neutron.port_list, request)
+
+    def _get_servers(self, servers):
         data = []
         console_type = settings.CONSOLE_TYPE
         # lowercase of the keys will be used at the end of the console URL.
         for server in servers:
-            server_data = {'name': server.name,
-                           'status': self.trans.instance[server.status],
-                           'original_status': server.status,
-                           'task': getattr(server, 'OS-EXT-STS:task_state'),
-                           'id': server.id}
+            server_data = {
+                'name': server.name,
+                'status': self.trans.instance[server.status],
+                'original_status': server.status,
+                'task': getattr(server, 'OS-EXT-STS:task_state'),
+                'id': server.id,
+                'url': reverse('horizon:project:instances:detail',
+                               args=[str(server.id)])}
             # Avoid doing extra calls for console if the server is in
             # a invalid status for console connection
             if server.status.lower() not in console_invalid_status:
@@ -245,29 +285,17 @@ class JSONView(View):
                     server_data['console'] = 'auto_console'
 
             data.append(server_data)
-        self.add_resource_url('horizon:project:instances:detail', data)
         return data
 
-    def _get_networks(self, request):
-        # Get neutron data
-        # if we didn't specify tenant_id, all networks shown as admin user.
-        # so it is need to specify the networks. However there is no need to
-        # specify tenant_id for subnet. The subnet which belongs to the public
-        # network is needed to draw subnet information on public network.
-        try:
-            # NOTE(amotoki):
-            # To support auto allocated network in the network topology view,
-            # we need to handle the auto allocated network which haven't been
-            # created yet. The current network topology logic cannot not handle
-            # fake network ID properly, so we temporarily exclude
-            # pre-auto-allocated-network from the network topology view.
-            # It would be nice if someone is interested in supporting it.
-            neutron_networks = api.neutron.network_list_for_tenant(
-                request,
-                request.user.tenant_id,
-                include_pre_auto_allocate=False)
-        except Exception:
-            neutron_networks = []
+    def _get_subnets(self, network):
+        return [{'id': subnet.id,
+                 'cidr': subnet.cidr,
+                 'url': reverse('horizon:project:networks:subnets:detail',
+                                args=[str(subnet.id)])}
+                for subnet in network.subnets]
+
+    def _get_networks(self, request, neutron_networks,
+                      neutron_public_networks):
         networks = []
         for network in neutron_networks:
             allow_delete_subnet = policy.check(
@@ -276,99 +304,72 @@ class JSONView(View):
                 target={'network:tenant_id': getattr(network,
                                                      'tenant_id', None)}
             )
-            obj = {'name': network.name_or_id,
-                   'id': network.id,
-                   'subnets': [{'id': subnet.id,
-                                'cidr': subnet.cidr}
-                               for subnet in network.subnets],
-                   'status': self.trans.network[network.status],
-                   'allow_delete_subnet': allow_delete_subnet,
-                   'original_status': network.status,
-                   'router:external': network['is_router_external']}
-            self.add_resource_url('horizon:project:networks:subnets:detail',
-                                  obj['subnets'])
-            networks.append(obj)
+            networks.append({
+                'name': network.name_or_id,
+                'id': network.id,
+                'subnets': self._get_subnets(network),
+                'status': self.trans.network[network.status],
+                'allow_delete_subnet': allow_delete_subnet,
+                'original_status': network.status,
+                'router:external': network['is_router_external'],
+                'url': reverse('horizon:project:networks:detail',
+                               args=[str(network.id)])})
 
         # Add public networks to the networks list
-        if self.is_router_enabled:
+        my_network_ids = {net['id'] for net in networks}
+        for publicnet in neutron_public_networks:
+            if publicnet.id in my_network_ids:
+                continue
             try:
-                neutron_public_networks = api.neutron.network_list(
-                    request,
-                    **{'router:external': True})
+                subnets = self._get_subnets(publicnet)
             except Exception:
-                neutron_public_networks = []
-            my_network_ids = [net['id'] for net in networks]
-            for publicnet in neutron_public_networks:
-                if publicnet.id in my_network_ids:
-                    continue
-                try:
-                    subnets = [{'id': subnet.id,
-                                'cidr': subnet.cidr}
-                               for subnet in publicnet.subnets]
-                    self.add_resource_url(
-                        'horizon:project:networks:subnets:detail', subnets)
-                except Exception:
-                    subnets = []
-                networks.append({
-                    'name': publicnet.name_or_id,
-                    'id': publicnet.id,
-                    'subnets': subnets,
-                    'status': self.trans.network[publicnet.status],
-                    'original_status': publicnet.status,
-                    'router:external': publicnet['is_router_external']})
-
-        self.add_resource_url('horizon:project:networks:detail',
-                              networks)
+                subnets = []
+            networks.append({
+                'name': publicnet.name_or_id,
+                'id': publicnet.id,
+                'subnets': subnets,
+                'status': self.trans.network[publicnet.status],
+                'original_status': publicnet.status,
+                'router:external': publicnet['is_router_external'],
+                'url': reverse('horizon:project:networks:detail',
+                               args=[str(publicnet.id)])})
 
         return sorted(networks,
                       key=lambda x: x.get('router:external'),
                       reverse=True)
 
-    def _get_routers(self, request):
-        if not self.is_router_enabled:
-            return []
-        try:
-            neutron_routers = api.neutron.router_list(
-                request,
-                tenant_id=request.user.tenant_id)
-        except Exception:
-            neutron_routers = []
-
-        routers = [{'id': router.id,
-                    'name': router.name_or_id,
-                    'status': self.trans.router[router.status],
-                    'original_status': router.status,
-                    'external_gateway_info': router.external_gateway_info}
-                   for router in neutron_routers]
-        self.add_resource_url('horizon:project:routers:detail', routers)
-        return routers
-
-    def _get_ports(self, request, networks):
-        try:
-            neutron_ports = api.neutron.port_list(request)
-        except Exception:
-            neutron_ports = []
-
+    def _get_routers(self, neutron_routers):
+        return [{'id': router.id,
+                 'name': router.name_or_id,
+                 'status': self.trans.router[router.status],
+                 'original_status': router.status,
+                 'external_gateway_info': router.external_gateway_info,
+                 'url': reverse('horizon:project:routers:detail',
+                                args=[str(router.id)])}
+                for router in neutron_routers]
+
+    def _get_ports(self, neutron_ports, networks):
         # we should filter out ports connected to non tenant networks
         # which they have no visibility to
-        tenant_network_ids = [network['id'] for network in networks]
-        ports = [{'id': port.id,
-                  'network_id': port.network_id,
-                  'device_id': port.device_id,
-                  'fixed_ips': port.fixed_ips,
-                  'device_owner': port.device_owner,
-                  'status': self.trans.port[port.status],
-                  'original_status': port.status}
-                 for port in neutron_ports
-                 if (port.device_owner != 'network:router_ha_interface' and
-                     port.network_id in tenant_network_ids)]
-        self.add_resource_url('horizon:project:networks:ports:detail',
-                              ports)
-        return ports
+        tenant_network_ids = {network['id'] for network in networks}
+        return [{'id': port.id,
+                 'network_id': port.network_id,
+                 'device_id': port.device_id,
+                 'fixed_ips': port.fixed_ips,
+                 'device_owner': port.device_owner,
+                 'status': self.trans.port[port.status],
+                 'original_status': port.status,
+                 'url': reverse('horizon:project:networks:ports:detail',
+                                args=[str(port.id)])}
+                for port in neutron_ports
+                if (port.device_owner != 'network:router_ha_interface' and
+                    port.network_id in tenant_network_ids)]
 
     def _prepare_gateway_ports(self, routers, ports):
         # user can't see port on external network. so we are
         # adding fake port based on router information
+        router_ports = {(port['device_id'], port['network_id'])
+                        for port in ports}
         for router in routers:
             external_gateway_info = router.get('external_gateway_info')
             if not external_gateway_info:
@@ -377,9 +378,7 @@ class JSONView(View):
                 'network_id')
             if not external_network:
                 continue
-            if self._check_router_external_port(ports,
-                                                router['id'],
-                                                external_network):
+            if (router['id'], external_network) in router_ports:
                 continue
             fake_port = {'id': 'gateway%s' % external_network,
                          'network_id': external_network,
@@ -388,12 +387,82 @@ class JSONView(View):
             ports.append(fake_port)
 
     def get(self, request, *args, **kwargs):
-        networks = self._get_networks(request)
-        data = {'servers': self._get_servers(request),
+        calls = [(self._list_servers, [request]),
+                 (self._list_networks, [request]),
+                 (self._list_ports, [request])]
+        if self.is_router_enabled:
+            calls += [(self._list_public_networks, [request]),
+                      (self._list_routers, [request])]
+        results = futurist_utils.call_functions_parallel(*calls)
+        servers, neutron_networks, neutron_ports = results[:3]
+        neutron_public_networks, neutron_routers = results[3:] or ([], [])
+
+        networks = self._get_networks(request, neutron_networks,
+                                      neutron_public_networks)
+        data = {'servers': self._get_servers(servers),
                 'networks': networks,
-                'ports': self._get_ports(request, networks),
-                'routers': self._get_routers(request)}
+                'ports': self._get_ports(neutron_ports, networks),
+                'routers': self._get_routers(neutron_routers)}
         self._prepare_gateway_ports(data['routers'], data['ports'])
-        json_string = json.dumps(data, cls=LazyTranslationEncoder,
-                                 ensure_ascii=False)
-        return HttpResponse(json_string, content_type='text/json')
+        return HttpResponse(self._dumps(request, data),
+                            content_type='text/json')
+
+    def _get_version_cache(self):
+        return caches[setting_utils.get_dict_config('NETWORK_TOPOLOGY_DELTA',
+                                                    'cache_alias')]
+
+    def _get_version(self, version):
+        if not version:
+            return None
+        try:
+            return self._get_version_cache().get(
+                'network_topology:%s' % version)
+        except Exception:
+            LOG.warning("Unable to read the network topology version %s "
+                        "from the cache.", version, exc_info=True)
+            return None
+
+    def _set_version(self, version, fingerprints):
+        timeout = setting_utils.get_dict_config('NETWORK_TOPOLOGY_DELTA',
+                                                'timeout')
+        try:
+            self._get_version_cache().set('network_topology:%s' % version,
+                                          fingerprints, timeout)
+        except Exception:
+            LOG.warning("Unable to store the network topology version %s "
+                        "in the cache.", version, exc_info=True)
+
+    def _dumps(self, request, data):
+        # Each resource is encoded once, and its encoding is both hashed to
+        # find the resources a client already has and copied to the body.
+        encoded = {kind: [json.dumps(resource, cls=LazyTranslationEncoder,
+                                     ensure_ascii=False)
+                          for resource in data[kind]]
+                   for kind in self.resource_types}
+        extra = {}
+        if setting_utils.get_dict_config('NETWORK_TOPOLOGY_DELTA',
+                                         'enabled'):
+            fingerprints = {
+                kind: [hashlib.sha256(resource.encode('utf-8')).hexdigest()[:16]
+                       for resource in encoded[kind]]
+                for kind in self.resource_types}
+            version = hashlib.sha256(json.dumps(
+                fingerprints, sort_keys=True).encode('utf-8')).hexdigest()
+            previous = self._get_version(request.GET.get('version'))
+            if previous is not None:
+                for kind in self.resource_types:
+                    known = set(previous.get(kind, ()))
+                    encoded[kind] = [
+                        resource for resource, fingerprint
+                        in zip(encoded[kind], fingerprints[kind])
+                        if fingerprint not in known]
+            self._set_version(version, fingerprints)
+            extra = {'version': version,
+                     'delta': previous is not None,
+                     'fingerprints': fingerprints}
+
+        parts = ['"%s": [%s]' % (kind, ', '.join(encoded[kind]))
+                 for kind in self.resource_types]
+        parts += ['"%s": %s' % (key, json.dumps(value))
+                  for key, value in extra.items()]
+        return '{%s}' % ', '.join(parts)
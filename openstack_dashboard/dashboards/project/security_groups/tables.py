@@ -138,6 +138,9 @@ class SecurityGroupsTable(tables.DataTable):
         verbose_name = _("Security Groups")
         table_actions = (CreateGroup, DeleteGroup, SecurityGroupsFilterAction)
         row_actions = (ManageRules, EditGroup, DeleteGroup)
+        # The rules of the security groups, which are most of the listing,
+        # are not displayed.
+        api_fields = ('tenant_id', 'updated_at')
 
 
 class CreateRule(policy.PolicyTargetMixin, tables.LinkAction):
@@ -32,6 +32,8 @@ from openstack_dashboard.usage import quotas
 
 
 INDEX_URL = reverse('horizon:project:security_groups:index')
+INDEX_FIELDS = ('description', 'id', 'name', 'shared', 'tenant_id',
+                'updated_at')
 SG_CREATE_URL = reverse('horizon:project:security_groups:create')
 
 SG_VIEW_PATH = 'horizon:project:security_groups:%s'
@@ -90,7 +92,7 @@ class SecurityGroupsViewTests(test.TestCase):
                  for i in range(len(sec_groups_from_ctx) - 1)]))
 
         self.mock_security_group_list.assert_called_once_with(
-            test.IsHttpRequest())
+            test.IsHttpRequest(), fields=INDEX_FIELDS)
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_tenant_quota_usages, 2,
             mock.call(test.IsHttpRequest(), targets=('security_group', )))
@@ -125,7 +127,7 @@ class SecurityGroupsViewTests(test.TestCase):
         self.assertEqual(url, create_action.url)
 
         self.mock_security_group_list.assert_called_once_with(
-            test.IsHttpRequest())
+            test.IsHttpRequest(), fields=INDEX_FIELDS)
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_tenant_quota_usages, 3,
             mock.call(test.IsHttpRequest(), targets=('security_group', )))
@@ -152,7 +154,7 @@ class SecurityGroupsViewTests(test.TestCase):
                       'The create button should be disabled')
 
         self.mock_security_group_list.assert_called_once_with(
-            test.IsHttpRequest())
+            test.IsHttpRequest(), fields=INDEX_FIELDS)
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_tenant_quota_usages, 3,
             mock.call(test.IsHttpRequest(), targets=('security_group', )))
@@ -180,8 +180,13 @@ class IndexView(tables.DataTableView):
     page_title = _("Security Groups")
 
     def get_data(self):
+        params = {}
+        fields = self.get_table().get_api_fields()
+        if fields:
+            params['fields'] = fields
         try:
-            security_groups = api.neutron.security_group_list(self.request)
+            security_groups = api.neutron.security_group_list(self.request,
+                                                              **params)
         except neutron_exc.ConnectionFailed:
             security_groups = []
             exceptions.handle(self.request)
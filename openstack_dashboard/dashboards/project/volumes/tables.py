@@ -33,6 +33,7 @@ from openstack_dashboard import api
 from openstack_dashboard.api import cinder
 from openstack_dashboard import policy
 from openstack_dashboard.usage import quotas
+from openstack_dashboard.utils import futurist_utils
 
 DELETABLE_STATES = (
     "available",
@@ -370,15 +371,44 @@ class UpdateRow(tables.Row):
 
     def get_data(self, request, volume_id):
         volume = cinder.volume_get(request, volume_id)
-        if volume and getattr(volume, 'group_id', None):
+        self._load_groups(request, [volume])
+        return volume
+
+    def get_data_batch(self, request, volume_ids):
+        def get_volume(volume_id):
             try:
-                volume.group = cinder.group_get(request, volume.group_id)
+                return cinder.volume_get(request, volume_id), None
             except Exception:
-                exceptions.handle(request, _("Unable to retrieve group."))
+                return None, exceptions.handle(request, ignore=True)
+
+        # NOTE: Cinder does not accept a list of IDs as a filter of the
+        # volume list, so the volumes are fetched by a few threads instead.
+        results = futurist_utils.call_for_each_parallel(get_volume,
+                                                        volume_ids)
+        data = {}
+        for volume_id, (volume, error) in zip(volume_ids, results):
+            if volume is not None:
+                data[volume_id] = volume
+            elif error.status_code != 404:
+                data[volume_id] = None
+        self._load_groups(request, [volume for volume in data.values()
+                                    if volume])
+        return data
+
+    def _load_groups(self, request, volumes):
+        groups = {}
+        for volume in volumes:
+            group_id = getattr(volume, 'group_id', None)
+            if not group_id:
                 volume.group = None
-        else:
-            volume.group = None
-        return volume
+                continue
+            if group_id not in groups:
+                try:
+                    groups[group_id] = cinder.group_get(request, group_id)
+                except Exception:
+                    exceptions.handle(request, _("Unable to retrieve group."))
+                    groups[group_id] = None
+            volume.group = groups[group_id]
 
 
 def get_size(volume):
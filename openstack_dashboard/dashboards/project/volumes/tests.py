@@ -1150,6 +1150,35 @@ class VolumeViewTests(test.ResetImageAPIVersionMixin, test.TestCase):
         self.assertNotContains(res, 'Delete Volume')
         self.assertNotContains(res, 'delete')
 
+    @mock.patch.object(quotas, 'tenant_quota_usages')
+    @mock.patch.object(cinder, 'tenant_absolute_limits')
+    @mock.patch.object(cinder, 'group_get')
+    @mock.patch.object(cinder, 'volume_get')
+    def test_rows_update_volumes_in_group(self, mock_get, mock_group_get,
+                                          mock_limits, mock_quotas):
+        volumes = self.cinder_group_volumes.list()
+        volumes_by_id = dict((volume.id, volume) for volume in volumes)
+        group = self.cinder_groups.first()
+
+        mock_get.side_effect = \
+            lambda request, volume_id: volumes_by_id[volume_id]
+        mock_group_get.return_value = group
+        mock_limits.return_value = self.cinder_limits['absolute']
+        mock_quotas.return_value = self.cinder_quota_usages.first()
+
+        params = [('action', 'rows_update'), ('table', 'volumes')]
+        params += [('obj_id', volume.id) for volume in volumes]
+        res = self.client.get(INDEX_URL + '?' + parse.urlencode(params),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertEqual(res.status_code, 200)
+        rows = res.json()['rows']
+        for volume in volumes:
+            self.assertIn(volume.name, rows[volume.id])
+            self.assertEqual(group, volume.group)
+        self.assertEqual(2, mock_get.call_count)
+        mock_group_get.assert_called_once_with(test.IsHttpRequest(), group.id)
+
     @mock.patch.object(api.nova, 'server_list')
     @mock.patch.object(cinder, 'volume_get')
     @override_settings(OPENSTACK_HYPERVISOR_FEATURES={'can_set_mount_point':
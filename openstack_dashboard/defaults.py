@@ -215,6 +215,14 @@ FILTER_DATA_FIRST = {
 # image form. If set to 'off', there will be no file form field on the create
 # image form. See documentation for deployment considerations.
 HORIZON_IMAGES_UPLOAD_MODE = 'legacy'
+# Threads uploading the image data posted in 'legacy' mode to Glance, and
+# the cache recording the progress of the uploads.
+HORIZON_IMAGES_UPLOAD_POOL = {
+    'max_workers': 4,
+    'max_backlog': 16,
+    'cache_alias': 'default',
+    'timeout': 86400,
+}
 # Allow a location to be set when creating or updating Glance images.
 # If using Glance V2, this value should be False unless the Glance
 # configuration and policies allow setting locations.
@@ -268,12 +276,39 @@ OPENRC_CUSTOM_TEMPLATE = 'project/api_access/openrc.sh.template'
 OPENSTACK_CLOUDS_YAML_CUSTOM_TEMPLATE = ('project/api_access/'
                                          'clouds.yaml.template')
 
+# The network topology can send only the resources changed since the version
+# a client already has. The versions are kept for 'timeout' seconds in the
+# cache named 'cache_alias'.
+NETWORK_TOPOLOGY_DELTA = {
+    'enabled': True,
+    'cache_alias': 'default',
+    'timeout': 600,
+}
+
 # The default date range in the Overview panel meters - either <today> minus N
 # days (if the value is integer N), or from the beginning of the current month
 # until today (if set to None). This setting should be used to limit the amount
 # of data fetched by default when rendering the Overview panel.
 OVERVIEW_DAYS_RANGE = 1
 
+# The thread pool shared by all requests of a process to call OpenStack APIs
+# in parallel. Once 'max_backlog' calls are waiting for a worker, and for the
+# calls which have not started after 'timeout' seconds (None means no
+# deadline), the calls are made by the request thread instead.
+PARALLEL_CALLS_POOL = {
+    'max_workers': 10,
+    'max_backlog': 50,
+    'timeout': None,
+}
+
+# Cache the resource providers of the placement service of a region, with
+# their inventories and usages, for all the users of the region.
+PLACEMENT_PROVIDERS_CACHE = {
+    'enabled': False,
+    'cache_alias': 'default',
+    'timeout': 60,
+}
+
 # Projects and users can have extra attributes as defined by keystone v3.
 # Horizon has the ability to display these extra attributes via this setting.
 # If you'd like to display extra data in the project or user tables, set the
@@ -320,6 +355,13 @@ SHOW_OPENSTACK_CLOUDS_YAML = True
 
 # The size of chunk in bytes for downloading objects from Swift
 SWIFT_FILE_TRANSFER_CHUNK_SIZE = 512 * 1024
+# Upload the objects larger than segment_size bytes sent to the dashboard
+# as Static Large Objects, whose segments are uploaded in parallel.
+SWIFT_SEGMENTED_UPLOAD = {
+    'enabled': False,
+    'segment_size': 100 * 1024 * 1024,
+    'max_workers': 4,
+}
 
 # Mapping from actual storage policy name to user friendly
 # name to be rendered.
@@ -364,6 +406,14 @@ OPENSTACK_SSL_NO_VERIFY = False
 # The CA certificate to use to verify SSL connections
 # Example: OPENSTACK_SSL_CACERT = '/path/to/cacert.pem'
 OPENSTACK_SSL_CACERT = None
+# Keep the connections to each OpenStack endpoint open in a session shared
+# by all requests of a process. 'pool_maxsize' is the number of connections
+# kept per endpoint, 'tcp_keepalive' enables TCP keep-alive probes on them.
+OPENSTACK_HTTP_SESSION_POOL = {
+    'enabled': False,
+    'pool_maxsize': 10,
+    'tcp_keepalive': True,
+}
 # The OPENSTACK_CINDER_FEATURES settings can be used to enable optional
 # services provided by cinder that is not exposed by its extension API.
 OPENSTACK_CINDER_FEATURES = {
@@ -400,6 +450,10 @@ OPENSTACK_KEYSTONE_MULTIDOMAIN_SUPPORT = False
 # federation protocol attributes to Identity API attributes.
 # This extension requires v3.0+ of the Identity API.
 OPENSTACK_KEYSTONE_FEDERATION_MANAGEMENT = False
+# Set this to True to only load the current members and groups of a project
+# in the project members and groups steps, and to search the users and groups
+# to add by name. This is useful when the domains have many users or groups.
+OPENSTACK_KEYSTONE_LAZY_MEMBERSHIP = False
 # The OPENSTACK_NEUTRON_NETWORK settings can be used to enable optional
 # services provided by neutron. Options currently available are load
 # balancer service, security groups, quotas, VPN service.
@@ -444,6 +498,11 @@ OPENSTACK_NEUTRON_NETWORK = {
     # },
     'extra_provider_types': {},
 
+    # The maximum length of the URIs of Neutron list requests. Filters with
+    # many values, such as the ports of many instances, are split into chunks
+    # requested in parallel so that each URI fits in this length.
+    'max_uri_length': 8192,
+
     # Set which VNIC types are supported for port binding. Only the VNIC
     # types in this list will be available to choose from when creating a
     # port.
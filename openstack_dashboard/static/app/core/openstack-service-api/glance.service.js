@@ -42,6 +42,7 @@
       reactivateImage: reactivateImage,
       updateImage: updateImage,
       deleteImage: deleteImage,
+      getImageUpload: getImageUpload,
       getImageProps: getImageProps,
       editImageProps: editImageProps,
       getImages: getImages,
@@ -272,6 +273,19 @@
       });
     }
 
+    /**
+     * @name getImageUpload
+     * @description
+     * Get the progress of an upload of the data of an image through Horizon.
+     * The request fails when no upload of the image data is known, so no
+     * error is shown to let callers poll it.
+     * @param {string} id Specifies the id of the image.
+     * @returns {Object} The result of the API call
+     */
+    function getImageUpload(id) {
+      return apiService.get('/api/glance/images/' + id + '/upload/');
+    }
+
     /**
      * @name getImageProps
      * @description
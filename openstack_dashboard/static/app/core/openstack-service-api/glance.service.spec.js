@@ -76,6 +76,14 @@
           {name: '1', id: '1'}
         ]
       },
+      {
+        "func": "getImageUpload",
+        "method": "get",
+        "path": "/api/glance/images/42/upload/",
+        "testInput": [
+          42
+        ]
+      },
       {
         "func": "getImageProps",
         "method": "get",
@@ -44,11 +44,23 @@ horizon.networktopologyloader = {
    */
   update:function() {
     var self = this;
+    var url = angular.element('#networktopology').data('networktopology') + '?' + angular.element.now();
+    if (self.model !== null && self.model.version) {
+      // only request the resources changed since the current model
+      url += '&version=' + encodeURIComponent(self.model.version);
+    }
     angular.element.getJSON(
-      angular.element('#networktopology').data('networktopology') + '?' + angular.element.now(),
+      url,
       function(data) {
-        self.model = data;
-        $('#networktopology').trigger('change');
+        var changed = true;
+        if (data.delta && self.model !== null) {
+          changed = self.apply_delta(data);
+        } else {
+          self.model = data;
+        }
+        if (changed) {
+          $('#networktopology').trigger('change');
+        }
         self.update_timer = setTimeout(function(){
           self.update();
         }, self.reload_duration);
@@ -56,6 +68,43 @@ horizon.networktopologyloader = {
     );
   },
 
+  /**
+   * rebuilds the resource lists of the 'model' from a delta response, which
+   * only contains the resources that the model does not have yet and the
+   * fingerprints of all of them
+   *
+   * @param {Object} data delta response
+   *
+   * @return {Boolean} whether the model changed
+   */
+  apply_delta:function(data) {
+    var self = this;
+    var changed = false;
+    angular.forEach(['servers', 'networks', 'ports', 'routers'], function(type) {
+      var fingerprints = data.fingerprints[type];
+      if (data[type].length === 0 &&
+          angular.equals(fingerprints, self.model.fingerprints[type])) {
+        return;
+      }
+      var known = {};
+      angular.forEach(self.model.fingerprints[type], function(fingerprint, index) {
+        known[fingerprint] = self.model[type][index];
+      });
+      var added = 0;
+      self.model[type] = fingerprints.map(function(fingerprint) {
+        if ({}.hasOwnProperty.call(known, fingerprint)) {
+          return known[fingerprint];
+        }
+        added += 1;
+        return data[type][added - 1];
+      });
+      changed = true;
+    });
+    self.model.fingerprints = data.fingerprints;
+    self.model.version = data.version;
+    return changed;
+  },
+
   /**
    * stops the data update sequences
    */
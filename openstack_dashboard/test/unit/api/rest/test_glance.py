@@ -56,6 +56,26 @@ class ImagesRestTestCase(test.ResetImageAPIVersionMixin, test.RestAPITestCase):
         self.assertEqual(response.json, {"a": "1", "b": "2"})
         self.mock_image_get.assert_called_once_with(request, "1")
 
+    @test.create_mocks({api.glance: ['image_upload_status']})
+    def test_image_upload_get(self):
+        request = self.mock_rest_request()
+        self.mock_image_upload_status.return_value = {
+            'status': 'uploading', 'bytes_sent': 10, 'size': 100}
+
+        response = glance.ImageUpload().get(request, "1")
+        self.assertStatusCode(response, 200)
+        self.assertEqual({'status': 'uploading', 'bytes_sent': 10,
+                          'size': 100}, response.json)
+        self.mock_image_upload_status.assert_called_once_with(request, "1")
+
+    @test.create_mocks({api.glance: ['image_upload_status']})
+    def test_image_upload_get_unknown(self):
+        request = self.mock_rest_request()
+        self.mock_image_upload_status.return_value = None
+
+        response = glance.ImageUpload().get(request, "1")
+        self.assertStatusCode(response, 404)
+
     @test.create_mocks({api.glance: ['image_update_properties']})
     def test_image_edit_metadata(self):
         request = self.mock_rest_request(
@@ -16,6 +16,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from unittest import mock
+
 from horizon import exceptions
 
 from openstack_dashboard.api import base as api_base
@@ -150,6 +152,13 @@ class APIResourceWrapperTests(test.TestCase):
         with self.assertRaises(AttributeError):
             resource.baz
 
+    def test_dir_skips_inner_missing_attribute(self):
+        resource = APIResource.get_instance()
+        attrs = dir(resource)
+        self.assertIn('foo', attrs)
+        self.assertIn('to_dict', attrs)
+        self.assertNotIn('baz', attrs)
+
     def test_repr(self):
         resource = APIResource.get_instance()
         resource_str = resource.__repr__()
@@ -157,6 +166,32 @@ class APIResourceWrapperTests(test.TestCase):
         self.assertIn('bar', resource_str)
         self.assertNotIn('baz', resource_str)
 
+    def test_get_attribute_property_fallback(self):
+        class PropertyAPIResource(APIResource):
+            @property
+            def bar(self):
+                raise AttributeError('bar')
+
+        resource = PropertyAPIResource(APIResource.get_instance()._apiresource)
+        self.assertEqual('bar', resource.bar)
+
+    def test_set_attribute(self):
+        resource = APIResource.get_instance()
+        resource.foo = 'new foo'
+        self.assertEqual('new foo', resource.foo)
+        self.assertEqual('foo', resource._apiresource.foo)
+
+    def test_get_attribute_uses_descriptor(self):
+        self.assertIsInstance(APIResource.__dict__['foo'],
+                              api_base._ResourceAttribute)
+        resource = APIResource.get_instance()
+        # The proxied attributes are looked up like regular ones, without
+        # falling back to __getattr__.
+        with mock.patch.object(APIResource, '__getattr__',
+                               side_effect=AssertionError) as mock_getattr:
+            self.assertEqual(('foo', 'bar'), (resource.foo, resource.bar))
+        mock_getattr.assert_not_called()
+
 
 class APIDictWrapperTests(test.TestCase):
 
@@ -21,6 +21,7 @@ import cinderclient as cinder_client
 
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import http_session_pool
 
 
 class CinderApiTests(test.APIMockTestCase):
@@ -474,6 +475,22 @@ class CinderApiVersionTests(test.TestCase):
         client = api.cinder.cinderclient(self.request)
         self.assertIsInstance(client, cinder_client.v3.client.Client)
 
+    @override_settings(OPENSTACK_HTTP_SESSION_POOL={'enabled': True,
+                                                    'pool_maxsize': 10,
+                                                    'tcp_keepalive': True})
+    def test_client_with_http_session_pool(self):
+        http_session_pool._reset_sessions()
+        self.addCleanup(http_session_pool._reset_sessions)
+        client = api.cinder.cinderclient(self.request)
+
+        self.assertIsInstance(client, cinder_client.v3.client.Client)
+        self.assertEqual(self.request.user.token.id,
+                         client.client.session.get_token())
+        cinder_url = api.base.url_for(self.request, 'volumev3')
+        self.assertEqual(cinder_url, client.client.endpoint_override)
+        self.assertIs(http_session_pool.get_http_session(cinder_url),
+                      client.client.session.session)
+
     def test_get_v3_volume_attributes(self):
         # Get a v3 volume
         volume = self.cinder_volumes.get(name="v3_volume")
@@ -16,11 +16,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import io
 from unittest import mock
 
 from django.conf import settings
+from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.test.utils import override_settings
+import futurist
 
+from horizon import exceptions
 from openstack_dashboard import api
 from openstack_dashboard.api import base
 from openstack_dashboard.test import helpers as test
@@ -365,6 +369,131 @@ class GlanceApiTests(test.APIMockTestCase):
     def test_image_create_v2_external_upload(self):
         self._test_image_create_external_upload()
 
+    def _get_uploaded_file(self, contents):
+        return InMemoryUploadedFile(io.BytesIO(contents), 'data',
+                                    'image.raw', 'application/octet-stream',
+                                    len(contents), None)
+
+    @mock.patch.object(api.glance, '_get_upload_pool')
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_create_data_upload(self, mock_glanceclient,
+                                      mock_get_upload_pool):
+        expected_image = self.images.first()
+        contents = b'x' * 100
+        data = self._get_uploaded_file(contents)
+        uploaded = []
+
+        def upload(image_id, reader):
+            # Glance client reads the data in chunks.
+            for chunk in iter(lambda: reader.read(30), b''):
+                uploaded.append(chunk)
+                self.assertEqual(
+                    'uploading',
+                    api.glance.image_upload_status(self.request,
+                                                   image_id)['status'])
+
+        glanceclient = mock_glanceclient.return_value
+        glanceclient.images.create.return_value = expected_image
+        glanceclient.images.upload.side_effect = upload
+        mock_get_upload_pool.return_value = futurist.SynchronousExecutor()
+
+        with mock.patch.object(api.glance, 'UPLOAD_STATUS_INTERVAL', 0):
+            image = api.glance.image_create(self.request, data=data,
+                                            name='image')
+
+        self.assertEqual(expected_image.id, image.id)
+        self.assertEqual(contents, b''.join(uploaded))
+        # Django closes the uploaded file at the end of the request.
+        data.close()
+        self.assertEqual(
+            {'status': 'completed', 'bytes_sent': 100, 'size': 100},
+            api.glance.image_upload_status(self.request, expected_image.id))
+        glanceclient.images.create.assert_called_once_with(name='image')
+
+    @mock.patch.object(api.glance, '_get_upload_pool')
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_create_data_upload_rejected(self, mock_glanceclient,
+                                               mock_get_upload_pool):
+        expected_image = self.images.first()
+        glanceclient = mock_glanceclient.return_value
+        glanceclient.images.create.return_value = expected_image
+        pool = mock_get_upload_pool.return_value
+        pool.submit.side_effect = futurist.RejectedSubmission()
+
+        self.assertRaises(exceptions.NotAvailable,
+                          api.glance.image_create, self.request,
+                          data=self._get_uploaded_file(b'x'), name='image')
+
+        glanceclient.images.delete.assert_called_once_with(expected_image.id)
+        glanceclient.images.upload.assert_not_called()
+        self.assertEqual(
+            'failed',
+            api.glance.image_upload_status(self.request,
+                                           expected_image.id)['status'])
+
+    @mock.patch.object(api.glance, '_get_upload_status_cache')
+    @mock.patch.object(api.glance, '_get_upload_pool')
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_create_data_upload_cache_failure(
+            self, mock_glanceclient, mock_get_upload_pool,
+            mock_get_upload_status_cache):
+        expected_image = self.images.first()
+        contents = b'x' * 100
+        uploaded = []
+
+        def upload(image_id, reader):
+            for chunk in iter(lambda: reader.read(30), b''):
+                uploaded.append(chunk)
+
+        glanceclient = mock_glanceclient.return_value
+        glanceclient.images.create.return_value = expected_image
+        glanceclient.images.upload.side_effect = upload
+        mock_get_upload_pool.return_value = futurist.SynchronousExecutor()
+        cache = mock_get_upload_status_cache.return_value
+        cache.set.side_effect = ConnectionError()
+        cache.get.side_effect = ConnectionError()
+
+        with mock.patch.object(api.glance, 'UPLOAD_STATUS_INTERVAL', 0):
+            image = api.glance.image_create(
+                self.request, data=self._get_uploaded_file(contents),
+                name='image')
+
+        # The upload is not affected by the unavailable cache.
+        self.assertEqual(expected_image.id, image.id)
+        self.assertEqual(contents, b''.join(uploaded))
+        self.assertIsNone(api.glance.image_upload_status(self.request,
+                                                         expected_image.id))
+        glanceclient.images.delete.assert_not_called()
+
+    @mock.patch.object(api.glance, '_get_upload_status_cache')
+    @mock.patch.object(api.glance, '_get_upload_pool')
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_create_data_upload_rejected_cache_failure(
+            self, mock_glanceclient, mock_get_upload_pool,
+            mock_get_upload_status_cache):
+        expected_image = self.images.first()
+        glanceclient = mock_glanceclient.return_value
+        glanceclient.images.create.return_value = expected_image
+        mock_get_upload_pool.return_value.submit.side_effect = \
+            futurist.RejectedSubmission()
+        mock_get_upload_status_cache.return_value.set.side_effect = \
+            ConnectionError()
+
+        self.assertRaises(exceptions.NotAvailable,
+                          api.glance.image_create, self.request,
+                          data=self._get_uploaded_file(b'x'), name='image')
+
+        glanceclient.images.delete.assert_called_once_with(expected_image.id)
+
+    def test_image_upload_status_other_project(self):
+        api.glance._get_upload_status_cache().set(
+            'glance_upload:image-1',
+            {'status': 'uploading', 'bytes_sent': 1, 'size': 2,
+             'project_id': 'other-project'})
+
+        self.assertIsNone(api.glance.image_upload_status(self.request,
+                                                         'image-1'))
+
     def test_create_image_metadata_docker_v2(self):
         form_data = {
             'name': 'Docker image',
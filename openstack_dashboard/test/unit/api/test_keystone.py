@@ -20,9 +20,12 @@ from unittest import mock
 
 
 from django.test.utils import override_settings
+import futurist
+
 from openstack_dashboard import api
 from openstack_dashboard import policy
 from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import futurist_utils
 
 
 class RoleAPITests(test.APIMockTestCase):
@@ -57,6 +60,65 @@ class RoleAPITests(test.APIMockTestCase):
              for role in self.roles]
         )
 
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_update_project_roles(self, mock_keystoneclient):
+        manager = mock_keystoneclient.return_value.roles
+
+        def grant(role, user=None, project=None, group=None, domain=None):
+            if user == 'user-2':
+                raise self.exceptions.keystone
+        manager.grant.side_effect = grant
+
+        failures = api.keystone.update_project_roles(
+            self.request, 'project-1',
+            grants={('user-1', 'role-1'), ('user-2', 'role-1')},
+            revokes={('user-3', 'role-2')})
+
+        self.assertEqual(([('user-2', 'role-1')], []), failures)
+        manager.grant.assert_has_calls(
+            [mock.call('role-1', user=user_id, project='project-1',
+                       group=None, domain=None)
+             for user_id in ('user-1', 'user-2')], any_order=True)
+        self.assertEqual(2, manager.grant.call_count)
+        manager.revoke.assert_called_once_with(
+            'role-2', user='user-3', project='project-1', group=None,
+            domain=None)
+
+    @mock.patch.object(futurist_utils, '_get_pool')
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_update_project_roles_pool_saturated(self, mock_keystoneclient,
+                                                 mock_get_pool):
+        mock_get_pool.return_value.submit.side_effect = \
+            futurist.RejectedSubmission()
+        manager = mock_keystoneclient.return_value.roles
+        manager.revoke.side_effect = self.exceptions.keystone
+
+        failures = api.keystone.update_project_roles(
+            self.request, 'project-1',
+            grants={('user-1', 'role-1'), ('user-2', 'role-1')},
+            revokes={('user-3', 'role-2')})
+
+        # The assignments are applied by the calling thread.
+        self.assertEqual(([], [('user-3', 'role-2')]), failures)
+        self.assertEqual(2, manager.grant.call_count)
+        manager.revoke.assert_called_once_with(
+            'role-2', user='user-3', project='project-1', group=None,
+            domain=None)
+
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_update_project_roles_of_groups(self, mock_keystoneclient):
+        manager = mock_keystoneclient.return_value.roles
+
+        failures = api.keystone.update_project_roles(
+            self.request, 'project-1', revokes={('group-1', 'role-1')},
+            group=True)
+
+        self.assertEqual(([], []), failures)
+        manager.grant.assert_not_called()
+        manager.revoke.assert_called_once_with(
+            role='role-1', group='group-1', project='project-1',
+            domain=None)
+
     @mock.patch.object(api.keystone, 'keystoneclient')
     def test_get_default_role(self, mock_keystoneclient):
         keystoneclient = mock_keystoneclient.return_value
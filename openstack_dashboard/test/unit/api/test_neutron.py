@@ -22,6 +22,7 @@ from openstack.network.v2 import subnet_pool as sdk_subnet_pool
 from openstack.network.v2 import trunk as sdk_trunk
 from oslo_utils import uuidutils
 
+from django.core.cache import cache
 from django.test.utils import override_settings
 
 from openstack_dashboard import api
@@ -1180,6 +1181,25 @@ class NeutronApiTests(test.APIMockTestCase):
             self.assertIsInstance(p, api.neutron.Port)
         network_client.ports.assert_called_once_with()
 
+    @override_settings(MEMOIZED_SHARED_CACHE={'enabled': True})
+    @mock.patch.object(api.neutron, 'networkclient')
+    def test_port_list_not_shared(self, mock_networkclient):
+        cache.clear()
+        ports = self.api_ports_sdk
+        port = ports[0]
+
+        network_client = mock_networkclient.return_value
+        network_client.ports.return_value = ports
+
+        api.neutron.port_list(self.request, network_id=port['network_id'])
+        ret_val = api.neutron.port_list(copy.copy(self.request),
+                                        network_id=port['network_id'])
+
+        self.assertEqual([p['id'] for p in ports], [p.id for p in ret_val])
+        # Nova changes ports without going through Horizon, so the port
+        # lists are not shared across requests.
+        self.assertEqual(2, network_client.ports.call_count)
+
     @mock.patch.object(api.neutron, 'is_extension_supported')
     @mock.patch.object(api.neutron, 'networkclient')
     def test_port_list_with_trunk_types(
@@ -1755,11 +1775,13 @@ class NeutronApiTests(test.APIMockTestCase):
         port_ids = tuple([port['id'] for port in ports])
 
         network_client = mock_networkclient.return_value
-        uri_len_exc = neutron_exc.RequestURITooLong(excess=220)
-        list_ports_retval = [uri_len_exc]
-        for i in range(0, 10, 4):
-            list_ports_retval.append(ports[i:i + 4])
-        network_client.ports.side_effect = list_ports_retval
+
+        def list_ports(id):
+            # The chunks are listed in parallel, in any order.
+            if len(id) > 4:
+                raise neutron_exc.RequestURITooLong(excess=220)
+            return [port for port in ports if port['id'] in id]
+        network_client.ports.side_effect = list_ports
 
         ret_val = api.neutron.list_resources_with_long_filters(
             api.neutron.port_list, 'id', tuple(port_ids),
@@ -1771,7 +1793,34 @@ class NeutronApiTests(test.APIMockTestCase):
         expected_calls.append(mock.call(id=tuple(port_ids)))
         for i in range(0, 10, 4):
             expected_calls.append(mock.call(id=tuple(port_ids[i:i + 4])))
-        network_client.ports.assert_has_calls(expected_calls)
+        network_client.ports.assert_has_calls(expected_calls,
+                                              any_order=True)
+        self.assertEqual(4, network_client.ports.call_count)
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={'max_uri_length': 680})
+    @mock.patch.object(api.neutron, 'networkclient')
+    def test_list_resources_with_long_filters_max_uri_length(
+            self, mock_networkclient):
+        # 680 - 512 chars reserved for the rest of the URI leaves 168 chars
+        # for the filter, i.e. 4 "id=<UUID>&" filters of 40 chars. The 10
+        # port IDs are split up front into chunks of 4, 4 and 2 port IDs.
+        ports = [sdk_port.Port(**{'id': uuidutils.generate_uuid(),
+                 'name': 'port%s' % i, 'admin_state_up': True})
+                 for i in range(10)]
+        port_ids = tuple([port['id'] for port in ports])
+
+        network_client = mock_networkclient.return_value
+        network_client.ports.side_effect = (
+            lambda id: [port for port in ports if port['id'] in id])
+
+        ret_val = api.neutron.list_resources_with_long_filters(
+            api.neutron.port_list, 'id', port_ids, request=self.request)
+        self.assertEqual(port_ids, tuple([p.id for p in ret_val]))
+
+        network_client.ports.assert_has_calls(
+            [mock.call(id=port_ids[i:i + 4]) for i in range(0, 10, 4)],
+            any_order=True)
+        self.assertEqual(3, network_client.ports.call_count)
 
     @mock.patch.object(api.neutron, 'neutronclient')
     def test_qos_policies_list(self, mock_neutronclient):
@@ -2576,13 +2625,7 @@ class NeutronApiFloatingIpTests(test.APIMockTestCase):
         else:
             return ip_address
 
-    @override_settings(
-        OPENSTACK_NEUTRON_NETWORK={
-            'enable_fip_topology_check': True,
-        }
-    )
-    @mock.patch.object(api._nova, 'novaclient')
-    def test_floating_ip_target_list(self, mock_novaclient):
+    def _mock_floating_ip_target_list(self, novaclient):
         ports = self.api_ports_sdk
         # Port on the first subnet is connected to a router
         # attached to external network in neutron_data.
@@ -2603,30 +2646,41 @@ class NeutronApiFloatingIpTests(test.APIMockTestCase):
                 target_ports.append((
                     self._get_target_id(p, ip['ip_address']),
                     self._get_target_name(p, ip['ip_address'])))
-        filters = {'tenant_id': self.request.user.tenant_id}
         self.netclient.ports.return_value = ports
         servers = self.servers.list()
-        novaclient = mock_novaclient.return_value
         ver = mock.Mock(min_version='2.1', version='2.45')
         novaclient.versions.get_current.return_value = ver
         novaclient.servers.list.return_value = servers
 
         ext_nets = [n for n in self.api_networks_sdk
                     if n['is_router_external']]
-        list_networks_retvals = [ext_nets, shared_nets]
-        self.netclient.networks.side_effect = list_networks_retvals
+        self.netclient.networks.side_effect = (
+            lambda **params: ext_nets if 'router:external' in params
+            else shared_nets)
         self.qclient.list_routers.return_value = {'routers':
                                                   self.api_routers.list()}
         shared_subs = [s for s in self.api_subnets_sdk
                        if s['id'] in shared_subnet_ids]
         self.netclient.subnets.return_value = shared_subs
+        return target_ports
+
+    @override_settings(
+        OPENSTACK_NEUTRON_NETWORK={
+            'enable_fip_topology_check': True,
+        }
+    )
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_floating_ip_target_list(self, mock_novaclient):
+        novaclient = mock_novaclient.return_value
+        target_ports = self._mock_floating_ip_target_list(novaclient)
+        filters = {'tenant_id': self.request.user.tenant_id}
 
         rets = api.neutron.floating_ip_target_list(self.request)
 
         self.assertEqual(len(target_ports), len(rets))
         for ret, exp in zip(rets, target_ports):
             pid, ip_address = ret.id.split('_', 1)
-            self.assertEqual(4, netaddr.IPAddress(ip['ip_address']).version)
+            self.assertEqual(4, netaddr.IPAddress(ip_address).version)
             self.assertEqual(exp[0], ret.id)
             self.assertEqual(exp[1], ret.name)
 
@@ -2641,6 +2695,60 @@ class NeutronApiFloatingIpTests(test.APIMockTestCase):
         self.qclient.list_routers.assert_called_once_with()
         self.netclient.subnets.assert_called_once_with()
 
+    @override_settings(
+        OPENSTACK_NEUTRON_NETWORK={
+            'enable_fip_topology_check': True,
+        }
+    )
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_floating_ip_target_list_memoized(self, mock_novaclient):
+        novaclient = mock_novaclient.return_value
+        target_ports = self._mock_floating_ip_target_list(novaclient)
+
+        api.neutron.floating_ip_target_list(self.request)
+        rets = api.neutron.floating_ip_target_list(self.request)
+
+        self.assertEqual([exp[0] for exp in target_ports],
+                         [ret.id for ret in rets])
+        self.netclient.ports.assert_called_once_with(
+            tenant_id=self.request.user.tenant_id)
+        novaclient.servers.list.assert_called_once_with(
+            False, {'project_id': self.request.user.tenant_id})
+
+    @override_settings(
+        OPENSTACK_NEUTRON_NETWORK={
+            'enable_fip_topology_check': True,
+        },
+        MEMOIZED_SHARED_CACHE={'enabled': True},
+    )
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_floating_ip_target_list_by_instance_shared(self,
+                                                        mock_novaclient):
+        cache.clear()
+        novaclient = mock_novaclient.return_value
+        target_ports = self._mock_floating_ip_target_list(novaclient)
+        api.neutron.floating_ip_target_list(self.request)
+
+        instance_id = target_ports[0][0].split('_')[0]
+        instance_id = [p['device_id'] for p in self.api_ports_sdk
+                       if p['id'] == instance_id][0]
+        rets = api.neutron.floating_ip_target_list_by_instance(
+            copy.copy(self.request), instance_id)
+
+        expected = [exp[0] for exp in target_ports
+                    if exp[1].startswith('server_%s:' % instance_id)]
+        self.assertEqual(expected, [ret.id for ret in rets])
+        self.assertEqual(1, self.netclient.ports.call_count)
+        self.assertEqual(1, novaclient.servers.list.call_count)
+        novaclient.servers.get.assert_not_called()
+
+        # Associating a floating IP drops the shared targets.
+        self.qclient.update_floatingip.return_value = None
+        api.neutron.floating_ip_associate(self.request, 'fip-id',
+                                          target_ports[0][0])
+        api.neutron.floating_ip_target_list(copy.copy(self.request))
+        self.assertEqual(2, novaclient.servers.list.call_count)
+
     @mock.patch.object(api._nova, 'novaclient')
     def _test_target_floating_ip_port_by_instance(self, server, ports,
                                                   candidates, mock_novaclient):
@@ -16,9 +16,11 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import copy
 from unittest import mock
 
 from django.conf import settings
+from django.core.cache import cache
 from django.test.utils import override_settings
 
 from novaclient import api_versions
@@ -231,6 +233,111 @@ class ComputeApiTests(test.APIMockTestCase):
             sort_dirs=['desc', 'desc', 'desc'],
             sort_keys=['created_at', 'display_name', 'uuid'])
 
+    @override_settings(API_RESULT_PAGE_SIZE=1)
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_server_list_pagination_deleted_marker(self, mock_novaclient):
+        servers = self.servers.list()
+        novaclient = mock_novaclient.return_value
+        self._mock_current_version(novaclient, '2.45')
+        novaclient.servers.list.return_value = servers[1:3]
+        self.request.session = {
+            'server_deleted': servers[0].id,
+            'server_page_cursors': {'desc:%s' % servers[0].id:
+                                    servers[1].id},
+        }
+
+        ret_val, has_more, has_prev = api.nova.server_list_paged(
+            self.request, {'marker': servers[0].id, 'paginate': True})
+
+        self.assertEqual([servers[1].id], [s.id for s in ret_val])
+        self.assertTrue(has_more)
+        novaclient.servers.list.assert_called_once_with(
+            True,
+            {'project_id': self.request.user.tenant_id,
+             'marker': servers[1].id,
+             'limit': 2},
+            sort_dirs=['desc', 'desc', 'desc'],
+            sort_keys=['created_at', 'display_name', 'uuid'])
+
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_server_list_pagination_deleted_head(self, mock_novaclient):
+        servers = self.servers.list()
+        novaclient = mock_novaclient.return_value
+        self._mock_current_version(novaclient, '2.45')
+        novaclient.servers.list.side_effect = [[], servers]
+        self.request.session = {'server_deleted': 'deleted-id'}
+
+        ret_val, has_more, has_prev = api.nova.server_list_paged(
+            self.request, {'marker': 'deleted-id', 'paginate': True})
+
+        self.assertEqual(len(servers), len(ret_val))
+        self.assertFalse(has_prev)
+        # The listing in the 'desc' direction is not made twice.
+        self.assertEqual(2, novaclient.servers.list.call_count)
+        self.assertEqual(
+            [['desc'] * 3, ['asc'] * 3],
+            [c[1]['sort_dirs']
+             for c in novaclient.servers.list.call_args_list])
+        self.assertEqual(
+            {'asc:%s' % ret_val[0].id: ret_val[1].id,
+             'desc:%s' % ret_val[-1].id: ret_val[-2].id},
+            self.request.session['server_page_cursors'])
+
+    @override_settings(API_RESULT_PAGE_SIZE=1)
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_server_list_pagination_prefetched(self, mock_novaclient):
+        servers = self.servers.list()
+        novaclient = mock_novaclient.return_value
+        self._mock_current_version(novaclient, '2.45')
+        novaclient.servers.list.return_value = servers[1:3]
+        self.request.session = {}
+
+        list_page = api.nova.server_list_page_loader(
+            self.request, {'marker': servers[0].id, 'paginate': True})
+        prefetched = list_page()
+        novaclient.servers.list.assert_called_once_with(
+            True,
+            {'project_id': self.request.user.tenant_id,
+             'marker': servers[0].id,
+             'limit': 2},
+            sort_dirs=['desc', 'desc', 'desc'],
+            sort_keys=['created_at', 'display_name', 'uuid'])
+
+        ret_val, has_more, has_prev = api.nova.server_list_paged(
+            self.request, {'marker': servers[0].id, 'paginate': True},
+            prefetched=prefetched)
+
+        self.assertEqual([servers[1].id], [s.id for s in ret_val])
+        self.assertTrue(has_more)
+        self.assertTrue(has_prev)
+        self.assertEqual(1, novaclient.servers.list.call_count)
+        self.assertIn('server_page_cursors', self.request.session)
+
+    @override_settings(API_RESULT_PAGE_SIZE=1)
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_server_list_pagination_prefetched_deleted(self,
+                                                       mock_novaclient):
+        servers = self.servers.list()
+        novaclient = mock_novaclient.return_value
+        self._mock_current_version(novaclient, '2.45')
+        novaclient.servers.list.return_value = servers[2:3]
+        self.request.session = {'server_deleted': servers[1].id}
+
+        ret_val, has_more, has_prev = api.nova.server_list_paged(
+            self.request, {'marker': servers[0].id, 'paginate': True},
+            prefetched=servers[1:3])
+
+        # A server was deleted after the page was prefetched.
+        self.assertEqual([servers[2].id], [s.id for s in ret_val])
+        novaclient.servers.list.assert_called_once_with(
+            True,
+            {'project_id': self.request.user.tenant_id,
+             'marker': servers[0].id,
+             'limit': 2},
+            sort_dirs=['desc', 'desc', 'desc'],
+            sort_keys=['created_at', 'display_name', 'uuid'])
+        self.assertNotIn('server_deleted', self.request.session)
+
     @mock.patch.object(api._nova, 'novaclient')
     def test_usage_get(self, mock_novaclient):
         novaclient = mock_novaclient.return_value
@@ -493,6 +600,27 @@ class ComputeApiTests(test.APIMockTestCase):
         self.assertEqual(len(flavors), len(api_flavors))
         novaclient.flavors.list.assert_called_once_with(is_public=True)
 
+    @override_settings(MEMOIZED_SHARED_CACHE={'enabled': True})
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_flavor_list_shared_cache(self, mock_novaclient):
+        cache.clear()
+        flavors = self.flavors.list()
+        novaclient = mock_novaclient.return_value
+        novaclient.flavors.list.return_value = flavors
+
+        api.nova.flavor_list(self.request)
+        api_flavors = api.nova.flavor_list(copy.copy(self.request))
+
+        self.assertEqual([f.id for f in flavors], [f.id for f in api_flavors])
+        for flavor in api_flavors:
+            self.assertIsInstance(flavor, type(flavors[0]))
+            self.assertEqual(novaclient.flavors, flavor.manager)
+        novaclient.flavors.list.assert_called_once_with(is_public=True)
+
+        api.nova.flavor_delete(self.request, flavors[0].id)
+        api.nova.flavor_list(copy.copy(self.request))
+        self.assertEqual(2, novaclient.flavors.list.call_count)
+
     @mock.patch.object(api._nova, 'novaclient')
     def test_flavor_get_no_extras(self, mock_novaclient):
         flavor = self.flavors.list()[1]
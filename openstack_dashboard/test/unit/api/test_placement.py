@@ -0,0 +1,108 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from openstack_dashboard.api import placement
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import futurist_utils
+
+
+class PlacementApiTests(test.APIMockTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.providers = [{'uuid': 'uuid-%d' % i, 'name': 'host-%d' % i}
+                          for i in range(5)]
+        patcher = mock.patch.object(placement, '_get_json',
+                                    side_effect=self._get_json)
+        self.mock_get_json = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get_json(self, request, path):
+        if path == '/resource_providers':
+            return {'resource_providers': [dict(p) for p in self.providers]}
+        uuid, resource = path.split('/')[2:]
+        if resource == 'inventories':
+            return {'inventories': {
+                'VCPU': {'reserved': 0, 'total': 4, 'allocation_ratio': 2.0},
+                'MEMORY_MB': {'reserved': 512, 'total': 8192,
+                              'allocation_ratio': 1.0}}}
+        if resource == 'usages':
+            return {'usages': {'VCPU': 1, 'MEMORY_MB': 1024}}
+        return {resource: ['%s-%s' % (resource, uuid)]}
+
+    def _get_paths(self):
+        return sorted(c[0][1] for c in self.mock_get_json.call_args_list)
+
+    def test_get_providers(self):
+        providers = placement.get_providers(self.request)
+
+        self.assertEqual([p['uuid'] for p in self.providers],
+                         [p['uuid'] for p in providers])
+        provider = providers[0]
+        self.assertEqual(8, provider['vcpus_capacity'])
+        self.assertEqual(1, provider['vcpus_used'])
+        self.assertEqual(8192, provider['memory_mb_capacity'])
+        self.assertIsNone(provider['disk_gb'])
+        self.assertEqual(['aggregates-uuid-0'], provider['aggregates'])
+        self.assertEqual(['traits-uuid-0'], provider['traits'])
+        self.assertEqual(1 + 4 * len(self.providers),
+                         self.mock_get_json.call_count)
+
+    @override_settings(PARALLEL_CALLS_POOL={'max_workers': 4,
+                                            'max_backlog': 50,
+                                            'timeout': None})
+    def test_get_providers_bounded_fan_out(self):
+        futurist_utils._reset_pool()
+        self.addCleanup(futurist_utils._reset_pool)
+
+        providers = placement.get_providers(self.request)
+
+        self.assertEqual(len(self.providers), len(providers))
+        # The providers are shared by half of the workers of the pool.
+        self.assertEqual(
+            2, futurist_utils.get_pool_statistics()['completed'])
+
+    def test_get_providers_without_aggregates_and_traits(self):
+        providers = placement.get_providers(self.request, aggregates=False,
+                                            traits=False)
+
+        self.assertNotIn('aggregates', providers[0])
+        self.assertNotIn('traits', providers[0])
+        self.assertEqual(
+            sorted(['/resource_providers'] +
+                   ['/resource_providers/%s/%s' % (p['uuid'], resource)
+                    for p in self.providers
+                    for resource in ('inventories', 'usages')]),
+            self._get_paths())
+
+    @override_settings(PLACEMENT_PROVIDERS_CACHE={'enabled': True,
+                                                  'cache_alias': 'default',
+                                                  'timeout': 60})
+    @mock.patch.object(placement.base, 'url_for',
+                       return_value='http://placement.example.com')
+    def test_get_providers_cached(self, mock_url_for):
+        providers = placement.get_providers(self.request)
+        call_count = self.mock_get_json.call_count
+
+        # Another request, e.g. of another user of the region.
+        request = self.factory.get('/')
+        request.user = self.request.user
+        cached = placement.get_providers(request)
+
+        self.assertEqual(providers, cached)
+        self.assertEqual(call_count, self.mock_get_json.call_count)
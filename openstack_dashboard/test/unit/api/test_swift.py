@@ -15,12 +15,17 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import io
+import json
 from unittest import mock
 
+from django.test.utils import override_settings
+
 from horizon import exceptions
 
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import futurist_utils
 
 
 @mock.patch('swiftclient.client.Connection')
@@ -283,6 +288,93 @@ class SwiftApiTests(test.APIMockTestCase):
             content_length=0,
             headers={})
 
+    def _upload_segmented_object(self, swift_api, put_object):
+        container = self.containers.first()
+        test_file = io.BytesIO(b'0123456789')
+        test_file.name = 'fake_object.raw'
+        test_file.size = 10
+        swift_api.get_capabilities.return_value = {'slo': {}}
+        swift_api.put_object.side_effect = put_object
+
+        with override_settings(SWIFT_SEGMENTED_UPLOAD={'enabled': True,
+                                                       'segment_size': 4,
+                                                       'max_workers': 2}):
+            return api.swift.swift_upload_object(self.request,
+                                                 container.name,
+                                                 'fake_object',
+                                                 test_file)
+
+    def test_swift_upload_object_segmented(self, mock_swiftclient):
+        container = self.containers.first()
+        swift_api = mock_swiftclient.return_value
+        segments = {}
+
+        def put_object(container_name, object_name, contents, **kwargs):
+            if kwargs.get('query_string'):
+                return 'manifest-etag'
+            segments[object_name] = contents.read(kwargs['content_length'])
+            return 'etag-%s' % segments[object_name].decode()
+
+        response = self._upload_segmented_object(swift_api, put_object)
+
+        self.assertEqual('manifest-etag', response['etag'])
+        self.assertEqual(10, response['bytes'])
+        segment_container = '%s_segments' % container.name
+        swift_api.put_container.assert_called_once_with(segment_container)
+        segment_names = sorted(segments)
+        self.assertEqual([b'0123', b'4567', b'89'],
+                         [segments[name] for name in segment_names])
+        manifest_call = swift_api.put_object.call_args_list[-1]
+        self.assertEqual((container.name, 'fake_object'),
+                         manifest_call[0][:2])
+        self.assertEqual('multipart-manifest=put',
+                         manifest_call[1]['query_string'])
+        self.assertEqual(
+            {'X-Object-Meta-Orig-Filename': 'fake_object.raw'},
+            manifest_call[1]['headers'])
+        self.assertEqual(
+            [{'path': '/%s/%s' % (segment_container, name),
+              'etag': 'etag-%s' % segments[name].decode(),
+              'size_bytes': len(segments[name])}
+             for name in segment_names],
+            json.loads(manifest_call[0][2]))
+
+    @mock.patch.object(futurist_utils, 'call_for_each_parallel',
+                       wraps=futurist_utils.call_for_each_parallel)
+    def test_swift_upload_object_segmented_shared_pool(
+            self, mock_call_for_each_parallel, mock_swiftclient):
+        swift_api = mock_swiftclient.return_value
+
+        def put_object(container_name, object_name, contents, **kwargs):
+            return 'etag'
+
+        self._upload_segmented_object(swift_api, put_object)
+
+        mock_call_for_each_parallel.assert_called_once_with(
+            mock.ANY, mock.ANY, max_workers=2)
+        # The three segments and the manifest.
+        self.assertEqual(4, swift_api.put_object.call_count)
+
+    def test_swift_upload_object_segmented_failure(self, mock_swiftclient):
+        swift_api = mock_swiftclient.return_value
+
+        def put_object(container_name, object_name, contents, **kwargs):
+            if object_name.endswith('00000002'):
+                raise self.exceptions.swift
+            return 'etag'
+
+        self.assertRaises(type(self.exceptions.swift),
+                          self._upload_segmented_object, swift_api,
+                          put_object)
+
+        # Only the segments, not the manifest, were uploaded.
+        self.assertEqual(3, swift_api.put_object.call_count)
+        deleted = sorted(c[0][1] for c in
+                         swift_api.delete_object.call_args_list)
+        self.assertEqual(2, len(deleted))
+        self.assertTrue(deleted[0].endswith('00000000'))
+        self.assertTrue(deleted[1].endswith('00000001'))
+
     def test_swift_object_exists(self, mock_swiftclient):
         container = self.containers.first()
         obj = self.objects.first()
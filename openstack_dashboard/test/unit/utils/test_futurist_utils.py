@@ -10,13 +10,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+import time
 import unittest
 
+from django.test.utils import override_settings
+
 from openstack_dashboard.utils import futurist_utils
 
 
 class FuturistUtilsTests(unittest.TestCase):
 
+    def setUp(self):
+        super().setUp()
+        futurist_utils._reset_pool()
+        self.addCleanup(futurist_utils._reset_pool)
+
     def test_call_functions_parallel(self):
         def func1():
             return 10
@@ -58,3 +67,144 @@ class FuturistUtilsTests(unittest.TestCase):
             (func2, [], {'a': 10, 'b': 20}),
             func3)
         self.assertEqual(ret, (5, 30, 3))
+
+    def test_call_functions_parallel_shares_pool(self):
+        threads = set()
+
+        def func():
+            threads.add(threading.current_thread())
+            return True
+
+        futurist_utils.call_functions_parallel(func, func)
+        pool = futurist_utils._get_pool()
+        futurist_utils.call_functions_parallel(func, func)
+        self.assertIs(pool, futurist_utils._get_pool())
+        self.assertLessEqual(len(threads), 10)
+        stats = futurist_utils.get_pool_statistics()
+        self.assertEqual(4, stats['completed'])
+        self.assertEqual(0, stats['queue_depth'])
+
+    def test_call_functions_parallel_nested(self):
+        def inner():
+            return 1
+
+        def outer():
+            return futurist_utils.call_functions_parallel(inner, inner)
+
+        with override_settings(PARALLEL_CALLS_POOL={'max_workers': 1}):
+            ret = futurist_utils.call_functions_parallel(outer, outer)
+        self.assertEqual(ret, ((1, 1), (1, 1)))
+
+    def test_call_functions_parallel_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = threading.Event()
+        threads = []
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        def func():
+            threads.append(threading.current_thread())
+            return 1
+
+        with override_settings(PARALLEL_CALLS_POOL={'max_workers': 1,
+                                                    'max_backlog': None}):
+            futurist_utils._get_pool().submit(block)
+            started.wait(5)
+            threading.Timer(0.3, release.set).start()
+            ret = futurist_utils.call_functions_parallel(func, func,
+                                                         timeout=0.1)
+        self.assertEqual((1, 1), ret)
+        # The calls which had not started were made by the calling thread.
+        self.assertEqual([threading.current_thread()] * 2, threads)
+        stats = futurist_utils.get_pool_statistics()
+        self.assertEqual(1, stats['timed_out'])
+        self.assertEqual(0, stats['queue_depth'])
+
+    def test_call_functions_parallel_timeout_waits_for_running(self):
+        def func():
+            time.sleep(0.3)
+            return 1
+
+        ret = futurist_utils.call_functions_parallel(func, timeout=0.1)
+        self.assertEqual((1,), ret)
+        self.assertEqual(1, futurist_utils.get_pool_statistics()['timed_out'])
+
+    def test_call_functions_parallel_rejected_when_saturated(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = threading.Event()
+        threads = []
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        def func(value):
+            threads.append(threading.current_thread())
+            return value
+
+        with override_settings(PARALLEL_CALLS_POOL={'max_workers': 1,
+                                                    'max_backlog': 1}):
+            pool = futurist_utils._get_pool()
+            # One call runs and another one fills the backlog.
+            pool.submit(block)
+            started.wait(5)
+            pool.submit(block)
+            ret = futurist_utils.call_functions_parallel(
+                (func, [1]), (func, [2]), timeout=5)
+        self.assertEqual((1, 2), ret)
+        self.assertEqual([threading.current_thread()] * 2, threads)
+        self.assertEqual(1, futurist_utils.get_pool_statistics()['rejected'])
+
+    def test_call_functions_parallel_error(self):
+        def func():
+            raise ValueError()
+
+        self.assertRaises(ValueError,
+                          futurist_utils.call_functions_parallel,
+                          func, func)
+
+    def test_call_for_each_parallel(self):
+        threads = set()
+
+        def func(item):
+            threads.add(threading.current_thread())
+            return item * 2
+
+        with override_settings(PARALLEL_CALLS_POOL={'max_workers': 4}):
+            ret = futurist_utils.call_for_each_parallel(func, range(100))
+        self.assertEqual([item * 2 for item in range(100)], ret)
+        # Half of the pool at most.
+        self.assertLessEqual(len(threads), 2)
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_call_for_each_parallel_rejected_when_saturated(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = threading.Event()
+        threads = set()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        def func(item):
+            threads.add(threading.current_thread())
+            return item * 2
+
+        with override_settings(PARALLEL_CALLS_POOL={'max_workers': 1,
+                                                    'max_backlog': 1}):
+            pool = futurist_utils._get_pool()
+            # One call runs and another one fills the backlog.
+            pool.submit(block)
+            started.wait(5)
+            pool.submit(block)
+            ret = futurist_utils.call_for_each_parallel(func, range(100),
+                                                        timeout=5)
+        # The items are processed by the calling thread.
+        self.assertEqual([item * 2 for item in range(100)], ret)
+        self.assertEqual({threading.current_thread()}, threads)
+        self.assertEqual(1, futurist_utils.get_pool_statistics()['rejected'])
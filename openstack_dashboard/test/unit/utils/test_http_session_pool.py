@@ -0,0 +1,111 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from http import server
+import threading
+import unittest
+from unittest import mock
+
+from django.test.utils import override_settings
+from keystoneauth1 import session
+
+from openstack_dashboard.utils import http_session_pool
+
+
+POOL_ENABLED = {'enabled': True, 'pool_maxsize': 2, 'tcp_keepalive': True}
+
+
+class _Handler(server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.send_header('Set-Cookie', 'user=one')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpSessionPoolTests(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        http_session_pool._reset_sessions()
+        self.addCleanup(http_session_pool._reset_sessions)
+
+    def test_get_http_session_disabled(self):
+        self.assertIsNone(
+            http_session_pool.get_http_session('http://nova:8774/v2.1'))
+        self.assertEqual({'hits': 0, 'misses': 0, 'endpoints': {}},
+                         http_session_pool.get_pool_statistics())
+
+    @override_settings(OPENSTACK_HTTP_SESSION_POOL=POOL_ENABLED)
+    def test_get_http_session_keyed_by_endpoint(self):
+        nova = http_session_pool.get_http_session('http://nova:8774/v2.1')
+        servers = http_session_pool.get_http_session(
+            'http://nova:8774/v2.1/servers')
+        neutron = http_session_pool.get_http_session('http://neutron:9696')
+
+        self.assertIs(nova, servers)
+        self.assertIsNot(nova, neutron)
+        adapter = nova.get_adapter('http://nova:8774')
+        self.assertIsInstance(adapter, session.TCPKeepAliveAdapter)
+        self.assertEqual(2, adapter._pool_maxsize)
+        stats = http_session_pool.get_pool_statistics()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(2, stats['misses'])
+        self.assertEqual({'http://nova:8774', 'http://neutron:9696'},
+                         set(stats['endpoints']))
+
+    @override_settings(OPENSTACK_HTTP_SESSION_POOL=POOL_ENABLED)
+    def test_connections_reused(self):
+        httpd = server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(httpd.server_close)
+        self.addCleanup(httpd.shutdown)
+        url = 'http://127.0.0.1:%d' % httpd.server_port
+
+        for unused in range(3):
+            http = http_session_pool.get_http_session(url)
+            http.get(url + '/servers').raise_for_status()
+
+        self.assertEqual(0, len(http.cookies))
+        self.assertEqual({'requests': 3, 'connections': 1},
+                         http_session_pool.get_pool_statistics()
+                         ['endpoints'][url])
+
+    @override_settings(OPENSTACK_HTTP_SESSION_POOL=POOL_ENABLED,
+                       OPENSTACK_SSL_NO_VERIFY=False,
+                       OPENSTACK_SSL_CACERT='/path/to/cacert.pem')
+    @mock.patch.object(http_session_pool.auth_utils, 'get_client_ip',
+                       return_value='10.0.0.1')
+    def test_get_token_session(self, mock_get_client_ip):
+        request = mock.Mock()
+        token_session = http_session_pool.get_token_session(
+            request, 'http://nova:8774/v2.1', 'token-1')
+
+        self.assertIs(http_session_pool.get_http_session('http://nova:8774'),
+                      token_session.session)
+        self.assertEqual('token-1', token_session.get_token())
+        self.assertEqual('http://nova:8774/v2.1',
+                         token_session.get_endpoint())
+        self.assertEqual('/path/to/cacert.pem', token_session.verify)
+        self.assertEqual('10.0.0.1', token_session.original_ip)
+        mock_get_client_ip.assert_called_once_with(request)
+
+    def test_get_token_session_disabled(self):
+        self.assertIsNone(http_session_pool.get_token_session(
+            mock.Mock(), 'http://nova:8774/v2.1', 'token-1'))
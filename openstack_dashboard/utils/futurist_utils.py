@@ -10,14 +10,137 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+from concurrent import futures
 import functools
+import threading
+import time
 
 import futurist
+from futurist import rejection
 
+from openstack_dashboard.utils import settings as setting_utils
 
-def call_functions_parallel(*worker_defs):
+
+_pool = None
+_pool_lock = threading.Lock()
+_worker_state = threading.local()
+_stats_lock = threading.Lock()
+_stats = collections.Counter()
+
+
+def _get_pool():
+    """Return the thread pool shared by all requests of the process."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            max_backlog = setting_utils.get_dict_config(
+                'PARALLEL_CALLS_POOL', 'max_backlog')
+            check_and_reject = None
+            if max_backlog is not None:
+                check_and_reject = rejection.reject_when_reached(max_backlog)
+            _pool = futurist.ThreadPoolExecutor(
+                max_workers=setting_utils.get_dict_config(
+                    'PARALLEL_CALLS_POOL', 'max_workers'),
+                check_and_reject=check_and_reject)
+        return _pool
+
+
+def _reset_pool():
+    """Shut down the shared thread pool, e.g. after settings changed."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = None
+    with _stats_lock:
+        _stats.clear()
+
+
+def _record(key, value=1):
+    with _stats_lock:
+        _stats[key] += value
+
+
+def _run_in_worker(func, submitted):
+    started = time.monotonic()
+    _record('pending', -1)
+    _record('queue_wait', started - submitted)
+    _worker_state.active = True
+    try:
+        return func()
+    finally:
+        _worker_state.active = False
+        _record('runtime', time.monotonic() - started)
+        _record('completed')
+
+
+def _submit(pool, func, submitted):
+    _record('pending')
+    try:
+        return pool.submit(_run_in_worker, func, submitted)
+    except futurist.RejectedSubmission:
+        _record('pending', -1)
+        raise
+
+
+def _cancel(future):
+    if future.cancel():
+        _record('pending', -1)
+        return True
+    return False
+
+
+def _call(func):
+    """Call a function in the calling thread and return a done future."""
+    future = futures.Future()
+    try:
+        future.set_result(func())
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def get_pool_statistics():
+    """Return usage statistics of the shared thread pool.
+
+    :returns: a dict with the number of worker threads, the number of
+        calls waiting for a worker (``queue_depth``), the numbers of
+        completed, rejected and timed out calls, and the average time
+        calls spent waiting for a worker and running (in seconds).
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    completed = stats.get('completed', 0)
+    return {
+        'max_workers': setting_utils.get_dict_config(
+            'PARALLEL_CALLS_POOL', 'max_workers'),
+        'queue_depth': max(0, stats.get('pending', 0)),
+        'completed': completed,
+        'rejected': stats.get('rejected', 0),
+        'timed_out': stats.get('timed_out', 0),
+        'average_queue_wait': (stats.get('queue_wait', 0) / completed
+                               if completed else 0),
+        'average_runtime': (stats.get('runtime', 0) / completed
+                            if completed else 0),
+    }
+
+
+def call_functions_parallel(*worker_defs, timeout=None):
     """Call specified functions in parallel.
 
+    The functions are run on a thread pool shared by the whole process,
+    which caps the number of concurrent backend calls. Its size is
+    configured by ``PARALLEL_CALLS_POOL``. When the functions are called
+    from a thread of the pool, they are run one by one in that thread so
+    that nested parallel calls cannot exhaust the pool.
+
+    When the pool rejects a function because too many calls are waiting
+    for a worker, the remaining functions are called by the calling thread.
+    The functions which have not started when the timeout expires are
+    called by the calling thread as well, and the running ones are waited
+    for, so the functions are always called exactly once.
+
     :param *worker_defs: Each positional argument can be either of
         a function to be called or a tuple which consists of a function,
         a list of positional arguments) and keyword arguments (optional).
@@ -27,24 +150,120 @@ def call_functions_parallel(*worker_defs):
            call_functions_parallel(func1, (func2, [1, 2]))
            call_functions_parallel((func1, [], {'a': 1}),
                                    (func2, [], {'a': 2, 'b': 10}))
+    :param timeout: the number of seconds to wait for the pool to run the
+        functions. Defaults to ``PARALLEL_CALLS_POOL['timeout']``, ``None``
+        means no deadline.
     :returns: a tuple of values returned from individual functions.
         None is returned if a corresponding function does not return.
         It is better to return values other than None from individual
         functions.
     """
-    # TODO(amotoki): Needs to figure out what max_workers can be specified.
-    # According to e0ne, the apache default configuration in devstack  allows
-    # only 10 threads. What happens if max_worker=11 is specified?
-    max_workers = len(worker_defs)
-    # Prepare a list with enough length.
-    futures = [None] * len(worker_defs)
-    with futurist.ThreadPoolExecutor(max_workers=max_workers) as e:
-        for index, func_def in enumerate(worker_defs):
-            if callable(func_def):
-                func_def = [func_def]
-            args = func_def[1] if len(func_def) > 1 else []
-            kwargs = func_def[2] if len(func_def) > 2 else {}
-            func = functools.partial(func_def[0], *args, **kwargs)
-            futures[index] = e.submit(fn=func)
-
-    return tuple(f.result() for f in futures)
+    funcs = []
+    for func_def in worker_defs:
+        if callable(func_def):
+            func_def = [func_def]
+        args = func_def[1] if len(func_def) > 1 else []
+        kwargs = func_def[2] if len(func_def) > 2 else {}
+        funcs.append(functools.partial(func_def[0], *args, **kwargs))
+
+    if getattr(_worker_state, 'active', False):
+        return tuple(func() for func in funcs)
+
+    if timeout is None:
+        timeout = setting_utils.get_dict_config('PARALLEL_CALLS_POOL',
+                                                'timeout')
+    pool = _get_pool()
+    submitted = time.monotonic()
+    calls = []
+    try:
+        for func in funcs:
+            calls.append(_submit(pool, func, submitted))
+    except futurist.RejectedSubmission:
+        _record('rejected')
+    pending = list(calls)
+    # The functions the pool rejected are called by the calling thread.
+    calls.extend(_call(func) for func in funcs[len(calls):])
+
+    done, not_done = futures.wait(pending, timeout=timeout)
+    if not_done:
+        _record('timed_out')
+        for index, future in enumerate(pending):
+            if future in not_done and _cancel(future):
+                calls[index] = _call(funcs[index])
+    return tuple(f.result() for f in calls)
+
+
+def call_for_each_parallel(func, items, max_workers=None, timeout=None):
+    """Call a function for each item on a few threads of the shared pool.
+
+    Unlike :func:`call_functions_parallel`, which takes a thread of the pool
+    per function, a few workers pull the items from a shared iterator, so a
+    long list of items holds at most ``max_workers`` threads of the pool
+    and cannot fill its backlog. ``max_workers`` defaults to half of
+    ``PARALLEL_CALLS_POOL['max_workers']``, leaving threads to the other
+    requests of the process.
+
+    If the pool rejects some of the workers, or the timeout expires before
+    the workers are done, the calling thread works through the remaining
+    items along with the workers which are running, so each item is still
+    processed exactly once.
+
+    :param func: the function to call with each item.
+    :param items: the items to call ``func`` with.
+    :param max_workers: the maximum number of threads of the pool to use.
+    :param timeout: the number of seconds to wait for the workers before
+        the calling thread helps them. Defaults to
+        ``PARALLEL_CALLS_POOL['timeout']``, ``None`` means no deadline.
+    :returns: a list of the values returned by ``func``, in the order of
+        ``items``.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    if getattr(_worker_state, 'active', False) or len(items) <= 1:
+        return [func(item) for item in items]
+
+    pending = iter(enumerate(items))
+    lock = threading.Lock()
+    stopped = threading.Event()
+
+    def work():
+        while not stopped.is_set():
+            with lock:
+                index, item = next(pending, (None, None))
+            if index is None:
+                return
+            results[index] = func(item)
+
+    if max_workers is None:
+        max_workers = max(1, setting_utils.get_dict_config(
+            'PARALLEL_CALLS_POOL', 'max_workers') // 2)
+    if timeout is None:
+        timeout = setting_utils.get_dict_config('PARALLEL_CALLS_POOL',
+                                                'timeout')
+    pool = _get_pool()
+    submitted = time.monotonic()
+    workers = []
+    try:
+        for unused in range(min(max_workers, len(items))):
+            workers.append(_submit(pool, work, submitted))
+    except futurist.RejectedSubmission:
+        _record('rejected')
+    try:
+        if len(workers) < min(max_workers, len(items)):
+            # The pool is saturated, help the accepted workers.
+            work()
+        done, not_done = futures.wait(workers, timeout=timeout)
+        if not_done:
+            _record('timed_out')
+            for future in not_done:
+                _cancel(future)
+            # Make the calls the workers which have not started would have
+            # made, then wait for the running ones.
+            work()
+    except Exception:
+        stopped.set()
+        raise
+    for future in workers:
+        if not future.cancelled():
+            future.result()
+    return results
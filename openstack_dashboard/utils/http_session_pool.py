@@ -0,0 +1,135 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+from http import cookiejar
+import threading
+from urllib import parse
+
+from django.conf import settings
+from keystoneauth1 import session
+from keystoneauth1 import token_endpoint
+import requests
+from requests import adapters
+
+from openstack_auth import utils as auth_utils
+
+from openstack_dashboard.utils import settings as setting_utils
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_stats = collections.Counter()
+
+
+def _get_endpoint_key(url):
+    parsed = parse.urlsplit(url)
+    return '%s://%s' % (parsed.scheme, parsed.netloc)
+
+
+def _create_http_session():
+    pool_maxsize = setting_utils.get_dict_config(
+        'OPENSTACK_HTTP_SESSION_POOL', 'pool_maxsize')
+    if setting_utils.get_dict_config('OPENSTACK_HTTP_SESSION_POOL',
+                                     'tcp_keepalive'):
+        adapter = session.TCPKeepAliveAdapter(pool_maxsize=pool_maxsize)
+    else:
+        adapter = adapters.HTTPAdapter(pool_maxsize=pool_maxsize)
+    http = requests.Session()
+    http.mount('https://', adapter)
+    http.mount('http://', adapter)
+    # The session is shared by all users, cookies set by a service for
+    # one of them must not be sent with the requests of the others.
+    http.cookies.set_policy(cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return http, adapter
+
+
+def _reset_sessions():
+    """Close the shared sessions, e.g. after settings changed."""
+    with _sessions_lock:
+        for http, unused in _sessions.values():
+            http.close()
+        _sessions.clear()
+        _stats.clear()
+
+
+def get_http_session(url):
+    """Return the HTTP session of the process for the endpoint of a URL.
+
+    The session keeps the connections to the endpoint open between the
+    requests of the process, so that they do not pay for new TCP and TLS
+    handshakes. It carries no authentication, the clients of each request
+    authenticate with their own token.
+
+    :returns: a :class:`requests.Session`, or ``None`` if
+        ``OPENSTACK_HTTP_SESSION_POOL`` is not enabled.
+    """
+    if not setting_utils.get_dict_config('OPENSTACK_HTTP_SESSION_POOL',
+                                         'enabled'):
+        return None
+    key = _get_endpoint_key(url)
+    with _sessions_lock:
+        if key in _sessions:
+            _stats['hits'] += 1
+        else:
+            _stats['misses'] += 1
+            _sessions[key] = _create_http_session()
+        return _sessions[key][0]
+
+
+def get_token_session(request, endpoint, token_id):
+    """Return a keystoneauth session using the shared HTTP session.
+
+    The session authenticates the requests with ``token_id`` and sends them
+    to ``endpoint`` over the connections of :func:`get_http_session`.
+
+    :returns: a :class:`keystoneauth1.session.Session`, or ``None`` if
+        ``OPENSTACK_HTTP_SESSION_POOL`` is not enabled.
+    """
+    http = get_http_session(endpoint)
+    if http is None:
+        return None
+    verify = (not settings.OPENSTACK_SSL_NO_VERIFY and
+              (settings.OPENSTACK_SSL_CACERT or True))
+    return session.Session(
+        auth=token_endpoint.Token(endpoint=endpoint, token=token_id),
+        session=http,
+        original_ip=auth_utils.get_client_ip(request),
+        verify=verify)
+
+
+def get_pool_statistics():
+    """Return usage statistics of the shared HTTP sessions.
+
+    :returns: a dict with the numbers of lookups which found the session
+        of an endpoint (``hits``) or had to create it (``misses``), and for
+        each endpoint the number of requests sent and of connections opened
+        to send them.
+    """
+    with _sessions_lock:
+        stats = dict(_stats)
+        sessions = dict(_sessions)
+    endpoints = {}
+    for key, (unused, adapter) in sessions.items():
+        requests_count = connections = 0
+        for pool_key in adapter.poolmanager.pools.keys():
+            pool = adapter.poolmanager.pools.get(pool_key)
+            if pool is not None:
+                requests_count += pool.num_requests
+                connections += pool.num_connections
+        endpoints[key] = {'requests': requests_count,
+                          'connections': connections}
+    return {
+        'hits': stats.get('hits', 0),
+        'misses': stats.get('misses', 0),
+        'endpoints': endpoints,
+    }
@@ -0,0 +1,117 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the policy checks made to render the rows of a table.
+
+The row actions of the project instances table are checked against the
+policy files shipped with Horizon for a number of instances, the way they
+are when the table is rendered, with and without ``POLICY_CHECK_CACHE``.
+The number of rule evaluations and the time taken are printed.
+
+Run it from the top directory of the source tree::
+
+    python tools/policy-check-benchmark.py --rows 100
+"""
+
+import argparse
+import os
+import sys
+import time
+import types
+from unittest import mock
+
+
+def _get_row_actions():
+    from openstack_dashboard.dashboards.project.instances import tables
+
+    actions = []
+    for action_class in tables.InstancesTable._meta.row_actions:
+        action = action_class()
+        if getattr(action, 'policy_rules', None):
+            actions.append(action)
+    return actions
+
+
+def _render_rows(request, actions, rows):
+    from openstack_auth import policy
+
+    for index in range(rows):
+        datum = types.SimpleNamespace(id='instance-%d' % index,
+                                      tenant_id=request.user.project_id,
+                                      user_id=request.user.id,
+                                      domain_id=None)
+        for action in actions:
+            target = action.get_policy_target(request, datum)
+            policy.check(action.policy_rules, request, target)
+
+
+def _get_user(request):
+    from openstack_auth import user
+
+    # A new user is built from the session data for each policy check.
+    return user.User(id='user-1', user='demo', project_id='project-1',
+                     project_name='demo', user_domain_id='default',
+                     roles=[{'name': 'member'}, {'name': 'reader'}])
+
+
+def _run(actions, rows, cache_enabled):
+    from django.test import override_settings
+    from django.test import RequestFactory
+    from oslo_policy import policy as oslo_policy
+
+    from openstack_auth import policy
+
+    request = RequestFactory().get('/project/instances/')
+    request.session = {}
+    request.user = _get_user(request)
+    policy.reset()
+    policy._get_enforcer()
+
+    enforce = oslo_policy.Enforcer.enforce
+    with override_settings(POLICY_CHECK_CACHE=cache_enabled), \
+            mock.patch('openstack_auth.utils.get_user',
+                       side_effect=_get_user), \
+            mock.patch.object(oslo_policy.Enforcer, 'enforce',
+                              autospec=True,
+                              side_effect=enforce) as mock_enforce:
+        start = time.perf_counter()
+        _render_rows(request, actions, rows)
+        elapsed = time.perf_counter() - start
+    return mock_enforce.call_count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100,
+                        help='Number of rows of the rendered table')
+    parser.add_argument('--settings',
+                        default='openstack_dashboard.test.settings',
+                        help='Django settings module to use')
+    parsed_args = parser.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', parsed_args.settings)
+    import django
+    django.setup()
+
+    actions = _get_row_actions()
+    print('%d rows, %d row actions with policy rules'
+          % (parsed_args.rows, len(actions)))
+    for label, cache_enabled in (('without cache', False),
+                                 ('with cache', True)):
+        evaluations, elapsed = _run(actions, parsed_args.rows, cache_enabled)
+        print('%-14s %6d rule evaluations %8.1f ms'
+              % (label, evaluations, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()